@@ -0,0 +1,322 @@
+"""
+Persistent on-disk response cache for MET API requests.
+
+This module stores raw response bodies in a local SQLite file, keyed by a
+SHA-256 hash of the request URL, together with their ETag/Last-Modified
+validators and fetch time. Fresh entries are served without a network
+call; stale entries are revalidated with conditional requests.
+
+The cache is used from the event loop. Lookups still run an indexed
+SQLite read there, but nothing is committed per request: stored
+responses, revalidations and access times are buffered in memory and
+written in one transaction every FLUSH_SIZE pending writes, before
+eviction and on close.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from urllib.parse import urlencode
+
+DEFAULT_CACHE_DIR = os.getenv(
+    'MET_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.met_cache')
+)
+DEFAULT_MAX_AGE = 24 * 60 * 60
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+FLUSH_SIZE = 500
+
+
+def cache_url(url, params=None):
+    """
+    Build the canonical URL used as the cache key.
+
+    Args:
+        url (str): Request URL without query string
+        params (dict, optional): Query string parameters
+
+    Returns:
+        str: URL with parameters appended in sorted order
+    """
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+class CacheEntry:
+    """
+    A cached API response.
+
+    Attributes:
+        url (str): Canonical request URL
+        body (bytes): Raw response body
+        etag (str): ETag validator, if the server sent one
+        last_modified (str): Last-Modified validator, if the server sent one
+        fetched_at (float): Unix time the body was last fetched or revalidated
+    """
+    __slots__ = ('url', 'body', 'etag', 'last_modified', 'fetched_at')
+
+    def __init__(self, url, body, etag, last_modified, fetched_at):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with freshness window and LRU eviction.
+
+    Attributes:
+        cache_dir (str): Directory holding the cache file
+        path (str): Path to the SQLite cache file
+        max_age (float): Seconds an entry is served without revalidation
+        max_size (int): Maximum total body size in bytes before LRU eviction
+        offline (bool): If True, serve only from the cache and never hit the network
+        hits (int): Fresh entries served without a network call
+        revalidated (int): Stale entries confirmed unchanged by a 304 response
+        misses (int): Lookups that found no usable entry
+        stores (int): Entries written from 200 responses
+        evictions (int): Entries removed by LRU eviction
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_age=DEFAULT_MAX_AGE,
+                 max_size=DEFAULT_MAX_SIZE, offline=False):
+        """
+        Open (or create) the cache.
+
+        Args:
+            cache_dir (str, optional): Directory holding the cache file. Defaults to DEFAULT_CACHE_DIR.
+            max_age (float, optional): Freshness window in seconds. Defaults to 24 hours.
+            max_size (int, optional): Size limit in bytes. Defaults to 1 GiB.
+            offline (bool, optional): Serve only from the cache. Defaults to False.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, 'responses.sqlite3')
+        self.max_age = max_age
+        self.max_size = max_size
+        self.offline = offline
+
+        self._conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)"
+        )
+        self._size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+        self._stored = {}
+        self._revalidated = {}
+        self._accessed = {}
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(url):
+        """Hash a canonical URL into the cache key."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def get(self, url):
+        """
+        Look up a cached response and mark it as recently used.
+
+        Responses stored or revalidated since the last flush are served as buffered.
+
+        Args:
+            url (str): Canonical request URL (see cache_url)
+
+        Returns:
+            CacheEntry: The cached entry, or None if not cached
+        """
+        key = self._key(url)
+        stored = self._stored.get(key)
+        if stored is not None:
+            row = stored[2:6]
+        else:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+        entry = CacheEntry(url, row[0], row[1], row[2], self._revalidated.get(key, row[3]))
+        self._accessed[key] = time.time()
+        self._flush_if_full()
+        if self.offline or self.is_fresh(entry):
+            self.hits += 1
+        return entry
+
+    def is_fresh(self, entry):
+        """
+        Check whether an entry is inside the freshness window.
+
+        Args:
+            entry (CacheEntry): Cached entry
+
+        Returns:
+            bool: True if the entry can be served without revalidation
+        """
+        return time.time() - entry.fetched_at < self.max_age
+
+    def conditional_headers(self, entry):
+        """
+        Build conditional request headers for revalidating an entry.
+
+        Args:
+            entry (CacheEntry): Cached entry, or None
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers (empty if no validators)
+        """
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """
+        Store a response body, evicting least recently used entries if needed.
+
+        Args:
+            url (str): Canonical request URL
+            body (bytes): Raw response body
+            etag (str, optional): ETag response header
+            last_modified (str, optional): Last-Modified response header
+        """
+        key = self._key(url)
+        now = time.time()
+        replaced = self._stored.pop(key, None)
+        self._revalidated.pop(key, None)
+        self._accessed.pop(key, None)
+        self._stored[key] = (key, url, body, etag, last_modified, now, now, len(body))
+        # The size of an entry this replaces in the table is subtracted when the batch is written
+        self._size += len(body) - (replaced[7] if replaced else 0)
+        self.stores += 1
+
+        if self._size > self.max_size:
+            self.flush()
+            if self._size > self.max_size:
+                self.evict()
+        else:
+            self._flush_if_full()
+
+    def mark_revalidated(self, entry):
+        """
+        Restart the freshness window of an entry after a 304 response.
+
+        Args:
+            entry (CacheEntry): Entry confirmed unchanged by the server
+        """
+        entry.fetched_at = time.time()
+        self._revalidated[self._key(entry.url)] = entry.fetched_at
+        self.revalidated += 1
+        self._flush_if_full()
+
+    def _flush_if_full(self):
+        """Write the buffered writes once FLUSH_SIZE of them are pending."""
+        if len(self._stored) + len(self._revalidated) + len(self._accessed) >= FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Write the responses, revalidations and access times buffered since the last flush."""
+        if not (self._stored or self._revalidated or self._accessed):
+            return
+        keys = list(self._stored)
+        with self._conn:
+            self._conn.execute("BEGIN")
+            # Bound parameters per statement are limited, so look up replaced sizes in chunks
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                self._size -= self._conn.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM responses WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                list(self._stored.values())
+            )
+            self._conn.executemany(
+                "UPDATE responses SET fetched_at = ? WHERE key = ?",
+                [(fetched_at, key) for key, fetched_at in self._revalidated.items()]
+            )
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+            )
+        self._stored = {}
+        self._revalidated = {}
+        self._accessed = {}
+
+    def evict(self, target_size=None):
+        """
+        Remove least recently used entries until the cache fits the target size.
+
+        Args:
+            target_size (int, optional): Size to shrink to. Defaults to 90% of max_size,
+                so eviction does not run again on every following insert.
+        """
+        if target_size is None:
+            target_size = int(self.max_size * 0.9)
+        self.flush()
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        )
+        to_delete = []
+        size = self._size
+        for key, entry_size in rows:
+            if size <= target_size:
+                break
+            to_delete.append((key,))
+            size -= entry_size
+
+        if to_delete:
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+            self._size = size
+            self.evictions += len(to_delete)
+
+    def stats(self):
+        """
+        Get cache statistics for this run.
+
+        Returns:
+            dict: Hit/revalidation/miss/store/eviction counts and current size in bytes
+        """
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'size_bytes': self._size,
+        }
+
+    def close(self):
+        """Write the buffered writes and close the underlying SQLite connection."""
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,99 @@
+"""
+Bounded worker-pool fetch engine.
+
+This module runs a fetch coroutine over a (possibly very large) stream of
+items with a fixed number of workers connected by bounded queues. Only a
+bounded number of items and results are in memory at any time, and
+results are yielded as soon as they complete.
+"""
+import asyncio
+
+DEFAULT_WORKERS = 10
+
+_STOP = object()
+
+
+class _WorkerError:
+    """Wraps an exception raised by a worker so the consumer can re-raise it."""
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+async def _aiter_items(items):
+    """Iterate over a sync or async iterable as an async iterator."""
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def iter_fetch(items, fetch_one, workers=DEFAULT_WORKERS, queue_size=None):
+    """
+    Fetch items with a fixed pool of workers and yield results as they complete.
+
+    A producer feeds items into a bounded work queue; when it is full the
+    producer waits (backpressure), so the input is consumed lazily. Workers
+    put results into a bounded result queue, so they also pause when the
+    consumer falls behind.
+
+    Args:
+        items (iterable or async iterable): Items to fetch (e.g. object IDs)
+        fetch_one (callable): Coroutine function taking one item and returning its result
+        workers (int, optional): Number of concurrent workers. Defaults to DEFAULT_WORKERS.
+        queue_size (int, optional): Capacity of the work and result queues.
+            Defaults to twice the number of workers.
+
+    Yields:
+        tuple: (item, result) pairs in completion order
+
+    Raises:
+        Exception: Re-raises the first exception raised by fetch_one
+    """
+    queue_size = queue_size or workers * 2
+    work_queue = asyncio.Queue(maxsize=queue_size)
+    result_queue = asyncio.Queue(maxsize=queue_size)
+
+    # Stop markers are only sent on normal completion or error, never on
+    # cancellation, so cancelled tasks do not block on a full queue.
+    async def produce():
+        try:
+            async for item in _aiter_items(items):
+                await work_queue.put(item)
+        except Exception as e:
+            await result_queue.put(_WorkerError(e))
+        for _ in range(workers):
+            await work_queue.put(_STOP)
+
+    async def work():
+        try:
+            while True:
+                item = await work_queue.get()
+                if item is _STOP:
+                    break
+                result = await fetch_one(item)
+                await result_queue.put((item, result))
+        except Exception as e:
+            await result_queue.put(_WorkerError(e))
+        await result_queue.put(_STOP)
+
+    tasks = [asyncio.create_task(produce())]
+    tasks.extend(asyncio.create_task(work()) for _ in range(workers))
+
+    try:
+        finished = 0
+        while finished < workers:
+            result = await result_queue.get()
+            if result is _STOP:
+                finished += 1
+            elif isinstance(result, _WorkerError):
+                raise result.error
+            else:
+                yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,88 @@
+"""
+Fetch planning for MET object detail requests.
+
+This module merges the object ID lists of several departments (or
+searches) into one deduplicated work set before any detail request is
+made, and records which sources each object was listed by.
+"""
+
+
+class FetchPlan:
+    """
+    Deduplicated set of object IDs to fetch, with source membership.
+
+    Object IDs keep the order in which they were first listed, so the
+    plan is deterministic for a given set of source lists.
+
+    Attributes:
+        memberships (dict): Object ID -> list of source IDs (e.g. department IDs)
+            that listed it, in insertion order
+        listed (int): Total number of IDs across all source lists, duplicates included
+        sources (list): Source IDs added to the plan, in order
+    """
+    def __init__(self):
+        """Initialize an empty plan."""
+        self.memberships = {}
+        self.listed = 0
+        self.sources = []
+
+    def add_source(self, source_id, object_ids):
+        """
+        Merge one source's object ID list into the plan.
+
+        Args:
+            source_id: Identifier of the source (e.g. a department ID)
+            object_ids (iterable): Object IDs listed by the source
+        """
+        self.sources.append(source_id)
+        for object_id in object_ids:
+            self.listed += 1
+            members = self.memberships.get(object_id)
+            if members is None:
+                self.memberships[object_id] = [source_id]
+            elif members[-1] != source_id:
+                members.append(source_id)
+
+    @property
+    def object_ids(self):
+        """list: Unique object IDs to fetch, in first-listed order."""
+        return list(self.memberships)
+
+    @property
+    def saved_requests(self):
+        """int: Detail requests avoided by deduplication."""
+        return self.listed - len(self.memberships)
+
+    def sources_for(self, object_id):
+        """
+        Get the sources that listed an object.
+
+        Args:
+            object_id (int): MET object ID
+
+        Returns:
+            list: Source IDs, or an empty list if the object is not in the plan
+        """
+        return self.memberships.get(object_id, [])
+
+    def __len__(self):
+        return len(self.memberships)
+
+    def __contains__(self, object_id):
+        return object_id in self.memberships
+
+    def summary(self):
+        """
+        Get the deduplication summary.
+
+        Returns:
+            dict: Number of sources, IDs listed, unique IDs, requests saved,
+                  and objects listed by more than one source
+        """
+        return {
+            'sources': len(self.sources),
+            'listed': self.listed,
+            'unique': len(self.memberships),
+            'saved_requests': self.saved_requests,
+            'multi_source_objects': sum(1 for members in self.memberships.values() if len(members) > 1),
+        }
@@ -2,82 +2,160 @@
 MET Museum API client for fetching artwork data.
 
 This module handles all interactions with the MET Museum Collection API,
-including rate limiting, parallel fetching, and data extraction.
+including rate limiting, retries, parallel fetching, and data extraction.
 """
 import asyncio
-import aiohttp
+import time
 import pandas as pd
+from api import transport
+from api.cache import cache_url
+from api.fetch_engine import iter_fetch
+from api.fetch_planner import FetchPlan
+from api.rate_limiter import RateLimiter, SharedTokenBucket
+from api.retry import RetryPolicy, RetryStats, parse_retry_after
+from api.telemetry import FetchTelemetry
+from api.transport import create_session, install_uvloop
+from data.staging import ObjectBatch
 
 BASE_URL = "https://collectionapi.metmuseum.org/public/collection/v1"
 MAX_CONCURRENT_REQUESTS = 5
 DELAY_BETWEEN_REQUESTS = 0.3
+MAX_REQUESTS_PER_SECOND = 80
+FETCH_WORKERS = 10
 
+DEFAULT_RETRY_POLICY = RetryPolicy()
 
-class RateLimiter:
-    """
-    Rate limiter to control concurrent API requests and prevent API overload.
-
-    Uses a semaphore to limit concurrent requests and enforces a minimum delay
-    between requests to respect API rate limits.
 
-    Attributes:
-        semaphore (asyncio.Semaphore): Semaphore controlling max concurrent requests
-        delay (float): Minimum seconds to wait between requests
-        last_request_time (float): Timestamp of the last request
+async def request_json(session, url, rate_limiter, params=None, retry_policy=None,
+                       retry_stats=None, key=None, cache=None, telemetry=None, endpoint="other"):
     """
-    def __init__(self, max_concurrent, delay):
-        """
-        Initialize the rate limiter.
-
-        Args:
-            max_concurrent (int): Maximum number of concurrent requests allowed
-            delay (float): Minimum delay in seconds between requests
-        """
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        self.delay = delay
-        self.last_request_time = 0
-
-    async def acquire(self):
-        """
-        Acquire permission to make a request.
-
-        Waits for semaphore availability and enforces delay between requests.
-        Must be called before making an API request.
-        """
-        await self.semaphore.acquire()
+    Make a GET request to the MET API, retrying transient failures.
 
-        current_time = asyncio.get_event_loop().time()
-        time_since_last = current_time - self.last_request_time
+    Each attempt goes through the rate limiter and reports its outcome to it.
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    exponential backoff (honoring Retry-After); other failures, such as 404,
+    are returned immediately.
 
-        if time_since_last < self.delay:
-            await asyncio.sleep(self.delay - time_since_last)
+    With a cache, fresh entries are returned without any network call and
+    stale entries are revalidated with a conditional request. In offline
+    mode only cached entries are returned.
 
-        self.last_request_time = asyncio.get_event_loop().time()
-
-    def release(self):
-        """
-        Release the semaphore after a request completes.
-
-        Must be called after an API request finishes to allow the next request.
-        """
-        self.semaphore.release()
+    With telemetry, every attempt's limiter wait, wire latency, status,
+    and body size is recorded under `endpoint`.
 
+    Args:
+        session (aiohttp.ClientSession): HTTP session for making requests
+        url (str): URL to request
+        rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        params (dict, optional): Query string parameters
+        retry_policy (RetryPolicy, optional): Retry policy. Defaults to DEFAULT_RETRY_POLICY.
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        key (optional): Identifier of the request in retry_stats. Defaults to the URL.
+        cache (ResponseCache, optional): On-disk response cache
+        telemetry (FetchTelemetry, optional): Telemetry to record each attempt in
+        endpoint (str, optional): Endpoint name used in telemetry. Defaults to "other".
 
-async def get_object_ids(session, department_id, rate_limiter):
+    Returns:
+        tuple: (status, data) where status is the last HTTP status code (None if no
+               response was received) and data is the decoded JSON body of a 200
+               response, or None on failure
+    """
+    retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+    retry_stats = retry_stats if retry_stats is not None else RetryStats()
+    key = key if key is not None else url
+
+    entry = None
+    headers = None
+    if cache is not None:
+        full_url = cache_url(url, params)
+        entry = cache.get(full_url)
+        if entry is not None and (cache.offline or cache.is_fresh(entry)):
+            if telemetry is not None:
+                telemetry.record_cache_hit(endpoint)
+            return 200, transport.decode_json(entry.body)
+        if cache.offline:
+            retry_stats.record_failure(key, "not in offline cache")
+            return None, None
+        headers = cache.conditional_headers(entry)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        status = None
+        error = None
+        retry_after = None
+
+        waited = await rate_limiter.acquire()
+        if telemetry is not None:
+            telemetry.record_wait(endpoint, waited)
+            telemetry.request_started(endpoint)
+        start = time.monotonic()
+        latency = None
+        body = b""
+        try:
+            async with session.get(url, params=params, headers=headers) as response:
+                status = response.status
+                latency = time.monotonic() - start
+                rate_limiter.record_response(status, latency)
+                if status == 304 and entry is not None:
+                    cache.mark_revalidated(entry)
+                    retry_stats.record_success(key)
+                    return 200, transport.decode_json(entry.body)
+                if status == 200:
+                    body = await response.read()
+                    latency = time.monotonic() - start
+                    data = transport.decode_json(body)
+                    if cache is not None:
+                        cache.put(
+                            full_url, body,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified")
+                        )
+                    retry_stats.record_success(key)
+                    return status, data
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        except Exception as e:
+            error = e
+            if status is None:
+                latency = time.monotonic() - start
+                rate_limiter.record_response(None)
+        finally:
+            rate_limiter.release()
+            if telemetry is not None:
+                outcome = status if status is not None else type(error).__name__ if error else "cancelled"
+                # Wire time only: up to the body for 200s, the status line otherwise
+                wire_latency = latency if latency is not None else time.monotonic() - start
+                telemetry.request_finished(endpoint, outcome, wire_latency, len(body))
+
+        reason = f"{type(error).__name__}: {error}" if error is not None else f"status {status}"
+        if not retry_policy.should_retry(attempt, status=status, error=error):
+            retry_stats.record_failure(key, reason, status)
+            return status, None
+
+        retry_stats.record_retry(key)
+        await asyncio.sleep(retry_policy.get_delay(attempt, retry_after))
+
+
+async def get_object_ids(session, department_id, rate_limiter, retry_policy=None, retry_stats=None,
+                         cache=None, telemetry=None):
     """
     Fetch list of object IDs for a specific department from MET API.
 
     Retrieves only the object IDs (not full details) for highlighted objects
-    in the specified department.
+    in the specified department. Transient failures are retried.
 
     Args:
         session (aiohttp.ClientSession): HTTP session for making requests
         department_id (int): Department ID to fetch objects from
         rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        retry_policy (RetryPolicy, optional): Retry policy for this call
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        cache (ResponseCache, optional): On-disk response cache
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in
 
     Returns:
         list: List of object IDs (integers) for highlighted objects in the department.
-              Returns empty list on error.
+              Returns empty list if the request failed permanently.
     """
     url = f"{BASE_URL}/objects"
     params = {
@@ -85,151 +163,369 @@ async def get_object_ids(session, department_id, rate_limiter):
         "isHighlight": "true"
     }
 
-    await rate_limiter.acquire()
-    try:
-        async with session.get(url, params=params) as response:
-            data = await response.json()
-            object_ids = data.get("objectIDs", [])
-            print(f"Department {department_id}: Found {len(object_ids)} highlighted objects")
-            return object_ids
-    except Exception as e:
-        print(f"Error getting object IDs for department {department_id}: {e}")
+    status, data = await request_json(
+        session, url, rate_limiter, params=params, retry_policy=retry_policy,
+        retry_stats=retry_stats, key=f"department:{department_id}", cache=cache,
+        telemetry=telemetry, endpoint="object_ids"
+    )
+    if data is None:
+        print(f"Error getting object IDs for department {department_id}: status {status}")
         return []
-    finally:
-        rate_limiter.release()
+
+    object_ids = data.get("objectIDs") or []
+    print(f"Department {department_id}: Found {len(object_ids)} highlighted objects")
+    return object_ids
 
 
-async def get_object_details(session, object_id, rate_limiter):
+async def get_object_details(session, object_id, rate_limiter, retry_policy=None, retry_stats=None,
+                             cache=None, telemetry=None):
     """
     Fetch full details for a single artwork object from MET API.
 
     Retrieves complete metadata for an artwork including title, artist,
-    dates, culture, medium, dimensions, and other attributes.
+    dates, culture, medium, dimensions, and other attributes. Transient
+    failures are retried; a 404 fails immediately.
 
     Args:
         session (aiohttp.ClientSession): HTTP session for making requests
         object_id (int): MET object ID to fetch details for
         rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        retry_policy (RetryPolicy, optional): Retry policy for this call
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        cache (ResponseCache, optional): On-disk response cache
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in
 
     Returns:
         dict: Complete object data dictionary from API, or None on error
     """
     url = f"{BASE_URL}/objects/{object_id}"
 
-    await rate_limiter.acquire()
-    try:
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data
-            else:
-                print(f"Failed to fetch object {object_id}: status {response.status}")
-                return None
-    except Exception as e:
-        print(f"Error fetching object {object_id}: {e}")
+    status, data = await request_json(
+        session, url, rate_limiter, retry_policy=retry_policy,
+        retry_stats=retry_stats, key=object_id, cache=cache,
+        telemetry=telemetry, endpoint="object_details"
+    )
+    if data is None:
+        print(f"Failed to fetch object {object_id}: status {status}")
+    return data
+
+
+async def get_changed_object_ids(session, since, rate_limiter, department_ids=None, retry_policy=None,
+                                 retry_stats=None, telemetry=None):
+    """
+    Fetch IDs of objects whose metadata changed since a given date.
+
+    Uses the MET API metadataDate filter. The response is never cached,
+    since it changes between runs.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP session for making requests
+        since (datetime): Only return objects updated after this date
+        rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        department_ids (list, optional): Restrict to these departments. Defaults to all.
+        retry_policy (RetryPolicy, optional): Retry policy for this call
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in
+
+    Returns:
+        list: Changed object IDs, or None if the request failed permanently
+    """
+    url = f"{BASE_URL}/objects"
+    params = {"metadataDate": since.strftime("%Y-%m-%d")}
+    if department_ids:
+        params["departmentIds"] = "|".join(str(dept_id) for dept_id in department_ids)
+
+    status, data = await request_json(
+        session, url, rate_limiter, params=params, retry_policy=retry_policy,
+        retry_stats=retry_stats, key=f"changed-since:{params['metadataDate']}",
+        telemetry=telemetry, endpoint="changed_object_ids"
+    )
+    if data is None:
+        print(f"Error getting objects changed since {params['metadataDate']}: status {status}")
+        return None
+
+    object_ids = data.get("objectIDs") or []
+    print(f"Found {len(object_ids)} objects changed since {params['metadataDate']}")
+    return object_ids
+
+
+async def get_all_object_ids(session, rate_limiter, retry_policy=None, retry_stats=None, telemetry=None):
+    """
+    Fetch the IDs of every object currently in the MET collection.
+
+    Used to detect objects that have disappeared from the API.
+    The response is never cached.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP session for making requests
+        rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        retry_policy (RetryPolicy, optional): Retry policy for this call
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in
+
+    Returns:
+        list: All object IDs, or None if the request failed permanently
+    """
+    status, data = await request_json(
+        session, f"{BASE_URL}/objects", rate_limiter, retry_policy=retry_policy,
+        retry_stats=retry_stats, key="all-objects", telemetry=telemetry, endpoint="all_object_ids"
+    )
+    if data is None:
+        print(f"Error getting the full object ID list: status {status}")
         return None
-    finally:
-        rate_limiter.release()
+    return data.get("objectIDs") or []
+
+
+async def iter_object_details(session, object_ids, rate_limiter, retry_policy=None, retry_stats=None,
+                              cache=None, workers=FETCH_WORKERS, telemetry=None):
+    """
+    Fetch object details with a bounded worker pool, yielding them as they complete.
+
+    Object IDs are consumed lazily from `object_ids`, so memory use does not
+    grow with the number of IDs. Objects that could not be fetched are skipped.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP session for making requests
+        object_ids (iterable or async iterable): MET object IDs to fetch
+        rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        retry_policy (RetryPolicy, optional): Retry policy for all requests
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        cache (ResponseCache, optional): On-disk response cache
+        workers (int, optional): Number of fetch workers. Defaults to FETCH_WORKERS.
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in
+
+    Yields:
+        dict: Complete object data dictionary from API
+    """
+    async def fetch_one(object_id):
+        return await get_object_details(
+            session, object_id, rate_limiter, retry_policy, retry_stats, cache, telemetry
+        )
 
+    async for _, obj_details in iter_fetch(object_ids, fetch_one, workers=workers):
+        if obj_details:
+            yield obj_details
 
-async def fetch_department_objects(session, department_id, limit, rate_limiter):
+
+async def fetch_department_objects(session, department_id, limit, rate_limiter,
+                                   retry_policy=None, retry_stats=None, cache=None,
+                                   workers=FETCH_WORKERS, telemetry=None):
     """
     Fetch all objects for a single department in parallel.
 
     First retrieves object IDs for the department, then fetches full details
-    for each object concurrently using asyncio.gather(). Extracts and structures
-    the relevant fields from each object's metadata.
+    with a bounded pool of workers. The relevant fields of each object are
+    staged in a columnar ObjectBatch.
 
     Args:
         session (aiohttp.ClientSession): HTTP session for making requests
         department_id (int): Department ID to fetch objects from
         limit (int): Maximum number of objects to fetch from this department
         rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        retry_policy (RetryPolicy, optional): Retry policy for all requests
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        cache (ResponseCache, optional): On-disk response cache
+        workers (int, optional): Number of fetch workers. Defaults to FETCH_WORKERS.
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in
 
     Returns:
-        list: List of dictionaries, each containing extracted artwork data fields
+        ObjectBatch: Staged artwork data fields of the fetched objects
     """
     print(f"\n{'='*60}")
     print(f"Starting to process Department {department_id}")
     print('='*60)
 
-    object_ids = await get_object_ids(session, department_id, rate_limiter)
+    object_ids = await get_object_ids(
+        session, department_id, rate_limiter, retry_policy, retry_stats, cache, telemetry
+    )
     object_ids = object_ids[:limit]
 
     print(f"Will fetch details for {len(object_ids)} objects from department {department_id}")
 
-    tasks = []
-    for obj_id in object_ids:
-        task = get_object_details(session, obj_id, rate_limiter)
-        tasks.append(task)
-
-    results = await asyncio.gather(*tasks)
-
-    objects_data = []
-    for obj_details in results:
-        if obj_details:
-            obj_info = {
-                "met_object_id": obj_details.get("objectID"),
-                "title": obj_details.get("title"),
-                "artist_display_name": obj_details.get("artistDisplayName"),
-                "artist_display_bio": obj_details.get("artistDisplayBio"),
-                "artist_nationality": obj_details.get("artistNationality"),
-                "artist_gender": obj_details.get("artistGender"),
-                "object_date": obj_details.get("objectDate"),
-                "object_begin_date": obj_details.get("objectBeginDate"),
-                "object_end_date": obj_details.get("objectEndDate"),
-                "culture": obj_details.get("culture"),
-                "period": obj_details.get("period"),
-                "dynasty": obj_details.get("dynasty"),
-                "medium": obj_details.get("medium"),
-                "dimensions": obj_details.get("dimensions"),
-                "department": obj_details.get("department"),
-                "classification": obj_details.get("classification"),
-                "object_name": obj_details.get("objectName"),
-                "primary_image": obj_details.get("primaryImage"),
-                "is_public_domain": obj_details.get("isPublicDomain", False),
-                "constituents": obj_details.get("constituents"),
-                "synced_at": pd.Timestamp.now()
-            }
-            objects_data.append(obj_info)
+    objects_data = ObjectBatch()
+    async for obj_details in iter_object_details(
+        session, object_ids, rate_limiter, retry_policy, retry_stats, cache, workers, telemetry
+    ):
+        objects_data.append(obj_details)
 
     print(f"Successfully fetched {len(objects_data)} objects from department {department_id}")
     return objects_data
 
 
-async def fetch_all_departments(department_ids, limit_per_department):
+async def plan_department_fetch(session, department_ids, limit_per_department, rate_limiter,
+                                retry_policy=None, retry_stats=None, cache=None, telemetry=None):
+    """
+    Build one deduplicated work set from the object ID lists of several departments.
+
+    All department ID lists are fetched (concurrently) before any detail
+    request is made, so an object listed by several departments is only
+    fetched once.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP session for making requests
+        department_ids (list): List of department IDs to fetch object IDs for
+        limit_per_department (int): Maximum number of object IDs per department
+        rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        retry_policy (RetryPolicy, optional): Retry policy for all requests
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        cache (ResponseCache, optional): On-disk response cache
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in
+
+    Returns:
+        FetchPlan: Unique object IDs with the departments that listed each of them
+    """
+    async def fetch_ids(department_id):
+        return await get_object_ids(
+            session, department_id, rate_limiter, retry_policy, retry_stats, cache, telemetry
+        )
+
+    id_lists = {}
+    async for department_id, object_ids in iter_fetch(
+        department_ids, fetch_ids, workers=min(len(department_ids), rate_limiter.max_concurrent) or 1
+    ):
+        id_lists[department_id] = object_ids[:limit_per_department]
+
+    plan = FetchPlan()
+    for department_id in department_ids:
+        if department_id in id_lists:
+            plan.add_source(department_id, id_lists[department_id])
+
+    summary = plan.summary()
+    print(f"Fetch plan: {summary['listed']} object IDs listed across {summary['sources']} departments, "
+          f"{summary['unique']} unique ({summary['saved_requests']} duplicate requests saved, "
+          f"{summary['multi_source_objects']} objects in several departments)")
+    return plan
+
+
+def print_fetch_report(rate_limiter, retry_stats, cache=None, telemetry=None):
+    """
+    Print rate limiter, retry, cache, and per-endpoint statistics for a fetch run.
+
+    Args:
+        rate_limiter (RateLimiter): Rate limiter used for the run
+        retry_stats (RetryStats): Retry statistics collected during the run
+        cache (ResponseCache, optional): Response cache used for the run
+        telemetry (FetchTelemetry, optional): Request telemetry collected during the run
+    """
+    limiter_stats = rate_limiter.stats()
+    print(f"\nRate limiter: final rate {limiter_stats['rate']} req/s, "
+          f"{limiter_stats['requests']} requests, "
+          f"mean wait {limiter_stats['wait_time_mean']}s, "
+          f"max wait {limiter_stats['wait_time_max']}s, "
+          f"{limiter_stats['throttled']} throttled")
+
+    retry_summary = retry_stats.summary()
+    print(f"Retries: {retry_summary['retried']} requests retried "
+          f"({retry_summary['retries']} extra attempts), "
+          f"{retry_summary['recovered']} recovered, "
+          f"{retry_summary['failed']} permanently failed "
+          f"({retry_summary['not_found']} not found)")
+    failed = sorted(retry_stats.failed.items(), key=lambda item: str(item[0]))
+    for key, reason in failed[:20]:
+        print(f"  ✗ {key}: {reason}")
+    if len(failed) > 20:
+        print(f"  ... and {len(failed) - 20} more")
+
+    if cache is not None:
+        cache_stats = cache.stats()
+        print(f"Cache: {cache_stats['hits']} served from cache, "
+              f"{cache_stats['revalidated']} revalidated (304), "
+              f"{cache_stats['stores']} stored, "
+              f"{cache_stats['evictions']} evicted, "
+              f"{cache_stats['size_bytes'] / (1024 * 1024):.1f} MB on disk")
+
+    if telemetry is not None:
+        report = telemetry.report()
+        for name, endpoint in report['endpoints'].items():
+            latency = endpoint['latency_seconds']
+            wait = endpoint['limiter_wait_seconds']
+            statuses = ", ".join(f"{status}: {count}" for status, count in endpoint['statuses'].items())
+            print(f"Endpoint {name}: {endpoint['requests']} requests "
+                  f"({endpoint['requests_per_second']} req/s), "
+                  f"{endpoint['bytes_received'] / (1024 * 1024):.1f} MB, "
+                  f"peak {endpoint['peak_in_flight']} in flight")
+            if latency['count']:
+                print(f"  latency p50 {latency['p50']}s, p90 {latency['p90']}s, "
+                      f"p99 {latency['p99']}s, max {latency['max']}s; "
+                      f"limiter wait mean {wait['mean']}s, p99 {wait['p99']}s")
+            print(f"  statuses: {statuses}")
+
+
+def create_rate_limiter(bucket=None):
+    """
+    Create the rate limiter shared by all requests of a sync run.
+
+    Args:
+        bucket (TokenBucket, optional): Token bucket to draw from, e.g. one from
+            create_shared_bucket() for a sharded sync. Defaults to a private bucket.
+
+    Returns:
+        RateLimiter: Limiter starting at 1 / DELAY_BETWEEN_REQUESTS req/s
+    """
+    return RateLimiter(
+        MAX_CONCURRENT_REQUESTS,
+        1 / DELAY_BETWEEN_REQUESTS,
+        max_rate=MAX_REQUESTS_PER_SECOND,
+        bucket=bucket
+    )
+
+
+def create_shared_bucket():
+    """
+    Create a token bucket that several sync processes can share.
+
+    Returns:
+        SharedTokenBucket: Bucket starting at 1 / DELAY_BETWEEN_REQUESTS req/s
+    """
+    return SharedTokenBucket(1 / DELAY_BETWEEN_REQUESTS, MAX_CONCURRENT_REQUESTS)
+
+
+async def fetch_all_departments(department_ids, limit_per_department, retry_policy=None, cache=None,
+                                workers=FETCH_WORKERS, transport_config=None, telemetry=None):
     """
     Fetch objects from multiple departments concurrently.
 
-    Processes all departments in parallel, with objects within each department
-    also fetched in parallel. Uses a shared rate limiter across all requests
-    to prevent API overload.
+    Department ID lists are fetched concurrently and merged into one
+    deduplicated fetch plan, which is fed into a single bounded worker pool
+    that fetches object details. Uses a shared rate limiter across all
+    requests to prevent API overload.
 
     Args:
         department_ids (list): List of department IDs to fetch objects from
         limit_per_department (int): Maximum number of objects to fetch per department
+        retry_policy (RetryPolicy, optional): Retry policy for all requests
+        cache (ResponseCache, optional): On-disk response cache
+        workers (int, optional): Number of fetch workers. Defaults to FETCH_WORKERS.
+        transport_config (TransportConfig, optional): HTTP session settings
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in.
+            Defaults to a new FetchTelemetry.
 
     Returns:
-        list: Combined list of all artwork dictionaries from all departments
+        ObjectBatch: Staged artwork data fields of all objects from all departments
     """
-    rate_limiter = RateLimiter(MAX_CONCURRENT_REQUESTS, DELAY_BETWEEN_REQUESTS)
+    rate_limiter = create_rate_limiter()
+    retry_stats = RetryStats()
+    telemetry = telemetry if telemetry is not None else FetchTelemetry()
 
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for dept_id in department_ids:
-            task = fetch_department_objects(session, dept_id, limit_per_department, rate_limiter)
-            tasks.append(task)
+    async with create_session(transport_config) as session:
+        plan = await plan_department_fetch(
+            session, department_ids, limit_per_department, rate_limiter, retry_policy, retry_stats, cache,
+            telemetry
+        )
 
-        results = await asyncio.gather(*tasks)
+        all_objects = ObjectBatch()
+        async for obj_details in iter_object_details(
+            session, plan.object_ids, rate_limiter, retry_policy, retry_stats, cache, workers, telemetry
+        ):
+            all_objects.append(obj_details)
 
-        all_objects = []
-        for dept_objects in results:
-            all_objects.extend(dept_objects)
+        print_fetch_report(rate_limiter, retry_stats, cache, telemetry)
 
         return all_objects
 
 
-def fetch_museum_data(department_ids, limit_per_department=20):
+def fetch_museum_data(department_ids, limit_per_department=20, retry_policy=None, cache=None,
+                      transport_config=None):
     """
     Main entry point for fetching museum artwork data.
 
@@ -239,6 +535,10 @@ def fetch_museum_data(department_ids, limit_per_department=20):
     Args:
         department_ids (list): List of department IDs to fetch objects from
         limit_per_department (int, optional): Maximum objects per department. Defaults to 20.
+        retry_policy (RetryPolicy, optional): Retry policy for all requests.
+            Defaults to DEFAULT_RETRY_POLICY.
+        cache (ResponseCache, optional): On-disk response cache. Defaults to None (no caching).
+        transport_config (TransportConfig, optional): HTTP session settings. Defaults to TransportConfig().
 
     Returns:
         pandas.DataFrame: DataFrame containing fetched artwork data with timestamp columns
@@ -247,11 +547,19 @@ def fetch_museum_data(department_ids, limit_per_department=20):
     print(f"Departments: {department_ids}")
     print(f"Objects per department: {limit_per_department}")
     print(f"Max concurrent requests: {MAX_CONCURRENT_REQUESTS}")
-    print(f"Delay between requests: {DELAY_BETWEEN_REQUESTS} seconds")
+    print(f"Initial request rate: {1 / DELAY_BETWEEN_REQUESTS:.1f} req/s (max {MAX_REQUESTS_PER_SECOND})")
+
+    if transport_config is not None and transport_config.use_uvloop:
+        install_uvloop()
 
-    all_objects = asyncio.run(fetch_all_departments(department_ids, limit_per_department))
+    all_objects = asyncio.run(
+        fetch_all_departments(
+            department_ids, limit_per_department, retry_policy, cache,
+            transport_config=transport_config
+        )
+    )
 
-    df = pd.DataFrame(all_objects)
+    df = all_objects.to_dataframe()
 
     current_time = pd.Timestamp.now()
     df['created_at'] = current_time
@@ -0,0 +1,541 @@
+"""
+Local stand-in for the MET Collection API.
+
+This module serves the endpoints used by the client (/objects,
+/objects/{id}, /departments, and /search) from synthetic or recorded
+fixtures, so the fetcher can be benchmarked and load-tested offline and
+reproducibly. Latency, server errors, 429 responses, and a server-side
+rate limit can be injected.
+
+Point the client at it by setting api.met_client.BASE_URL to the
+server's URL (see scripts/run_met_stub_server.py).
+"""
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import aiohttp
+from aiohttp import web
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8710
+
+DEPARTMENTS = [
+    (1, "American Decorative Arts"), (3, "Ancient Near Eastern Art"), (4, "Arms and Armor"),
+    (5, "Arts of Africa, Oceania, and the Americas"), (6, "Asian Art"), (7, "The Cloisters"),
+    (8, "The Costume Institute"), (9, "Drawings and Prints"), (10, "Egyptian Art"),
+    (11, "European Paintings"), (12, "European Sculpture and Decorative Arts"),
+    (13, "Greek and Roman Art"), (14, "Islamic Art"), (15, "The Robert Lehman Collection"),
+    (16, "The Libraries"), (17, "Medieval Art"), (18, "Musical Instruments"),
+    (19, "Photographs"), (21, "Modern Art"),
+]
+
+_CULTURES = ["", "American", "French", "Japanese", "Chinese", "Egyptian", "Greek", "Italian"]
+_MEDIUMS = ["Oil on canvas", "Bronze", "Terracotta", "Silk", "Gelatin silver print", "Marble"]
+_CLASSIFICATIONS = ["Paintings", "Sculpture", "Ceramics", "Textiles", "Photographs", "Metalwork"]
+_NATIONALITIES = ["", "Dutch", "French", "American", "Japanese", "Italian"]
+_METADATA_EPOCH = datetime(2023, 1, 1)
+
+
+class StubConfig:
+    """
+    Behaviour of the stand-in server.
+
+    Attributes:
+        object_count (int): Number of synthetic objects (IDs 1..object_count)
+        highlight_ratio (float): Fraction of objects flagged isHighlight
+        missing_ratio (float): Fraction of listed object IDs that return 404,
+            like withdrawn objects in the real API
+        latency (float): Base response delay in seconds
+        latency_jitter (float): Extra random delay in seconds (uniform 0..jitter)
+        error_rate (float): Probability of a 500 response
+        throttle_rate (float): Probability of a 429 response
+        retry_after (float): Retry-After value sent with 429 responses, or None
+        rate_limit (float): Requests per second served before answering 429, or None
+        fixtures_path (str): JSON file with recorded departments and objects, or None
+            for synthetic objects
+        seed (int): Seed for injected failures and latency
+    """
+    def __init__(self, object_count=10000, highlight_ratio=0.2, missing_ratio=0.0, latency=0.0,
+                 latency_jitter=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1.0,
+                 rate_limit=None, fixtures_path=None, seed=0):
+        """
+        Initialize the server settings.
+
+        Args:
+            object_count (int, optional): Number of synthetic objects. Defaults to 10000.
+            highlight_ratio (float, optional): Fraction of highlighted objects. Defaults to 0.2.
+            missing_ratio (float, optional): Fraction of listed IDs answering 404. Defaults to 0.0.
+            latency (float, optional): Base delay per response in seconds. Defaults to 0.0.
+            latency_jitter (float, optional): Random extra delay in seconds. Defaults to 0.0.
+            error_rate (float, optional): Probability of a 500 response. Defaults to 0.0.
+            throttle_rate (float, optional): Probability of a 429 response. Defaults to 0.0.
+            retry_after (float, optional): Retry-After for 429 responses. Defaults to 1.0.
+            rate_limit (float, optional): Server-side requests per second. Defaults to None.
+            fixtures_path (str, optional): Recorded fixtures file. Defaults to None.
+            seed (int, optional): Random seed. Defaults to 0.
+        """
+        self.object_count = object_count
+        self.highlight_ratio = highlight_ratio
+        self.missing_ratio = missing_ratio
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self.fixtures_path = fixtures_path
+        self.seed = seed
+
+
+def _metadata_date(object_id):
+    """Get the synthetic metadataDate of an object, spread over one year."""
+    updated = _METADATA_EPOCH + timedelta(minutes=object_id * 7919 % (365 * 24 * 60))
+    return updated.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def build_object(object_id):
+    """
+    Build a deterministic synthetic object shaped like a MET API response.
+
+    Args:
+        object_id (int): MET object ID
+
+    Returns:
+        dict: Object details
+    """
+    rng = random.Random(object_id)
+    department_id, department = DEPARTMENTS[object_id % len(DEPARTMENTS)]
+    begin_date = rng.randint(-2000, 2000)
+    return {
+        "objectID": object_id,
+        "isHighlight": False,
+        "accessionNumber": f"{department_id}.{object_id // 1000}.{object_id % 1000}",
+        "isPublicDomain": rng.random() < 0.7,
+        "primaryImage": f"https://images.metmuseum.org/CRDImages/ep/original/DT{object_id}.jpg",
+        "primaryImageSmall": f"https://images.metmuseum.org/CRDImages/ep/web-large/DT{object_id}.jpg",
+        "additionalImages": [
+            f"https://images.metmuseum.org/CRDImages/ep/original/DT{object_id}_{i}.jpg"
+            for i in range(rng.randint(0, 8))
+        ],
+        "constituents": [
+            {"constituentID": object_id * 10 + i, "role": "Artist", "name": f"Artist {object_id % 997}",
+             "constituentULAN_URL": "http://vocab.getty.edu/page/ulan/500010363",
+             "constituentWikidata_URL": "https://www.wikidata.org/wiki/Q5582", "gender": ""}
+            for i in range(rng.randint(0, 3))
+        ] or None,
+        "department": department,
+        "objectName": rng.choice(_CLASSIFICATIONS).rstrip("s"),
+        "title": f"Untitled {object_id}",
+        "culture": rng.choice(_CULTURES),
+        "period": "",
+        "dynasty": "",
+        "artistDisplayName": f"Artist {object_id % 997}",
+        "artistDisplayBio": "1853–1890",
+        "artistNationality": rng.choice(_NATIONALITIES),
+        "artistGender": "",
+        "objectDate": str(begin_date) if begin_date > 0 else f"ca. {-begin_date} B.C.",
+        "objectBeginDate": begin_date,
+        "objectEndDate": begin_date + rng.randint(0, 50),
+        "medium": rng.choice(_MEDIUMS),
+        "dimensions": f"{rng.randint(5, 200)} × {rng.randint(5, 200)} cm",
+        "classification": rng.choice(_CLASSIFICATIONS),
+        "creditLine": "Gift of the stand-in server",
+        "tags": [{"term": "Landscapes", "AAT_URL": "http://vocab.getty.edu/page/aat/300132294",
+                  "Wikidata_URL": "https://www.wikidata.org/wiki/Q107425"}],
+        "objectURL": f"https://www.metmuseum.org/art/collection/search/{object_id}",
+        "metadataDate": _metadata_date(object_id),
+        "repository": "Metropolitan Museum of Art, New York, NY",
+    }
+
+
+class StubCollection:
+    """
+    Objects and departments served by the stand-in.
+
+    Attributes:
+        departments (list): Department dicts as returned by /departments
+        objects (dict): Recorded objects keyed by object ID (empty for synthetic data)
+        object_ids (list): All listed object IDs
+        highlights (set): IDs of highlighted objects
+        missing (set): Listed IDs that answer 404
+    """
+    def __init__(self, config):
+        """
+        Build the collection from recorded fixtures or synthetic objects.
+
+        Args:
+            config (StubConfig): Server settings
+        """
+        rng = random.Random(config.seed)
+        if config.fixtures_path:
+            with open(config.fixtures_path) as f:
+                fixtures = json.load(f)
+            self.departments = fixtures["departments"]
+            self.objects = {obj["objectID"]: obj for obj in fixtures["objects"]}
+            self.object_ids = sorted(self.objects)
+            self.highlights = {object_id for object_id, obj in self.objects.items() if obj.get("isHighlight")}
+        else:
+            self.departments = [{"departmentId": dept_id, "displayName": name} for dept_id, name in DEPARTMENTS]
+            self.objects = {}
+            self.object_ids = list(range(1, config.object_count + 1))
+            self.highlights = {
+                object_id for object_id in self.object_ids if rng.random() < config.highlight_ratio
+            }
+
+        self.missing = {object_id for object_id in self.object_ids if rng.random() < config.missing_ratio}
+        self._department_names = {dept["departmentId"]: dept["displayName"] for dept in self.departments}
+
+    def get(self, object_id):
+        """Get an object's details, or None if it does not exist."""
+        if object_id in self.missing:
+            return None
+        if self.objects:
+            return self.objects.get(object_id)
+        if 1 <= object_id <= len(self.object_ids):
+            obj = build_object(object_id)
+            obj["isHighlight"] = object_id in self.highlights
+            return obj
+        return None
+
+    def department_of(self, object_id):
+        """Get the department name of an object without building it."""
+        if self.objects:
+            return self.objects[object_id].get("department")
+        return DEPARTMENTS[object_id % len(DEPARTMENTS)][1]
+
+    def metadata_date_of(self, object_id):
+        """Get the metadataDate of an object without building it."""
+        if self.objects:
+            return self.objects[object_id].get("metadataDate", "")
+        return _metadata_date(object_id)
+
+    def filter_ids(self, department_ids=None, highlights_only=False, since=None):
+        """
+        Select listed object IDs.
+
+        Args:
+            department_ids (list, optional): Department IDs to include
+            highlights_only (bool, optional): Only include highlighted objects
+            since (str, optional): Only include objects updated on or after this YYYY-MM-DD date
+
+        Returns:
+            list: Matching object IDs in ascending order
+        """
+        names = None
+        if department_ids:
+            names = {self._department_names.get(dept_id) for dept_id in department_ids}
+        object_ids = []
+        for object_id in self.object_ids:
+            if highlights_only and object_id not in self.highlights:
+                continue
+            if names is not None and self.department_of(object_id) not in names:
+                continue
+            if since is not None and self.metadata_date_of(object_id)[:10] < since:
+                continue
+            object_ids.append(object_id)
+        return object_ids
+
+
+class _ServerRateLimit:
+    """Token bucket for the server-side rate limit (one request per token)."""
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def allow(self):
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+def _parse_ids(value):
+    """Parse a pipe-separated list of integer IDs from a query parameter."""
+    if not value:
+        return None
+    return [int(part) for part in value.split("|") if part.strip()]
+
+
+def create_app(config=None):
+    """
+    Create the stand-in aiohttp application.
+
+    Besides the MET endpoints, GET /_stats returns the number of responses
+    served per status code, and POST /_stats/reset clears it.
+
+    Args:
+        config (StubConfig, optional): Server settings. Defaults to StubConfig().
+
+    Returns:
+        aiohttp.web.Application: Application to run with web.run_app or an AppRunner
+    """
+    config = config or StubConfig()
+    collection = StubCollection(config)
+    rng = random.Random(config.seed)
+    rate_limit = _ServerRateLimit(config.rate_limit) if config.rate_limit else None
+    served = Counter()
+
+    def respond(status, payload=None, headers=None):
+        served[status] += 1
+        if payload is None:
+            return web.Response(status=status, headers=headers)
+        return web.json_response(payload, status=status, headers=headers)
+
+    @web.middleware
+    async def inject_faults(request, handler):
+        if request.path.startswith("/_stats"):
+            return await handler(request)
+
+        delay = config.latency + (rng.uniform(0, config.latency_jitter) if config.latency_jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        retry_headers = {"Retry-After": str(config.retry_after)} if config.retry_after is not None else None
+        if rate_limit is not None and not rate_limit.allow():
+            return respond(429, {"message": "Too Many Requests"}, retry_headers)
+        if config.throttle_rate and rng.random() < config.throttle_rate:
+            return respond(429, {"message": "Too Many Requests"}, retry_headers)
+        if config.error_rate and rng.random() < config.error_rate:
+            return respond(500, {"message": "Internal Server Error"})
+        return await handler(request)
+
+    async def list_objects(request):
+        query = request.query
+        object_ids = collection.filter_ids(
+            department_ids=_parse_ids(query.get("departmentIds")),
+            highlights_only=query.get("isHighlight", "").lower() == "true",
+            since=query.get("metadataDate"),
+        )
+        return respond(200, {"total": len(object_ids), "objectIDs": object_ids or None})
+
+    async def get_object(request):
+        try:
+            object_id = int(request.match_info["object_id"])
+        except ValueError:
+            return respond(404, {"message": "Not a valid object"})
+        obj = collection.get(object_id)
+        if obj is None:
+            return respond(404, {"message": "Not a valid object"})
+
+        etag = f'"{object_id}-{obj.get("metadataDate", "")}"'
+        if request.headers.get("If-None-Match") == etag:
+            return respond(304, headers={"ETag": etag})
+        return respond(200, obj, {"ETag": etag})
+
+    async def list_departments(request):
+        return respond(200, {"departments": collection.departments})
+
+    async def search(request):
+        query = request.query
+        department_id = query.get("departmentId")
+        object_ids = collection.filter_ids(
+            department_ids=[int(department_id)] if department_id else None,
+            highlights_only=query.get("isHighlight", "").lower() == "true",
+        )
+        text = query.get("q", "").strip().lower()
+        if text and text != "*" and collection.objects:
+            object_ids = [
+                object_id for object_id in object_ids
+                if text in (collection.objects[object_id].get("title") or "").lower()
+            ]
+        return respond(200, {"total": len(object_ids), "objectIDs": object_ids or None})
+
+    async def get_stats(request):
+        return web.json_response({str(status): count for status, count in sorted(served.items())})
+
+    async def reset_stats(request):
+        served.clear()
+        return web.json_response({})
+
+    app = web.Application(middlewares=[inject_faults])
+    app.router.add_get("/objects", list_objects)
+    app.router.add_get("/objects/{object_id}", get_object)
+    app.router.add_get("/departments", list_departments)
+    app.router.add_get("/search", search)
+    app.router.add_get("/_stats", get_stats)
+    app.router.add_post("/_stats/reset", reset_stats)
+    return app
+
+
+def add_stub_arguments(parser):
+    """
+    Add the stand-in server settings to an argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser to extend
+    """
+    parser.add_argument("--objects", type=int, default=10000,
+                        help="Number of synthetic objects")
+    parser.add_argument("--fixtures", default=None,
+                        help="Serve recorded fixtures from this JSON file instead of synthetic objects")
+    parser.add_argument("--highlight-ratio", type=float, default=0.2,
+                        help="Fraction of synthetic objects flagged as highlights")
+    parser.add_argument("--missing-ratio", type=float, default=0.0,
+                        help="Fraction of listed objects that answer 404")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Base response delay in seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0,
+                        help="Random extra response delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Probability of a 500 response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="Probability of a 429 response")
+    parser.add_argument("--retry-after", type=float, default=1.0,
+                        help="Retry-After seconds sent with 429 responses")
+    parser.add_argument("--rate-limit", type=float, default=None,
+                        help="Requests per second served before answering 429")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for injected faults")
+
+
+def stub_config_from_args(args):
+    """
+    Build the stand-in server settings from parsed arguments.
+
+    Args:
+        args (argparse.Namespace): Arguments added by add_stub_arguments
+
+    Returns:
+        StubConfig: Server settings
+    """
+    return StubConfig(
+        object_count=args.objects,
+        highlight_ratio=args.highlight_ratio,
+        missing_ratio=args.missing_ratio,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        rate_limit=args.rate_limit,
+        fixtures_path=args.fixtures,
+        seed=args.seed,
+    )
+
+
+def run_server(config=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Run the stand-in server until interrupted (blocking).
+
+    Args:
+        config (StubConfig, optional): Server settings
+        host (str, optional): Interface to bind. Defaults to DEFAULT_HOST.
+        port (int, optional): Port to listen on. Defaults to DEFAULT_PORT.
+    """
+    web.run_app(create_app(config), host=host, port=port, print=None, access_log=None)
+
+
+def start_server_process(config=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Run the stand-in server in a child process.
+
+    Keeping the server out of the client's process means its CPU time
+    does not distort client-side measurements.
+
+    Args:
+        config (StubConfig, optional): Server settings
+        host (str, optional): Interface to bind. Defaults to DEFAULT_HOST.
+        port (int, optional): Port to listen on. Defaults to DEFAULT_PORT.
+
+    Returns:
+        multiprocessing.Process: Started server process (call terminate() when done)
+    """
+    process = multiprocessing.Process(target=run_server, args=(config, host, port), daemon=True)
+    process.start()
+    return process
+
+
+async def wait_for_server(base_url, timeout=10.0):
+    """
+    Wait until the stand-in server accepts requests.
+
+    Args:
+        base_url (str): Server URL, e.g. "http://127.0.0.1:8710"
+        timeout (float, optional): Seconds to wait. Defaults to 10.0.
+
+    Raises:
+        RuntimeError: If the server did not start in time
+    """
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{base_url}/_stats") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientConnectionError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"Stand-in server at {base_url} did not start")
+
+
+async def fetch_server_stats(base_url, reset=False):
+    """
+    Get the number of responses the stand-in served per status code.
+
+    Args:
+        base_url (str): Server URL
+        reset (bool, optional): Clear the counters afterwards. Defaults to False.
+
+    Returns:
+        dict: Status code (int) -> number of responses
+    """
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}/_stats") as response:
+            served = {int(status): count for status, count in (await response.json()).items()}
+        if reset:
+            async with session.post(f"{base_url}/_stats/reset"):
+                pass
+    return served
+
+
+async def record_fixtures(path, department_ids, limit_per_department):
+    """
+    Record departments and highlighted objects from the live MET API.
+
+    The fixtures file can be served by the stand-in with
+    StubConfig(fixtures_path=path).
+
+    Args:
+        path (str): Output JSON file
+        department_ids (list): Departments to record objects from
+        limit_per_department (int): Maximum number of objects per department
+
+    Returns:
+        int: Number of objects recorded
+    """
+    from api import met_client
+    from api.retry import RetryStats
+    from api.transport import create_session
+
+    rate_limiter = met_client.create_rate_limiter()
+    retry_stats = RetryStats()
+    async with create_session() as session:
+        _, data = await met_client.request_json(
+            session, f"{met_client.BASE_URL}/departments", rate_limiter,
+            retry_stats=retry_stats, key="departments"
+        )
+        departments = (data or {}).get("departments", [])
+
+        plan = await met_client.plan_department_fetch(
+            session, department_ids, limit_per_department, rate_limiter, retry_stats=retry_stats
+        )
+        objects = [
+            obj async for obj in met_client.iter_object_details(
+                session, plan.object_ids, rate_limiter, retry_stats=retry_stats
+            )
+        ]
+
+    with open(path, "w") as f:
+        json.dump({"departments": departments, "objects": objects}, f)
+    print(f"✓ Recorded {len(objects)} objects from {len(department_ids)} departments to {path}")
+    return len(objects)
@@ -0,0 +1,395 @@
+"""
+Adaptive rate limiting for MET API requests.
+
+This module provides a token-bucket rate limiter that enforces a target
+request rate and a separate cap on in-flight requests. The rate adapts
+to server feedback (AIMD): it is cut multiplicatively when the server
+throttles (429) or keeps failing, and grows additively while requests
+succeed.
+
+The token bucket is pluggable: TokenBucket keeps its state in the current
+process, and SharedTokenBucket keeps it in shared memory so several sync
+processes draw from (and adapt) one global request budget.
+"""
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+
+
+class TokenBucket:
+    """
+    Token bucket holding the adaptive request rate of one process.
+
+    Attributes:
+        burst (float): Maximum number of tokens the bucket can hold
+    """
+    def __init__(self, rate, burst):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Refill rate in tokens (requests) per second
+            burst (float): Bucket capacity
+        """
+        self.burst = float(burst)
+        self._rate = float(rate)
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._last_decrease = float('-inf')
+
+    @property
+    def rate(self):
+        """float: Current refill rate in tokens per second."""
+        return self._rate
+
+    def _refill(self, now):
+        """Add the tokens accrued since the last refill, capped at the burst size."""
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def try_take(self):
+        """
+        Take a token if one is available.
+
+        Returns:
+            float: 0.0 if a token was taken, otherwise seconds until the next token
+        """
+        self._refill(time.monotonic())
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+    def increase(self, step, max_rate, ratio=0.0):
+        """
+        Raise the rate by step / rate + ratio, up to max_rate.
+
+        Called once per successful request, i.e. about `rate` times per
+        second, so the rate grows by `step` plus `ratio` times itself per
+        second of traffic.
+
+        Args:
+            step (float): Additive increase in requests/second per second of traffic
+            max_rate (float): Upper bound for the rate
+            ratio (float, optional): Proportional increase per second of traffic. Defaults to 0.0.
+        """
+        self._rate = min(max_rate, self._rate + step / self._rate + ratio)
+
+    def decrease(self, factor, min_rate, cooldown):
+        """
+        Multiplicatively cut the rate, at most once per cooldown period.
+
+        Args:
+            factor (float): Multiplier applied to the rate
+            min_rate (float): Lower bound for the rate
+            cooldown (float): Minimum seconds between two decreases
+
+        Returns:
+            bool: True if the rate was cut
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < cooldown:
+            return False
+        self._refill(now)
+        self._rate = max(min_rate, self._rate * factor)
+        self._last_decrease = now
+        return True
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket in shared memory, for one request budget across processes.
+
+    The bucket state (tokens, last refill, rate, last decrease) lives in a
+    shared array guarded by a process lock, so a 429 seen by any process
+    cuts the rate for all of them. time.monotonic() is system-wide on the
+    platforms we run on, so timestamps are comparable across processes.
+
+    Create it in the parent process and pass it to the worker processes
+    as a Process argument.
+
+    Attributes:
+        burst (float): Maximum number of tokens the bucket can hold
+    """
+    _TOKENS, _LAST_REFILL, _RATE, _LAST_DECREASE = range(4)
+
+    def __init__(self, rate, burst, context=None):
+        """
+        Initialize a full shared bucket.
+
+        Args:
+            rate (float): Refill rate in tokens (requests) per second
+            burst (float): Bucket capacity
+            context (multiprocessing context, optional): Context used to create the
+                shared array and lock. Defaults to the 'spawn' context.
+        """
+        context = context or multiprocessing.get_context('spawn')
+        self.burst = float(burst)
+        self._lock = context.Lock()
+        self._state = context.RawArray('d', 4)
+        self._state[self._TOKENS] = self.burst
+        self._state[self._LAST_REFILL] = time.monotonic()
+        self._state[self._RATE] = float(rate)
+        self._state[self._LAST_DECREASE] = float('-inf')
+
+    @property
+    def rate(self):
+        """float: Current refill rate in tokens per second, shared by all processes."""
+        return self._state[self._RATE]
+
+    def _refill(self, now):
+        state = self._state
+        state[self._TOKENS] = min(
+            self.burst, state[self._TOKENS] + (now - state[self._LAST_REFILL]) * state[self._RATE]
+        )
+        state[self._LAST_REFILL] = now
+
+    def try_take(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            state = self._state
+            if state[self._TOKENS] >= 1:
+                state[self._TOKENS] -= 1
+                return 0.0
+            return (1 - state[self._TOKENS]) / state[self._RATE]
+
+    def increase(self, step, max_rate, ratio=0.0):
+        with self._lock:
+            rate = self._state[self._RATE]
+            self._state[self._RATE] = min(max_rate, rate + step / rate + ratio)
+
+    def decrease(self, factor, min_rate, cooldown):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._state[self._LAST_DECREASE] < cooldown:
+                return False
+            self._refill(now)
+            self._state[self._RATE] = max(min_rate, self._state[self._RATE] * factor)
+            self._state[self._LAST_DECREASE] = now
+            return True
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with an in-flight cap and adaptive rate control.
+
+    Requests first take a token from the bucket (which refills at `rate`
+    tokens per second, up to `burst` tokens), and then wait for a free
+    in-flight slot. Waiting for a token never holds an in-flight slot, so
+    throughput is bounded by the rate, not by how long slots are occupied.
+
+    Call `record_response()` after each request. 429 responses and latencies
+    above `latency_target` cut the rate by `decrease_factor`. Isolated 5xx
+    responses and connection errors do not: they only cut the rate when at
+    least `error_threshold` of the last `error_window` requests failed.
+    Successful responses raise the rate by `increase_step` requests/second
+    for each second of traffic.
+
+    The in-flight cap is always per process; the token bucket (and so the
+    rate) can be shared between processes by passing a SharedTokenBucket.
+
+    Attributes:
+        min_rate (float): Lower bound for the adaptive rate
+        max_rate (float): Upper bound for the adaptive rate
+        max_concurrent (int): Maximum number of in-flight requests
+        bucket (TokenBucket): Token bucket holding the current rate
+    """
+    def __init__(self, max_concurrent, rate, burst=None, min_rate=0.5, max_rate=None,
+                 increase_step=2.0, decrease_factor=0.5, latency_target=None, cooldown=1.0,
+                 bucket=None, increase_ratio=0.0, error_window=20, error_threshold=0.25):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_concurrent (int): Maximum number of in-flight requests allowed
+            rate (float): Initial target rate in requests per second
+            burst (float, optional): Bucket capacity. Defaults to max_concurrent.
+            min_rate (float, optional): Lowest rate AIMD may reduce to. Defaults to 0.5.
+            max_rate (float, optional): Highest rate AIMD may increase to. Defaults to `rate`.
+            increase_step (float, optional): Additive increase in requests/second
+                per second of successful traffic. Defaults to 2.0.
+            increase_ratio (float, optional): Proportional increase of the rate per
+                second of successful traffic. Any positive ratio makes the increase
+                multiplicative and undoes a 429 cut within seconds, so the limiter
+                keeps running back into throttling. Defaults to 0.0 (additive).
+            decrease_factor (float, optional): Multiplier applied on congestion. Defaults to 0.5.
+            latency_target (float, optional): Latency in seconds above which a response
+                counts as congestion. Defaults to None (latency is ignored).
+            cooldown (float, optional): Minimum seconds between two rate decreases,
+                so one burst of errors only cuts the rate once. Defaults to 1.0.
+            bucket (TokenBucket, optional): Bucket to draw tokens from, e.g. a
+                SharedTokenBucket. Defaults to a new TokenBucket(rate, burst).
+            error_window (int, optional): Number of recent requests the 5xx and
+                connection error rate is measured over. Defaults to 20.
+            error_threshold (float, optional): Share of failed requests in the window
+                above which the rate is cut. Defaults to 0.25.
+        """
+        self.max_concurrent = max_concurrent
+        self.min_rate = min(min_rate, float(rate))
+        self.max_rate = float(max_rate) if max_rate is not None else float(rate)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst if burst is not None else max(1, max_concurrent))
+        self.bucket = bucket
+        self.increase_step = increase_step
+        self.increase_ratio = increase_ratio
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.error_window = error_window
+        self.error_threshold = error_threshold
+
+        self._recent_errors = deque(maxlen=error_window)
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._token_lock = asyncio.Lock()
+
+        self._waiting = 0
+        self._in_flight = 0
+        self._acquired = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._throttled = 0
+        self._server_errors = 0
+        self._connection_errors = 0
+        self._slow_responses = 0
+        self._decreases = 0
+
+    @property
+    def rate(self):
+        """float: Current target rate in requests per second."""
+        return self.bucket.rate
+
+    @property
+    def burst(self):
+        """float: Maximum number of tokens the bucket can hold."""
+        return self.bucket.burst
+
+    async def _take_token(self):
+        """
+        Wait until a token is available and consume it.
+
+        Waiters queue on a lock so tokens are handed out in FIFO order and
+        only the head of the queue sleeps on the refill timer.
+        """
+        async with self._token_lock:
+            while True:
+                wait = self.bucket.try_take()
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait)
+
+    async def acquire(self):
+        """
+        Acquire permission to make a request.
+
+        Waits for a token and then for an in-flight slot.
+        Must be called before making an API request.
+
+        Returns:
+            float: Seconds spent waiting in the limiter
+        """
+        start = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._take_token()
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - start
+        self._in_flight += 1
+        self._acquired += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return waited
+
+    def release(self):
+        """
+        Release the in-flight slot after a request completes.
+
+        Must be called after an API request finishes to allow the next request.
+        """
+        self._in_flight -= 1
+        self._semaphore.release()
+
+    def record_response(self, status, latency=None):
+        """
+        Adjust the rate based on the outcome of a request.
+
+        Args:
+            status (int): HTTP status code, or None if the request failed
+                before a response was received (timeout, connection reset)
+            latency (float, optional): Request latency in seconds
+        """
+        failed = status is None or status >= 500
+        self._recent_errors.append(failed)
+        if status == 429:
+            self._throttled += 1
+            self._decrease()
+        elif failed:
+            if status is None:
+                self._connection_errors += 1
+            else:
+                self._server_errors += 1
+            if sum(self._recent_errors) >= self.error_threshold * self.error_window:
+                self._decrease()
+        elif self.latency_target is not None and latency is not None and latency > self.latency_target:
+            self._slow_responses += 1
+            self._decrease()
+        else:
+            self.bucket.increase(self.increase_step, self.max_rate, self.increase_ratio)
+
+    def _decrease(self):
+        """Multiplicatively cut the rate, at most once per cooldown period."""
+        if self.bucket.decrease(self.decrease_factor, self.min_rate, self.cooldown):
+            self._decreases += 1
+
+    def merge_stats(self, stats):
+        """
+        Add the request counters of another limiter, e.g. one in a sync shard.
+
+        Args:
+            stats (dict): Snapshot returned by the other limiter's stats()
+        """
+        self._acquired += stats['requests']
+        self._wait_total += stats['wait_time_total']
+        self._wait_max = max(self._wait_max, stats['wait_time_max'])
+        self._throttled += stats['throttled']
+        self._server_errors += stats['server_errors']
+        self._connection_errors += stats['connection_errors']
+        self._slow_responses += stats['slow_responses']
+        self._decreases += stats['rate_decreases']
+
+    @property
+    def queue_depth(self):
+        """int: Number of requests currently waiting in the limiter."""
+        return self._waiting
+
+    @property
+    def in_flight(self):
+        """int: Number of requests currently holding a slot."""
+        return self._in_flight
+
+    def stats(self):
+        """
+        Get a snapshot of the limiter state and wait-time statistics.
+
+        Returns:
+            dict: Current rate, queue depth, in-flight count, wait times,
+                  and congestion signal counts
+        """
+        return {
+            'rate': round(self.rate, 3),
+            'queue_depth': self._waiting,
+            'in_flight': self._in_flight,
+            'max_concurrent': self.max_concurrent,
+            'requests': self._acquired,
+            'wait_time_total': round(self._wait_total, 3),
+            'wait_time_mean': round(self._wait_total / self._acquired, 4) if self._acquired else 0.0,
+            'wait_time_max': round(self._wait_max, 4),
+            'throttled': self._throttled,
+            'server_errors': self._server_errors,
+            'connection_errors': self._connection_errors,
+            'slow_responses': self._slow_responses,
+            'rate_decreases': self._decreases,
+        }
@@ -0,0 +1,222 @@
+"""
+Retry policy for transient MET API failures.
+
+This module decides which failed requests are worth retrying, how long
+to back off between attempts, and keeps per-run statistics about
+retried, recovered, and permanently failed requests.
+"""
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+TRANSIENT_EXCEPTIONS = (
+    asyncio.TimeoutError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    ConnectionResetError,
+)
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value (str): Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient request failures.
+
+    Only timeouts, connection errors, and retryable status codes (429 and
+    most 5xx) are retried. Anything else, including 404, fails immediately.
+
+    Attributes:
+        max_attempts (int): Total attempts per request, including the first one
+        base_delay (float): Backoff delay in seconds before the first retry
+        max_delay (float): Upper bound for a single backoff delay
+        max_retry_after (float): Upper bound for a server-provided Retry-After delay
+        retry_statuses (frozenset): HTTP status codes that are retried
+        jitter (bool): Whether to randomize delays (full jitter)
+    """
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=30.0, max_retry_after=120.0,
+                 retry_statuses=RETRYABLE_STATUSES, jitter=True):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts (int, optional): Total attempts per request. Defaults to 4.
+            base_delay (float, optional): First backoff delay in seconds. Defaults to 0.5.
+            max_delay (float, optional): Maximum backoff delay in seconds. Defaults to 30.0.
+            max_retry_after (float, optional): Maximum Retry-After delay honored. Defaults to 120.0.
+            retry_statuses (iterable, optional): Status codes to retry. Defaults to RETRYABLE_STATUSES.
+            jitter (bool, optional): Randomize delays between 0 and the backoff. Defaults to True.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+        self.jitter = jitter
+
+    def is_transient(self, status=None, error=None):
+        """
+        Check whether a failed attempt is worth retrying.
+
+        Args:
+            status (int, optional): HTTP status code of the response, if any
+            error (Exception, optional): Exception raised by the attempt, if any
+
+        Returns:
+            bool: True if the failure is transient
+        """
+        if error is not None:
+            return isinstance(error, TRANSIENT_EXCEPTIONS)
+        return status in self.retry_statuses
+
+    def should_retry(self, attempt, status=None, error=None):
+        """
+        Check whether another attempt should be made.
+
+        Args:
+            attempt (int): Number of attempts made so far (1-based)
+            status (int, optional): HTTP status code of the last attempt
+            error (Exception, optional): Exception raised by the last attempt
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        return attempt < self.max_attempts and self.is_transient(status, error)
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        Compute how long to wait before the next attempt.
+
+        A Retry-After value from the server takes precedence over the
+        computed backoff (capped at max_retry_after).
+
+        Args:
+            attempt (int): Number of attempts made so far (1-based)
+            retry_after (float, optional): Delay requested by the server in seconds
+
+        Returns:
+            float: Seconds to sleep before retrying
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+
+class RetryStats:
+    """
+    Per-run statistics about retried requests.
+
+    Requests are identified by a key (an object ID, or a label such as
+    "department:11"), so each one is counted once no matter how many
+    attempts it took.
+
+    Attributes:
+        retried (set): Keys of requests that needed more than one attempt
+        recovered (set): Keys of retried requests that eventually succeeded
+        failed (dict): Keys of permanently failed requests mapped to the last error
+        not_found (set): Keys of failed requests that got a 404 (the object does not exist)
+        retries (int): Total number of extra attempts made
+    """
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.retried = set()
+        self.recovered = set()
+        self.failed = {}
+        self.not_found = set()
+        self.retries = 0
+
+    def record_retry(self, key):
+        """
+        Record that a request is about to be retried.
+
+        Args:
+            key: Identifier of the request
+        """
+        self.retried.add(key)
+        self.retries += 1
+
+    def record_success(self, key):
+        """
+        Record that a request succeeded.
+
+        Args:
+            key: Identifier of the request
+        """
+        if key in self.retried:
+            self.recovered.add(key)
+
+    def record_failure(self, key, reason, status=None):
+        """
+        Record that a request failed permanently.
+
+        Args:
+            key: Identifier of the request
+            reason (str): Description of the last error
+            status (int, optional): HTTP status code of the last attempt
+        """
+        self.failed[key] = reason
+        if status == 404:
+            self.not_found.add(key)
+
+    def merge(self, other):
+        """
+        Add the statistics of another run, e.g. of a sync shard.
+
+        Args:
+            other (RetryStats): Statistics to add
+        """
+        self.retried |= other.retried
+        self.recovered |= other.recovered
+        self.failed.update(other.failed)
+        self.not_found |= other.not_found
+        self.retries += other.retries
+
+    def summary(self):
+        """
+        Get the run summary.
+
+        Returns:
+            dict: Counts of retried, recovered, failed, and not-found requests,
+                  plus the total number of retry attempts
+        """
+        return {
+            'retried': len(self.retried),
+            'recovered': len(self.recovered),
+            'failed': len(self.failed),
+            'not_found': len(self.not_found),
+            'retries': self.retries,
+        }
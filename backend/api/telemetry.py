@@ -0,0 +1,384 @@
+"""
+Per-request telemetry for MET API fetches.
+
+This module records, per endpoint, latency histograms, status code
+counts, bytes received, time spent waiting in the rate limiter, and
+in-flight gauges. A run's telemetry can be exported as a JSON report or
+in the Prometheus text exposition format (e.g. for the node_exporter
+textfile collector), so concurrency and rate settings can be tuned with
+evidence.
+"""
+import json
+import time
+from collections import Counter
+from datetime import datetime
+
+# Bucket bounds (seconds) used when exporting histograms to Prometheus
+PROMETHEUS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of durations with bounded relative error.
+
+    Values are recorded in microseconds into log-linear buckets: each
+    power-of-two range is split into 2**(sub_bucket_bits - 1) linear
+    sub-buckets, so every recorded value is within about
+    1 / 2**(sub_bucket_bits - 1) of its bucket's bounds (0.8% by default)
+    while memory stays proportional to the number of distinct buckets used.
+
+    Attributes:
+        sub_bucket_bits (int): Precision of the buckets
+        count (int): Number of recorded values
+        total (float): Sum of recorded values in seconds
+        min (float): Smallest recorded value in seconds, or None
+        max (float): Largest recorded value in seconds, or None
+    """
+    def __init__(self, sub_bucket_bits=8):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            sub_bucket_bits (int, optional): Bucket precision. Defaults to 8.
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._counts = Counter()
+
+    def _index(self, micros):
+        """Get the bucket index of a value in microseconds."""
+        shift = max(0, micros.bit_length() - self.sub_bucket_bits)
+        return (shift << self.sub_bucket_bits) + (micros >> shift)
+
+    def _upper_bound(self, index):
+        """Get the largest value in microseconds that falls into a bucket."""
+        shift = index >> self.sub_bucket_bits
+        mantissa = index & ((1 << self.sub_bucket_bits) - 1)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds):
+        """
+        Record a duration.
+
+        Args:
+            seconds (float): Duration in seconds
+        """
+        seconds = max(0.0, seconds)
+        self._counts[self._index(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other):
+        """
+        Add the values recorded by another histogram with the same precision.
+
+        Args:
+            other (LatencyHistogram): Histogram to add
+        """
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        self._counts.update(other._counts)
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent):
+        """
+        Get the value at a percentile.
+
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            float: Upper bound of the bucket holding the percentile, in seconds
+                (capped at the recorded maximum), or None if nothing was recorded
+        """
+        if self.count == 0:
+            return None
+        rank = max(1, int(round(percent / 100 * self.count)))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds=PROMETHEUS_BUCKETS):
+        """
+        Count the values at or below each bound, for a Prometheus histogram.
+
+        A bucket is counted under the first bound that is not below its
+        upper value, so counts may shift by at most one bucket width.
+
+        Args:
+            bounds (tuple, optional): Ascending bounds in seconds. Defaults to PROMETHEUS_BUCKETS.
+
+        Returns:
+            list: Cumulative counts, one per bound
+        """
+        counts = [0] * len(bounds)
+        for index, count in self._counts.items():
+            upper = self._upper_bound(index) / 1_000_000
+            for position, bound in enumerate(bounds):
+                if upper <= bound:
+                    counts[position] += count
+                    break
+        for position in range(1, len(counts)):
+            counts[position] += counts[position - 1]
+        return counts
+
+    def summary(self):
+        """
+        Get count, mean, extremes, and common percentiles.
+
+        Returns:
+            dict: Summary values in seconds
+        """
+        def rounded(value):
+            return round(value, 6) if value is not None else None
+
+        return {
+            'count': self.count,
+            'mean': rounded(self.total / self.count) if self.count else None,
+            'min': rounded(self.min),
+            'p50': rounded(self.percentile(50)),
+            'p90': rounded(self.percentile(90)),
+            'p99': rounded(self.percentile(99)),
+            'p999': rounded(self.percentile(99.9)),
+            'max': rounded(self.max),
+        }
+
+
+class EndpointMetrics:
+    """
+    Telemetry of one MET API endpoint.
+
+    Attributes:
+        latency (LatencyHistogram): Time on the wire per attempt, until the body was read
+        limiter_wait (LatencyHistogram): Time spent waiting in the rate limiter per attempt
+        statuses (Counter): Attempts per HTTP status code, plus 'cache' for responses
+            served from the response cache and exception names for failed attempts
+        bytes_received (int): Response body bytes received
+        in_flight (int): Attempts currently on the wire
+        peak_in_flight (int): Highest number of attempts on the wire at once
+    """
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.latency = LatencyHistogram()
+        self.limiter_wait = LatencyHistogram()
+        self.statuses = Counter()
+        self.bytes_received = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @property
+    def requests(self):
+        """int: Number of attempts made, including cache hits."""
+        return sum(self.statuses.values())
+
+    def merge(self, other):
+        """
+        Add the metrics of the same endpoint recorded elsewhere (e.g. in a sync shard).
+
+        Args:
+            other (EndpointMetrics): Metrics to add
+        """
+        self.latency.merge(other.latency)
+        self.limiter_wait.merge(other.limiter_wait)
+        self.statuses.update(other.statuses)
+        self.bytes_received += other.bytes_received
+        self.peak_in_flight = max(self.peak_in_flight, other.peak_in_flight)
+
+    def summary(self, elapsed):
+        """
+        Get the endpoint's report.
+
+        Args:
+            elapsed (float): Seconds covered by the telemetry, for throughput
+
+        Returns:
+            dict: Requests, throughput, statuses, bytes, latency and wait summaries
+        """
+        requests = self.requests
+        return {
+            'requests': requests,
+            'requests_per_second': round(requests / elapsed, 3) if elapsed > 0 else None,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            'bytes_received': self.bytes_received,
+            'peak_in_flight': self.peak_in_flight,
+            'latency_seconds': self.latency.summary(),
+            'limiter_wait_seconds': self.limiter_wait.summary(),
+        }
+
+
+class FetchTelemetry:
+    """
+    Per-endpoint request telemetry of a sync run.
+
+    request_json() reports each attempt: record_wait() after the rate
+    limiter granted it, request_started() when it goes on the wire, and
+    request_finished() with its status, latency, and size.
+
+    Attributes:
+        endpoints (dict): Endpoint name -> EndpointMetrics
+        started_at (datetime): When the telemetry was created (UTC)
+    """
+    def __init__(self):
+        """Initialize empty telemetry."""
+        self.endpoints = {}
+        self.started_at = datetime.utcnow()
+        self._start = time.monotonic()
+
+    def endpoint(self, name):
+        """
+        Get (or create) the metrics of an endpoint.
+
+        Args:
+            name (str): Endpoint name, e.g. 'object_details'
+
+        Returns:
+            EndpointMetrics: Metrics of the endpoint
+        """
+        metrics = self.endpoints.get(name)
+        if metrics is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        return metrics
+
+    def record_wait(self, name, seconds):
+        """Record time an attempt spent waiting in the rate limiter."""
+        self.endpoint(name).limiter_wait.record(seconds)
+
+    def request_started(self, name):
+        """Record that an attempt went on the wire."""
+        metrics = self.endpoint(name)
+        metrics.in_flight += 1
+        metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+
+    def request_finished(self, name, status, latency, nbytes=0):
+        """
+        Record the outcome of an attempt started with request_started().
+
+        Args:
+            name (str): Endpoint name
+            status: HTTP status code, or the exception name if no response was received
+            latency (float): Seconds from sending the request until the body was read
+            nbytes (int, optional): Response body size in bytes. Defaults to 0.
+        """
+        metrics = self.endpoint(name)
+        metrics.in_flight -= 1
+        metrics.statuses[status] += 1
+        metrics.latency.record(latency)
+        metrics.bytes_received += nbytes
+
+    def record_cache_hit(self, name):
+        """Record a response served from the response cache without a request."""
+        self.endpoint(name).statuses['cache'] += 1
+
+    def merge(self, other):
+        """
+        Add telemetry recorded elsewhere, e.g. by a sync shard.
+
+        Args:
+            other (FetchTelemetry): Telemetry to add
+        """
+        for name, metrics in other.endpoints.items():
+            self.endpoint(name).merge(metrics)
+
+    @property
+    def elapsed(self):
+        """float: Seconds since the telemetry was created."""
+        return time.monotonic() - self._start
+
+    def report(self):
+        """
+        Get the JSON run report.
+
+        Returns:
+            dict: Start time, elapsed seconds, and the summary of each endpoint
+        """
+        elapsed = self.elapsed
+        return {
+            'started_at': self.started_at.isoformat() + 'Z',
+            'elapsed_seconds': round(elapsed, 3),
+            'endpoints': {name: metrics.summary(elapsed) for name, metrics in sorted(self.endpoints.items())},
+        }
+
+    def write_json(self, path):
+        """
+        Write the JSON run report to a file.
+
+        Args:
+            path (str): Output file
+        """
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def to_prometheus(self, prefix='met_fetch'):
+        """
+        Render the telemetry in the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Metric name prefix. Defaults to 'met_fetch'.
+
+        Returns:
+            str: Metrics text
+        """
+        lines = [
+            f"# HELP {prefix}_requests_total Request attempts by endpoint and status.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        for name, metrics in sorted(self.endpoints.items()):
+            for status, count in sorted(metrics.statuses.items(), key=str):
+                lines.append(f'{prefix}_requests_total{{endpoint="{name}",status="{status}"}} {count}')
+
+        lines += [
+            f"# HELP {prefix}_response_bytes_total Response body bytes received by endpoint.",
+            f"# TYPE {prefix}_response_bytes_total counter",
+        ]
+        for name, metrics in sorted(self.endpoints.items()):
+            lines.append(f'{prefix}_response_bytes_total{{endpoint="{name}"}} {metrics.bytes_received}')
+
+        for metric, attribute, help_text in (
+            ('request_duration_seconds', 'latency', 'Time on the wire per attempt.'),
+            ('limiter_wait_seconds', 'limiter_wait', 'Time waiting in the rate limiter per attempt.'),
+        ):
+            lines += [f"# HELP {prefix}_{metric} {help_text}", f"# TYPE {prefix}_{metric} histogram"]
+            for name, metrics in sorted(self.endpoints.items()):
+                histogram = getattr(metrics, attribute)
+                for bound, count in zip(PROMETHEUS_BUCKETS, histogram.cumulative_counts()):
+                    lines.append(f'{prefix}_{metric}_bucket{{endpoint="{name}",le="{bound}"}} {count}')
+                lines.append(f'{prefix}_{metric}_bucket{{endpoint="{name}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{prefix}_{metric}_sum{{endpoint="{name}"}} {histogram.total:.6f}')
+                lines.append(f'{prefix}_{metric}_count{{endpoint="{name}"}} {histogram.count}')
+
+        lines += [
+            f"# HELP {prefix}_in_flight Attempts currently on the wire.",
+            f"# TYPE {prefix}_in_flight gauge",
+        ]
+        for name, metrics in sorted(self.endpoints.items()):
+            lines.append(f'{prefix}_in_flight{{endpoint="{name}"}} {metrics.in_flight}')
+        lines += [
+            f"# HELP {prefix}_in_flight_peak Highest number of attempts on the wire at once.",
+            f"# TYPE {prefix}_in_flight_peak gauge",
+        ]
+        for name, metrics in sorted(self.endpoints.items()):
+            lines.append(f'{prefix}_in_flight_peak{{endpoint="{name}"}} {metrics.peak_in_flight}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, prefix='met_fetch'):
+        """
+        Write the Prometheus metrics to a file.
+
+        Args:
+            path (str): Output file (e.g. in the node_exporter textfile collector directory)
+            prefix (str, optional): Metric name prefix. Defaults to 'met_fetch'.
+        """
+        with open(path, 'w') as f:
+            f.write(self.to_prometheus(prefix))
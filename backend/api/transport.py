@@ -0,0 +1,193 @@
+"""
+HTTP transport configuration for the MET API client.
+
+This module builds the shared aiohttp session (connection pool limits,
+keep-alive, DNS cache, compression, and timeouts), selects the fastest
+available JSON decoder, and optionally installs uvloop.
+"""
+import json
+
+import aiohttp
+
+JSON_DECODERS = ('auto', 'orjson', 'msgspec', 'json')
+
+
+def _load_decoder(name):
+    """Import a JSON decoder by name, returning None if it is not installed."""
+    if name == 'orjson':
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return orjson.loads
+    if name == 'msgspec':
+        try:
+            import msgspec
+        except ImportError:
+            return None
+        return msgspec.json.decode
+    if name == 'json':
+        return json.loads
+    raise ValueError(f"Unknown JSON decoder '{name}', expected one of {JSON_DECODERS}")
+
+
+def get_json_decoder(name='auto'):
+    """
+    Get a JSON decoding function that accepts bytes.
+
+    Args:
+        name (str, optional): 'orjson', 'msgspec', 'json', or 'auto' to pick the
+            fastest installed one. Defaults to 'auto'.
+
+    Returns:
+        tuple: (decoder name, decode function)
+
+    Raises:
+        ImportError: If the requested decoder is not installed
+    """
+    if name == 'auto':
+        for candidate in ('orjson', 'msgspec'):
+            decoder = _load_decoder(candidate)
+            if decoder is not None:
+                return candidate, decoder
+        return 'json', json.loads
+
+    decoder = _load_decoder(name)
+    if decoder is None:
+        raise ImportError(f"JSON decoder '{name}' is not installed")
+    return name, decoder
+
+
+json_decoder_name, decode_json = get_json_decoder()
+
+
+def set_json_decoder(name):
+    """
+    Select the JSON decoder used for all MET API responses.
+
+    Args:
+        name (str): 'orjson', 'msgspec', 'json', or 'auto'
+
+    Returns:
+        str: Name of the selected decoder
+    """
+    global json_decoder_name, decode_json
+    json_decoder_name, decode_json = get_json_decoder(name)
+    return json_decoder_name
+
+
+def install_uvloop():
+    """
+    Use uvloop as the asyncio event loop, if it is installed.
+
+    Must be called before asyncio.run().
+
+    Returns:
+        bool: True if uvloop was installed
+    """
+    try:
+        import uvloop
+    except ImportError:
+        print("  ⚠ uvloop is not installed - using the default asyncio event loop")
+        return False
+    uvloop.install()
+    return True
+
+
+def _accept_encoding():
+    """Build the Accept-Encoding header from the decompressors aiohttp can use."""
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        pass
+    return ', '.join(encodings)
+
+
+class TransportConfig:
+    """
+    Settings for the shared HTTP session.
+
+    Attributes:
+        limit (int): Maximum number of open connections in the pool
+        limit_per_host (int): Maximum number of open connections per host
+        keepalive_timeout (float): Seconds an idle connection is kept open for reuse
+        dns_cache_ttl (int): Seconds resolved addresses are cached
+        compress (bool): Negotiate compressed responses
+        connect_timeout (float): Seconds allowed to establish a connection
+        read_timeout (float): Seconds allowed between reads of a response
+        total_timeout (float): Upper bound for a whole request, or None
+        json_decoder (str): JSON decoder name ('auto', 'orjson', 'msgspec', 'json')
+        use_uvloop (bool): Run the sync on uvloop if it is installed
+    """
+    def __init__(self, limit=100, limit_per_host=20, keepalive_timeout=30.0, dns_cache_ttl=300,
+                 compress=True, connect_timeout=10.0, read_timeout=30.0, total_timeout=None,
+                 json_decoder='auto', use_uvloop=False):
+        """
+        Initialize the transport settings.
+
+        Args:
+            limit (int, optional): Pool size. Defaults to 100.
+            limit_per_host (int, optional): Connections per host. Defaults to 20.
+            keepalive_timeout (float, optional): Idle keep-alive in seconds. Defaults to 30.0.
+            dns_cache_ttl (int, optional): DNS cache TTL in seconds. Defaults to 300.
+            compress (bool, optional): Send Accept-Encoding for gzip/deflate/br. Defaults to True.
+            connect_timeout (float, optional): Connect timeout in seconds. Defaults to 10.0.
+            read_timeout (float, optional): Socket read timeout in seconds. Defaults to 30.0.
+            total_timeout (float, optional): Total request timeout in seconds. Defaults to None.
+            json_decoder (str, optional): JSON decoder to use. Defaults to 'auto'.
+            use_uvloop (bool, optional): Install uvloop if available. Defaults to False.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.compress = compress
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.json_decoder = json_decoder
+        self.use_uvloop = use_uvloop
+
+
+def create_session(config=None):
+    """
+    Create the aiohttp session shared by all requests of a sync run.
+
+    Also applies the configured JSON decoder. Must be called from inside
+    a running event loop.
+
+    Args:
+        config (TransportConfig, optional): Transport settings. Defaults to TransportConfig().
+
+    Returns:
+        aiohttp.ClientSession: Configured session (use as an async context manager)
+    """
+    config = config or TransportConfig()
+    set_json_decoder(config.json_decoder)
+
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        keepalive_timeout=config.keepalive_timeout,
+        use_dns_cache=True,
+        ttl_dns_cache=config.dns_cache_ttl,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=config.total_timeout,
+        sock_connect=config.connect_timeout,
+        sock_read=config.read_timeout,
+    )
+    headers = {'Accept': 'application/json'}
+    if config.compress:
+        headers['Accept-Encoding'] = _accept_encoding()
+    else:
+        headers['Accept-Encoding'] = 'identity'
+
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers=headers,
+        auto_decompress=True,
+    )
@@ -3,134 +3,513 @@ Data cleaning and validation utilities for artwork data.
 
 This module provides functions to clean, validate, and normalize
 artwork data before saving to the database.
+
+All cleaning steps are column-wise (vectorized) operations; no step
+walks the DataFrame row by row.
+
+Large syncs can be cleaned as a stream of batches (iter_clean_batches):
+duplicates across batches are found with a compact bitmap of the IDs
+seen so far (SeenIds), and rule violations accumulate in a
+CleaningReport, so memory use is bounded by the batch size. Large
+DataFrames can be cleaned on several processes (clean_in_parallel), each
+cleaning a range of met_object_ids.
 """
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 
+from data.cleaning_report import DATE_ISSUE_RULES, CleaningReport
+from data.staging import ObjectBatch
+
+STRING_FIELDS = [
+    'title', 'artist_display_name', 'artist_display_bio',
+    'artist_nationality', 'artist_gender', 'object_date', 'culture', 'period',
+    'dynasty', 'medium', 'dimensions', 'department', 'classification',
+    'object_name', 'object_url'
+]
+
+# Values treated as missing in every column
+NULL_STRINGS = ['', 'nan']
+
+# A string date must be a plain integer, as accepted by int()
+_INTEGER_PATTERN = r'[+-]?\d+'
+
+# IDs up to this value are tracked in the SeenIds bitmap (at most 32 MB); others in a set
+MAX_BITMAP_ID = 1 << 28
+
+# Fewest records per partition worth sending to a worker process
+MIN_PARTITION_RECORDS = 50_000
+
+
+class SeenIds:
+    """
+    A compact set of the met_object_ids seen in earlier batches.
+
+    Non-negative integer IDs are stored as bits of a NumPy bitmap that
+    grows with the largest ID, so the whole MET collection (IDs below one
+    million) takes about 128 KB. Any other ID is kept in a regular set.
+    """
+    __slots__ = ('_bits', '_others', '_count')
+
+    def __init__(self, capacity=1 << 20):
+        """
+        Initialize an empty set.
+
+        Args:
+            capacity (int, optional): Initial number of IDs the bitmap can hold
+        """
+        self._bits = np.zeros(max(capacity // 8, 1), dtype=np.uint8)
+        self._others = set()
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, met_object_id):
+        return bool(self.contains(pd.Series([met_object_id], dtype=object))[0])
+
+    @staticmethod
+    def _split(ids):
+        """Split IDs into bitmap positions and other values."""
+        if pd.api.types.is_integer_dtype(ids.dtype):
+            numbers = ids.to_numpy(dtype=np.int64)
+            in_bitmap = (numbers >= 0) & (numbers < MAX_BITMAP_ID)
+        else:
+            values = ids.astype(object)
+            is_string = (values.map(type) == str).to_numpy()
+            numbers = pd.to_numeric(values.where(~is_string), errors='coerce').to_numpy(dtype=float)
+            with np.errstate(invalid='ignore'):
+                in_bitmap = (numbers >= 0) & (numbers < MAX_BITMAP_ID) & (numbers == np.floor(numbers))
+            numbers = np.where(in_bitmap, numbers, 0).astype(np.int64)
+        others = ~in_bitmap & ids.notna().to_numpy()
+        return numbers, in_bitmap, others
+
+    def _grow(self, max_id):
+        """Grow the bitmap (by doubling) to hold IDs up to max_id."""
+        size = len(self._bits)
+        while size * 8 <= max_id:
+            size *= 2
+        if size > len(self._bits):
+            self._bits = np.concatenate([self._bits, np.zeros(size - len(self._bits), dtype=np.uint8)])
+
+    def contains(self, ids):
+        """
+        Check which IDs were added before.
+
+        Args:
+            ids (pandas.Series): met_object_ids
+
+        Returns:
+            numpy.ndarray: Boolean mask, True for IDs already in the set
+        """
+        numbers, in_bitmap, others = self._split(ids)
+        seen = np.zeros(len(ids), dtype=bool)
+        positions = numbers[in_bitmap]
+        inside = positions < len(self._bits) * 8
+        bitmap_seen = np.zeros(len(positions), dtype=bool)
+        bitmap_seen[inside] = (self._bits[positions[inside] >> 3] & (1 << (positions[inside] & 7))) != 0
+        seen[in_bitmap] = bitmap_seen
+        if others.any():
+            seen[others] = [value in self._others for value in ids.to_numpy()[others]]
+        return seen
+
+    def add(self, ids):
+        """
+        Add IDs and report which of them were added before.
+
+        Args:
+            ids (pandas.Series): met_object_ids, without duplicates among themselves
+
+        Returns:
+            numpy.ndarray: Boolean mask, True for IDs that were already in the set
+        """
+        seen = self.contains(ids)
+        numbers, in_bitmap, others = self._split(ids)
+        positions = numbers[in_bitmap]
+        if len(positions):
+            self._grow(int(positions.max()))
+            np.bitwise_or.at(self._bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        if others.any():
+            self._others.update(ids.to_numpy()[others])
+        self._count += int((~seen & (in_bitmap | others)).sum())
+        return seen
+
+    def memory_usage(self):
+        """
+        Get the approximate memory held by the set.
+
+        Returns:
+            int: Size in bytes of the bitmap, plus 64 bytes per ID outside it
+        """
+        return self._bits.nbytes + 64 * len(self._others)
+
 
-def clean_and_validate_data(df):
+def _quiet(*args, **kwargs):
+    """Discard log output when running non-verbosely."""
+
+
+def _normalize_strings(values, normalize_unicode=False):
+    """
+    Trim string values and turn empty strings and 'nan' into None.
+
+    Non-string values are left as they are. Categorical columns are
+    normalized once per category instead of once per row.
+
+    Args:
+        values (pandas.Series): Column to normalize
+        normalize_unicode (bool, optional): Also apply Unicode NFC normalization
+
+    Returns:
+        pandas.Series: Normalized column
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = _normalize_strings(pd.Series(values.cat.categories, dtype=object), normalize_unicode)
+        category_codes, uniques = pd.factorize(categories)
+        codes = values.cat.codes.to_numpy()
+        codes = np.where(codes >= 0, category_codes[codes], -1)
+        return pd.Series(
+            pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(pd.Index(uniques, dtype=object))),
+            index=values.index, name=values.name
+        )
+
+    if values.dtype != object:
+        return values
+
+    # .str methods return NaN for non-string values, so this also marks which values are strings
+    stripped = values.str.strip()
+    is_string = stripped.notna()
+    if normalize_unicode:
+        stripped = stripped.str.normalize('NFC')
+
+    values = values.where(~is_string, stripped)
+    values[is_string & stripped.isin(NULL_STRINGS)] = None
+    return values
+
+
+def _to_integer_dates(values):
+    """
+    Convert a date column to nullable integers.
+
+    Numbers are truncated towards zero and integer strings are parsed,
+    as int() would do. Any other non-null value is invalid.
+
+    Args:
+        values (pandas.Series): Date column
+
+    Returns:
+        tuple: (Int64 column, boolean mask of values that could not be converted)
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+        numbers = values.astype(float)
+    else:
+        values = values.astype(object)
+        is_string = values.map(type) == str
+        numbers = pd.to_numeric(values.where(~is_string), errors='coerce').astype(float)
+        if is_string.any():
+            strings = values[is_string].str.strip()
+            is_integer = strings.str.fullmatch(_INTEGER_PATTERN)
+            numbers[is_string] = pd.to_numeric(strings.where(is_integer), errors='coerce').astype(float)
+
+    numbers = numbers.where(np.isfinite(numbers))
+    dates = np.trunc(numbers).astype('Int64')
+    invalid = values.notna() & dates.isna()
+    return dates, invalid
+
+
+def _drop_duplicates(df, record, seen_ids=None, log=_quiet):
+    """
+    Drop records whose met_object_id appeared earlier in the batch or in earlier batches.
+
+    Args:
+        df (pandas.DataFrame): Raw artwork data
+        record (callable): record(rule, ids) callback of the cleaning report
+        seen_ids (SeenIds, optional): IDs of earlier batches, updated with this batch's IDs
+        log (callable, optional): Output function
+
+    Returns:
+        pandas.DataFrame: Records with unique, unseen IDs, in their original order
+    """
+    initial_count = len(df)
+    duplicated = df.duplicated(subset=['met_object_id'], keep='first')
+    if duplicated.any():
+        record('duplicate_id', df.loc[duplicated, 'met_object_id'])
+        df = df[~duplicated.to_numpy()]
+        log(f"   WARNING: Removed {initial_count - len(df)} records with a duplicate met_object_id "
+            f"(kept first occurrence)")
+    else:
+        log("   ✓ No duplicates found")
+
+    if seen_ids is not None:
+        seen = seen_ids.add(df['met_object_id'])
+        if seen.any():
+            record('seen_in_earlier_batch', df.loc[seen, 'met_object_id'])
+            df = df[~seen]
+            log(f"   Removed {seen.sum()} records already seen in earlier batches")
+    return df
+
+
+def clean_and_validate_data(df, verbose=True, normalize_unicode=False, report=None, seen_ids=None):
     """
     Clean and validate artwork data before saving.
 
     Performs comprehensive data cleaning including:
     - Deduplication by met_object_id
-    - String normalization (trimming, encoding)
+    - String normalization (trimming, optionally Unicode NFC)
     - Null/empty value handling
     - Date field validation
     - Final validation checks
 
+    The input DataFrame is not modified. Date fields are returned as
+    nullable Int64 columns. Every rule violation is recorded in `report`
+    (counts, affected IDs, and sampled examples); the log only shows
+    counts and a few examples, never a line per record.
+
     Args:
         df (pandas.DataFrame): DataFrame containing raw artwork data
+        verbose (bool, optional): Print progress and warnings. Defaults to True.
+            Pass False when cleaning many small batches in a pipeline.
+        normalize_unicode (bool, optional): Normalize string fields to Unicode NFC.
+            Defaults to False, since it can change stored values (and content hashes)
+            of existing artworks.
+        report (CleaningReport, optional): Report to record this batch's violations
+            and statistics in
+        seen_ids (SeenIds, optional): IDs of earlier batches; records with one of
+            them are dropped, and this batch's IDs are added
 
     Returns:
         pandas.DataFrame: Cleaned and validated DataFrame ready for storage
     """
-    print("\n" + "="*60)
-    print("STARTING DATA CLEANING AND VALIDATION")
-    print("="*60)
+    log = print if verbose else _quiet
+
+    log("\n" + "="*60)
+    log("STARTING DATA CLEANING AND VALIDATION")
+    log("="*60)
 
+    report = report if report is not None else CleaningReport()
+    batch_report = CleaningReport(report.sample_size) if verbose else None
     initial_count = len(df)
-    print(f"Initial record count: {initial_count}")
-
-    print("\n1. Checking for duplicates...")
-    duplicates = df[df.duplicated(subset=['met_object_id'], keep=False)]
-    if len(duplicates) > 0:
-        print(f"   WARNING: Found {len(duplicates)} duplicate met_object_id entries")
-        print(f"   Duplicate IDs: {duplicates['met_object_id'].unique().tolist()}")
-        df = df.drop_duplicates(subset=['met_object_id'], keep='first')
-        print(f"   Kept first occurrence, removed {initial_count - len(df)} duplicates")
-    else:
-        print("   ✓ No duplicates found")
-
-    print("\n2. Normalizing string fields...")
-    string_fields = [
-        'title', 'artist_display_name', 'artist_display_bio',
-        'artist_nationality', 'artist_gender', 'object_date', 'culture', 'period',
-        'dynasty', 'medium', 'dimensions', 'department', 'classification',
-        'object_name', 'object_url'
-    ]
+    log(f"Initial record count: {initial_count}")
 
-    for field in string_fields:
-        if field in df.columns:
-            df[field] = df[field].apply(lambda x: None if x == '' else x)
-            df[field] = df[field].apply(lambda x: x.strip() if isinstance(x, str) else x)
-            df[field] = df[field].apply(
-                lambda x: x.encode('utf-8').decode('utf-8') if isinstance(x, str) else x
-            )
+    def record(rule, ids, values=None):
+        report.record(rule, ids, values)
+        if batch_report is not None:
+            batch_report.record(rule, ids, values)
 
-    print("   ✓ Trimmed whitespace and normalized encoding for all string fields")
+    log("\n1. Checking for duplicates...")
+    df = _drop_duplicates(df, record, seen_ids, log)
+    # Columns are replaced below, never written in place, so the caller's DataFrame is left intact
+    df = df.copy(deep=False)
 
-    print("\n3. Handling null and empty values...")
-    null_counts_before = df.isnull().sum()
+    log("\n2. Normalizing string fields...")
+    for field in STRING_FIELDS:
+        if field in df.columns:
+            df[field] = _normalize_strings(df[field], normalize_unicode)
 
-    df = df.replace('', None)
-    df = df.replace('nan', None)
+    log("   ✓ Trimmed whitespace" + (" and normalized Unicode" if normalize_unicode else "")
+        + " for all string fields")
 
-    null_counts_after = df.isnull().sum()
-    fields_with_nulls = null_counts_after[null_counts_after > 0]
+    log("\n3. Handling null and empty values...")
+    other_fields = [column for column in df.columns if column not in STRING_FIELDS]
+    if other_fields:
+        df[other_fields] = df[other_fields].replace(NULL_STRINGS, None)
 
+    null_counts = df.isnull().sum()
+    fields_with_nulls = null_counts[null_counts > 0]
+    report.null_values.update(fields_with_nulls.to_dict())
     if len(fields_with_nulls) > 0:
-        print("   Fields with null values:")
+        log("   Fields with null values:")
         for field, count in fields_with_nulls.items():
-            print(f"   - {field}: {count} nulls ({count/len(df)*100:.1f}%)")
+            log(f"   - {field}: {count} nulls ({count/len(df)*100:.1f}%)")
     else:
-        print("   ✓ No null values found")
-
-    print("\n4. Validating date fields...")
-    date_issues = 0
-
-    for idx, row in df.iterrows():
-        begin_date = row['object_begin_date']
-        end_date = row['object_end_date']
-
-        if pd.notna(begin_date):
-            try:
-                begin_date = int(begin_date)
-                df.at[idx, 'object_begin_date'] = begin_date
-            except (ValueError, TypeError):
-                print(f"   WARNING: Invalid begin_date for object {row['met_object_id']}: {begin_date}")
-                df.at[idx, 'object_begin_date'] = None
-                date_issues += 1
-
-        if pd.notna(end_date):
-            try:
-                end_date = int(end_date)
-                df.at[idx, 'object_end_date'] = end_date
-            except (ValueError, TypeError):
-                print(f"   WARNING: Invalid end_date for object {row['met_object_id']}: {end_date}")
-                df.at[idx, 'object_end_date'] = None
-                date_issues += 1
-
-        if pd.notna(begin_date) and pd.notna(end_date):
-            if begin_date > end_date:
-                print(f"   WARNING: object {row['met_object_id']} has begin_date ({begin_date}) > end_date ({end_date})")
-                date_issues += 1
-
-        if begin_date == 0:
-            df.at[idx, 'object_begin_date'] = None
-        if end_date == 0:
-            df.at[idx, 'object_end_date'] = None
+        log("   ✓ No null values found")
+
+    log("\n4. Validating date fields...")
+    begin_dates, invalid_begin = _to_integer_dates(df['object_begin_date'])
+    end_dates, invalid_end = _to_integer_dates(df['object_end_date'])
+    reversed_dates = (begin_dates > end_dates).fillna(False).astype(bool)
+
+    ids = df['met_object_id']
+    record('invalid_begin_date', ids[invalid_begin], {'object_begin_date': df['object_begin_date'][invalid_begin]})
+    record('invalid_end_date', ids[invalid_end], {'object_end_date': df['object_end_date'][invalid_end]})
+    record('reversed_dates', ids[reversed_dates], {
+        'object_begin_date': begin_dates[reversed_dates], 'object_end_date': end_dates[reversed_dates]
+    })
+
+    # A year 0 does not exist; the API uses 0 for unknown dates
+    zero_begin = (begin_dates == 0).fillna(False).astype(bool)
+    zero_end = (end_dates == 0).fillna(False).astype(bool)
+    record('zero_begin_date', ids[zero_begin])
+    record('zero_end_date', ids[zero_end])
+    df['object_begin_date'] = begin_dates.mask(zero_begin)
+    df['object_end_date'] = end_dates.mask(zero_end)
 
+    date_issues = int(invalid_begin.sum() + invalid_end.sum() + reversed_dates.sum())
     if date_issues == 0:
-        print("   ✓ All dates validated successfully")
+        log("   ✓ All dates validated successfully")
     else:
-        print(f"   Found {date_issues} date validation issues (see warnings above)")
+        log(f"   Found {date_issues} date validation issues:")
+        if batch_report is not None:
+            batch_report.print_summary(log, rules=DATE_ISSUE_RULES)
 
-    print("\n6. Final validation...")
+    log("\n6. Final validation...")
     null_ids = df['met_object_id'].isnull().sum()
     if null_ids > 0:
-        print(f"   ERROR: Found {null_ids} records with null met_object_id - removing them")
-        df = df[df['met_object_id'].notna()]
+        log(f"   ERROR: Found {null_ids} records with null met_object_id - removing them")
+        record('missing_id', np.full(null_ids, None, dtype=object))
+        df = df[df['met_object_id'].notna()].copy(deep=False)
     else:
-        print("   ✓ All records have valid met_object_id")
+        log("   ✓ All records have valid met_object_id")
 
     df['is_public_domain'] = df['is_public_domain'].fillna(False).astype(bool)
 
     final_count = len(df)
-    print(f"\n{'='*60}")
-    print("DATA CLEANING COMPLETE")
-    print("="*60)
-    print(f"Final record count: {final_count}")
-    print(f"Records removed: {initial_count - final_count}")
+    report.batches += 1
+    report.input_records += initial_count
+    report.output_records += final_count
+    report.flush()
+    log(f"\n{'='*60}")
+    log("DATA CLEANING COMPLETE")
+    log("="*60)
+    log(f"Final record count: {final_count}")
+    log(f"Records removed: {initial_count - final_count}")
 
     return df
 
+
+def iter_clean_batches(batches, normalize_unicode=False, report=None, seen_ids=None):
+    """
+    Clean a stream of record batches, yielding each cleaned batch.
+
+    Each batch is cleaned with clean_and_validate_data as it arrives, and a
+    record whose met_object_id appeared in an earlier batch is dropped, so
+    the concatenated output equals cleaning all records at once. Only one
+    batch is held in memory at a time.
+
+    Args:
+        batches (iterable): Batches as DataFrames, ObjectBatches, or lists of record dictionaries
+        normalize_unicode (bool, optional): Normalize string fields to Unicode NFC. Defaults to False.
+        report (CleaningReport, optional): Report to accumulate violations and statistics in.
+            Defaults to a new CleaningReport.
+        seen_ids (SeenIds, optional): IDs to treat as already seen. Defaults to a new SeenIds.
+
+    Yields:
+        pandas.DataFrame: Cleaned batch (possibly empty)
+    """
+    report = report if report is not None else CleaningReport()
+    seen_ids = seen_ids if seen_ids is not None else SeenIds()
+
+    for batch in batches:
+        if isinstance(batch, ObjectBatch):
+            batch = batch.to_dataframe()
+        elif not isinstance(batch, pd.DataFrame):
+            batch = pd.DataFrame(batch)
+        yield clean_and_validate_data(batch, False, normalize_unicode, report, seen_ids)
+
+
+def partition_by_id_range(ids, partitions):
+    """
+    Assign records to partitions by met_object_id range.
+
+    Ranges are cut at quantiles of the numeric IDs, so partitions get about
+    the same number of records, and all records with the same ID land in
+    the same partition. Null and non-numeric IDs go to the first partition.
+
+    Args:
+        ids (pandas.Series): met_object_ids
+        partitions (int): Number of partitions
+
+    Returns:
+        numpy.ndarray: Partition number (0 to partitions - 1) per record
+    """
+    numbers = pd.to_numeric(ids, errors='coerce').to_numpy(dtype=float)
+    numeric = ~np.isnan(numbers)
+    labels = np.zeros(len(ids), dtype=np.int64)
+    if partitions > 1 and numeric.any():
+        bounds = np.quantile(numbers[numeric], np.linspace(0, 1, partitions + 1)[1:-1])
+        labels[numeric] = np.searchsorted(bounds, numbers[numeric], side='right')
+    return labels
+
+
+def _clean_partition(partition, normalize_unicode, sample_size, sidecar_path, seed):
+    """Clean one partition in a worker process; returns (cleaned DataFrame, CleaningReport)."""
+    report = CleaningReport(sample_size, sidecar_path, seed)
+    return clean_and_validate_data(partition, False, normalize_unicode, report), report
+
+
+def clean_in_parallel(df, workers=None, normalize_unicode=False, report=None, seen_ids=None,
+                      min_partition_records=MIN_PARTITION_RECORDS):
+    """
+    Clean and validate a large DataFrame on several processes.
+
+    Duplicates are dropped first, as clean_and_validate_data does. The
+    remaining records are split into partitions by met_object_id range,
+    each partition is cleaned with clean_and_validate_data in a process
+    pool, and the cleaned partitions are put back in the original record
+    order. The result is identical to clean_and_validate_data(df, False).
+
+    Partition reports are merged in partition order: counts and null
+    values equal those of serial cleaning, and the sampled examples are
+    the same on every run with the same number of partitions. With a
+    sidecar file, each worker writes its own file, which is appended to
+    the report's sidecar in partition order.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing raw artwork data
+        workers (int, optional): Worker processes. Defaults to the number of CPUs.
+        normalize_unicode (bool, optional): Normalize string fields to Unicode NFC. Defaults to False.
+        report (CleaningReport, optional): Report to record violations and statistics in
+        seen_ids (SeenIds, optional): IDs of earlier batches; records with one of
+            them are dropped, and this DataFrame's IDs are added
+        min_partition_records (int, optional): Fewest records per partition; smaller
+            inputs are cleaned in this process. Defaults to MIN_PARTITION_RECORDS.
+
+    Returns:
+        pandas.DataFrame: Cleaned and validated DataFrame ready for storage
+    """
+    report = report if report is not None else CleaningReport()
+    workers = workers or os.cpu_count() or 1
+    partitions = min(workers, len(df) // max(min_partition_records, 1))
+    if partitions <= 1:
+        return clean_and_validate_data(df, False, normalize_unicode, report, seen_ids)
+
+    initial_count = len(df)
+    df = _drop_duplicates(df, report.record, seen_ids)
+    original_index = df.index
+    # Workers get record positions as the index, to restore the record order afterwards
+    df = df.copy(deep=False)
+    df.index = pd.RangeIndex(len(df))
+    labels = partition_by_id_range(df['met_object_id'], partitions)
+
+    sidecar_paths = [
+        f"{report.sidecar_path}.part{index}" if report.sidecar_path is not None else None
+        for index in range(partitions)
+    ]
+    with ProcessPoolExecutor(max_workers=partitions) as pool:
+        futures = [
+            pool.submit(_clean_partition, df[labels == index], normalize_unicode,
+                        report.sample_size, sidecar_paths[index], index + 1)
+            for index in range(partitions)
+        ]
+        results = [future.result() for future in futures]
+
+    batches, input_records = report.batches, report.input_records
+    # Duplicates dropped above come first in the sidecar
+    report.flush()
+    for (_, partition_report), sidecar_path in zip(results, sidecar_paths):
+        report.merge(partition_report)
+        if sidecar_path is not None:
+            with open(sidecar_path) as part, open(report.sidecar_path, 'a') as sidecar:
+                shutil.copyfileobj(part, sidecar)
+            os.remove(sidecar_path)
+    # The partitions are one batch, and their input excludes the duplicates dropped above
+    report.batches = batches + 1
+    report.input_records = input_records + initial_count
+
+    cleaned = pd.concat([partition for partition, _ in results])
+    positions = np.sort(cleaned.index.to_numpy())
+    cleaned = cleaned.loc[positions]
+    cleaned.index = original_index.take(positions)
+    return cleaned
@@ -0,0 +1,264 @@
+"""
+Structured report of the data cleaning rules applied to artwork records.
+
+The cleaner records every rule violation of a batch in one vectorized
+call per rule: a count, the affected met_object_ids, and a bounded
+reservoir sample of examples. Optionally, the full list of violations is
+appended to an NDJSON sidecar file, one JSON object per violation; they
+are buffered in memory until flush(), which the cleaner calls once per
+batch.
+"""
+import json
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# Cleaning rules, in the order they are applied
+RULES = (
+    'duplicate_id',           # dropped: an earlier record in the batch has the same ID
+    'seen_in_earlier_batch',  # dropped: an earlier batch had the same ID
+    'invalid_begin_date',     # begin date is not an integer, set to null
+    'invalid_end_date',       # end date is not an integer, set to null
+    'reversed_dates',         # begin date > end date, kept as is
+    'zero_begin_date',        # begin date 0 (unknown), set to null
+    'zero_end_date',          # end date 0 (unknown), set to null
+    'missing_id',             # dropped: null met_object_id
+)
+
+DROPPING_RULES = ('duplicate_id', 'seen_in_earlier_batch', 'missing_id')
+
+DATE_ISSUE_RULES = ('invalid_begin_date', 'invalid_end_date', 'reversed_dates')
+
+SAMPLE_SIZE = 5
+
+
+def _json_value(value):
+    """Convert a NumPy/pandas scalar to a JSON-serializable value."""
+    if isinstance(value, (list, dict, str)):
+        return value
+    if pd.isna(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class CleaningReport:
+    """
+    Rule violations and statistics, accumulated over one or more cleaned batches.
+
+    Attributes:
+        batches (int): Batches cleaned
+        input_records (int): Records received
+        output_records (int): Records returned
+        rule_counts (Counter): Violations per rule
+        null_values (Counter): Null values per field after null handling
+        samples (dict): Rule -> up to sample_size example violations (dicts),
+            a uniform random sample of all violations of the rule
+        sample_size (int): Maximum examples kept per rule
+        sidecar_path (str or None): NDJSON file receiving every violation
+    """
+
+    def __init__(self, sample_size=SAMPLE_SIZE, sidecar_path=None, seed=0):
+        """
+        Initialize an empty report.
+
+        Args:
+            sample_size (int, optional): Examples kept per rule. Defaults to SAMPLE_SIZE.
+            sidecar_path (str, optional): Write every violation to this NDJSON file,
+                which is created (or truncated) right away. Defaults to None.
+            seed (int, optional): Seed of the sampling random generator. Defaults to 0.
+        """
+        self.batches = 0
+        self.input_records = 0
+        self.output_records = 0
+        self.rule_counts = Counter()
+        self.null_values = Counter()
+        self.samples = {}
+        self.sample_size = sample_size
+        self.sidecar_path = sidecar_path
+        self._affected_ids = {}
+        self._pending = []
+        self._rng = np.random.default_rng(seed)
+        if sidecar_path is not None:
+            open(sidecar_path, 'w').close()
+
+    def count(self, rule):
+        """
+        Get the number of violations of a rule.
+
+        Args:
+            rule (str): Rule name (see RULES)
+
+        Returns:
+            int: Violations recorded so far
+        """
+        return self.rule_counts[rule]
+
+    @property
+    def dropped(self):
+        """int: Records dropped by the cleaner."""
+        return sum(self.rule_counts[rule] for rule in DROPPING_RULES)
+
+    @property
+    def date_issues(self):
+        """int: Invalid and reversed dates."""
+        return sum(self.rule_counts[rule] for rule in DATE_ISSUE_RULES)
+
+    def affected_ids(self, rule):
+        """
+        Get the met_object_ids affected by a rule.
+
+        Args:
+            rule (str): Rule name (see RULES)
+
+        Returns:
+            numpy.ndarray: IDs in the order their violations were recorded
+        """
+        chunks = self._affected_ids.get(rule)
+        if not chunks:
+            return np.array([], dtype=np.int64)
+        if len(chunks) > 1:
+            self._affected_ids[rule] = chunks = [np.concatenate(chunks)]
+        return chunks[0]
+
+    def record(self, rule, ids, values=None):
+        """
+        Record the violations of a rule in one batch.
+
+        Args:
+            rule (str): Rule name (see RULES)
+            ids (pandas.Series or array-like): met_object_ids of the violating records
+            values (dict, optional): Field name -> values of the violating records
+                (aligned with `ids`), included in examples and the sidecar
+        """
+        ids = np.asarray(ids)
+        if len(ids) == 0:
+            return
+        values = {field: np.asarray(column, dtype=object) for field, column in (values or {}).items()}
+
+        self._sample(rule, ids, values)
+        self.rule_counts[rule] += len(ids)
+        self._affected_ids.setdefault(rule, []).append(ids)
+        if self.sidecar_path is not None:
+            self._pending.append(pd.DataFrame({'rule': rule, 'met_object_id': ids, **values}))
+
+    def _example(self, ids, values, index):
+        """Build the example dictionary of one violation."""
+        example = {'met_object_id': _json_value(ids[index])}
+        example.update({field: _json_value(column[index]) for field, column in values.items()})
+        return example
+
+    def _sample(self, rule, ids, values):
+        """Update the rule's reservoir sample (algorithm R) with a batch of violations."""
+        reservoir = self.samples.setdefault(rule, [])
+        seen = self.rule_counts[rule]
+        fill = min(len(ids), max(self.sample_size - len(reservoir), 0))
+        reservoir.extend(self._example(ids, values, index) for index in range(fill))
+        if fill == len(ids):
+            return
+
+        # Violation number n (0-based, over all batches) replaces a random slot with probability size / (n + 1)
+        positions = np.arange(seen + fill, seen + len(ids))
+        slots = self._rng.integers(0, positions + 1)
+        for index in np.nonzero(slots < self.sample_size)[0]:
+            reservoir[slots[index]] = self._example(ids, values, fill + index)
+
+    def flush(self):
+        """Append the violations recorded since the last flush to the NDJSON sidecar file."""
+        if not self._pending:
+            return
+        with open(self.sidecar_path, 'a') as f:
+            for frame in self._pending:
+                frame.to_json(f, orient='records', lines=True, force_ascii=False, default_handler=str)
+        self._pending = []
+
+    def close(self):
+        """Write any buffered violations to the sidecar file."""
+        self.flush()
+
+    def merge(self, other):
+        """
+        Add a report collected elsewhere, e.g. by a sync shard.
+
+        Reservoir samples are merged so they stay a uniform sample of all
+        violations: the number of examples taken from each side is drawn
+        from the hypergeometric distribution of their violation counts, and
+        the examples are then drawn uniformly within each side. This needs
+        the other report's sample_size to be at least this one's. The other
+        report's sidecar file (and its unflushed violations) is not copied.
+
+        Args:
+            other (CleaningReport): Report to add
+        """
+        for rule in set(self.samples) | set(other.samples):
+            mine, theirs = self.samples.get(rule, []), other.samples.get(rule, [])
+            if len(mine) + len(theirs) <= self.sample_size:
+                self.samples[rule] = mine + theirs
+                continue
+            from_mine = self._rng.hypergeometric(
+                self.rule_counts[rule], other.rule_counts[rule], self.sample_size
+            )
+            # A side can only hold fewer examples than drawn if its report kept a smaller sample
+            from_mine = min(max(from_mine, self.sample_size - len(theirs)), len(mine))
+            examples = []
+            for side, size in ((mine, from_mine), (theirs, self.sample_size - from_mine)):
+                chosen = self._rng.choice(len(side), size=size, replace=False)
+                examples.extend(side[index] for index in sorted(chosen))
+            self.samples[rule] = examples
+
+        self.batches += other.batches
+        self.input_records += other.input_records
+        self.output_records += other.output_records
+        self.rule_counts.update(other.rule_counts)
+        self.null_values.update(other.null_values)
+        for rule in other._affected_ids:
+            self._affected_ids.setdefault(rule, []).append(other.affected_ids(rule))
+
+    def summary(self):
+        """
+        Get the report as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Record counts, violations and examples per rule, and nulls per field
+        """
+        return {
+            'batches': self.batches,
+            'input_records': self.input_records,
+            'output_records': self.output_records,
+            'rules': {
+                rule: {'count': self.rule_counts[rule], 'examples': self.samples.get(rule, [])}
+                for rule in RULES if self.rule_counts[rule]
+            },
+            'null_values': dict(self.null_values.most_common()),
+        }
+
+    def write_json(self, path):
+        """
+        Write the report summary to a JSON file.
+
+        Args:
+            path (str): Output file
+        """
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False, default=str)
+
+    def print_summary(self, log=print, indent="   ", rules=RULES):
+        """
+        Print the violation count and a few examples of each rule.
+
+        Args:
+            log (callable, optional): Output function. Defaults to print.
+            indent (str, optional): Prefix of each line. Defaults to three spaces.
+            rules (tuple, optional): Rules to print. Defaults to RULES.
+        """
+        for rule in rules:
+            count = self.rule_counts[rule]
+            if not count:
+                continue
+            examples = "; ".join(
+                ", ".join(f"{field}={value}" for field, value in example.items())
+                for example in self.samples.get(rule, [])[:3]
+            )
+            log(f"{indent}- {rule}: {count} (e.g. {examples})")
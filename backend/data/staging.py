@@ -0,0 +1,205 @@
+"""
+Columnar staging of fetched MET objects.
+
+Fetched objects are accumulated column by column in an ObjectBatch
+instead of as one dictionary per object. Low-cardinality text fields
+(department, classification, culture, ...) are dictionary-encoded: each
+distinct value is stored once and rows hold an integer code. The sync
+timestamp is stored once per batch rather than once per object.
+
+A batch is turned into a DataFrame directly from its columns, with the
+dictionary-encoded fields as pandas Categoricals, so no per-object
+dictionaries are built between fetching and cleaning.
+"""
+import sys
+from array import array
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Database column -> MET API field, in DataFrame column order
+STAGED_FIELDS = {
+    'met_object_id': 'objectID',
+    'title': 'title',
+    'artist_display_name': 'artistDisplayName',
+    'artist_display_bio': 'artistDisplayBio',
+    'artist_nationality': 'artistNationality',
+    'artist_gender': 'artistGender',
+    'object_date': 'objectDate',
+    'object_begin_date': 'objectBeginDate',
+    'object_end_date': 'objectEndDate',
+    'culture': 'culture',
+    'period': 'period',
+    'dynasty': 'dynasty',
+    'medium': 'medium',
+    'dimensions': 'dimensions',
+    'department': 'department',
+    'classification': 'classification',
+    'object_name': 'objectName',
+    'primary_image': 'primaryImage',
+    'is_public_domain': 'isPublicDomain',
+    'constituents': 'constituents',
+}
+
+# Fields with few distinct values across the collection, stored dictionary-encoded
+CATEGORICAL_FIELDS = (
+    'artist_nationality', 'artist_gender', 'culture', 'department', 'classification', 'object_name'
+)
+
+# Values stored in place of a missing API field
+FIELD_DEFAULTS = {'is_public_domain': False}
+
+
+class CategoryColumn:
+    """
+    A dictionary-encoded column of hashable values.
+
+    Attributes:
+        categories (list): Distinct non-null values, in order of first appearance
+        codes (array): Index into `categories` per row, or -1 for a null value
+    """
+    __slots__ = ('categories', 'codes', '_index')
+
+    def __init__(self):
+        """Initialize an empty column."""
+        self.categories = []
+        self.codes = array('i')
+        self._index = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, value):
+        """
+        Append a value, adding it to the dictionary if it is new.
+
+        Args:
+            value: Value to append; None is stored as a null code
+        """
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def to_categorical(self):
+        """
+        Get the column as a pandas Categorical without decoding it.
+
+        Returns:
+            pandas.Categorical: Categorical sharing this column's dictionary
+        """
+        # Categories are built in order of first appearance, so they are already unique
+        return pd.Categorical.from_codes(
+            np.frombuffer(self.codes, dtype=np.int32) if self.codes else np.empty(0, dtype=np.int32),
+            dtype=pd.CategoricalDtype(pd.Index(self.categories, dtype=object))
+        )
+
+
+class ObjectBatch:
+    """
+    A columnar batch of fetched MET objects.
+
+    Attributes:
+        columns (dict): Database column name -> list of values, or a CategoryColumn
+            for the fields in CATEGORICAL_FIELDS
+        synced_at (datetime): When the batch was staged (UTC), shared by all its objects
+    """
+    __slots__ = ('columns', 'synced_at')
+
+    def __init__(self, synced_at=None):
+        """
+        Initialize an empty batch.
+
+        Args:
+            synced_at (datetime, optional): Sync timestamp of the batch. Defaults to now (UTC).
+        """
+        self.columns = {
+            name: CategoryColumn() if name in CATEGORICAL_FIELDS else []
+            for name in STAGED_FIELDS
+        }
+        self.synced_at = synced_at if synced_at is not None else datetime.utcnow()
+
+    def __len__(self):
+        return len(self.columns['met_object_id'])
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, obj_details):
+        """
+        Append one object from the MET API.
+
+        Args:
+            obj_details (dict): Complete object data dictionary from API
+        """
+        for name, api_field in STAGED_FIELDS.items():
+            self.columns[name].append(obj_details.get(api_field, FIELD_DEFAULTS.get(name)))
+
+    def extend(self, objects):
+        """
+        Append several objects from the MET API.
+
+        Args:
+            objects (iterable): Complete object data dictionaries from API
+        """
+        for obj_details in objects:
+            self.append(obj_details)
+
+    @property
+    def met_object_ids(self):
+        """list: MET object IDs of the batch, in staging order."""
+        return self.columns['met_object_id']
+
+    def memory_usage(self):
+        """
+        Estimate the memory held by the batch.
+
+        Counts the column containers and each distinct value object once,
+        so dictionary-encoded values are only counted once per batch.
+
+        Returns:
+            int: Approximate size in bytes
+        """
+        seen = set()
+        total = 0
+
+        def add(value):
+            nonlocal total
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+
+        for column in self.columns.values():
+            if isinstance(column, CategoryColumn):
+                add(column.codes)
+                add(column.categories)
+                values = column.categories
+            else:
+                add(column)
+                values = column
+            for value in values:
+                add(value)
+        return total
+
+    def to_dataframe(self):
+        """
+        Build a DataFrame from the batch's columns.
+
+        Dictionary-encoded fields become categorical columns, and synced_at
+        is a single value broadcast over the batch.
+
+        Returns:
+            pandas.DataFrame: One row per staged object
+        """
+        data = {
+            name: column.to_categorical() if isinstance(column, CategoryColumn) else column
+            for name, column in self.columns.items()
+        }
+        df = pd.DataFrame(data)
+        df['synced_at'] = pd.Timestamp(self.synced_at)
+        return df
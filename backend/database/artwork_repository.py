@@ -2,13 +2,63 @@
 Database repository for artwork operations.
 
 This module handles all database operations for artworks including
-bulk insert, update, and data preparation.
+bulk upserts, COPY-based bulk loads, parallel writes over several
+connections, and data preparation.
 """
+import hashlib
+import io
+import json
+import numpy as np
 import pandas as pd
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from data.cleaners import _quiet
 from database.database import get_db_session, engine
-from database.models import Artwork
-from sqlalchemy import text
+from database.models import Artwork, SyncDeadLetter, artworks_staging, artworks_staging_temp
+from sqlalchemy import ARRAY, Integer, any_, bindparam, literal_column, or_, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.util import await_only
+
+# Bookkeeping columns that are not part of an artwork's content
+UNHASHED_FIELDS = frozenset({'id', 'content_hash', 'synced_at', 'created_at', 'updated_at', 'removed_at'})
+
+# Serializer of the hashed content, created once instead of per json.dumps call
+_HASH_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+# Columns of a prepared record taken from the DataFrame, in record order
+RECORD_FIELDS = (
+    'met_object_id', 'title', 'object_name', 'object_date', 'object_begin_date', 'object_end_date',
+    'artist_display_name', 'artist_display_bio', 'artist_nationality', 'artist_gender',
+    'culture', 'period', 'dynasty', 'medium', 'dimensions', 'department', 'classification',
+    'primary_image', 'is_public_domain', 'constituents',
+)
+INTEGER_FIELDS = frozenset({'met_object_id', 'object_begin_date', 'object_end_date'})
+
+# Columns an upsert sets on new artworks only
+INSERT_ONLY_FIELDS = frozenset({'met_object_id', 'created_at'})
+
+# Columns sent to COPY as JSON text; None becomes a JSON null, as with the upsert path
+JSON_FIELDS = frozenset({'constituents'})
+
+# Records per upsert statement
+UPSERT_BATCH_SIZE = 500
+
+# Default concurrent connections of save_to_database_parallel
+WRITE_WORKERS = 4
+
+# Longest error message kept in a dead letter
+MAX_ERROR_LENGTH = 2000
+
+# SQLSTATE classes of failures not caused by the records written: connection
+# exceptions, insufficient resources, operator intervention (e.g. timeouts),
+# transaction rollbacks (deadlocks, serialization failures), and object not in
+# prerequisite state (e.g. lock timeouts)
+NON_DATA_ERROR_CLASSES = ('08', '40', '53', '55', '57')
+
+# Characters escaped in COPY's text format
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
 
 
 def check_database_connection():
@@ -34,20 +84,78 @@ def check_database_connection():
         return False
 
 
-def prepare_artwork_data(row):
+def existing_ids_query(met_object_ids):
+    """
+    Build the query for the given MET object IDs that exist in artworks.
+
+    The IDs are bound as one integer array (met_object_id = ANY(:ids)),
+    so the statement has a single parameter however many IDs are looked up.
+
+    Args:
+        met_object_ids (iterable): MET object IDs to look up
+
+    Returns:
+        Select: Query returning the met_object_id of each existing artwork
+    """
+    ids = bindparam('met_object_ids', [int(met_id) for met_id in met_object_ids], type_=ARRAY(Integer))
+    return select(Artwork.met_object_id).where(Artwork.met_object_id == any_(ids))
+
+
+def get_existing_object_ids(met_object_ids):
+    """
+    Look up which MET object IDs are already stored, removed artworks included.
+
+    Args:
+        met_object_ids (iterable): MET object IDs to look up
+
+    Returns:
+        set: The IDs that exist in artworks
+    """
+    with get_db_session() as db:
+        return set(db.execute(existing_ids_query(met_object_ids)).scalars())
+
+
+def compute_content_hash(artwork_data):
+    """
+    Compute a stable hash of an artwork's synced content.
+
+    Bookkeeping columns (timestamps, IDs) are left out, and keys are
+    serialized in sorted order, so the hash only changes when the
+    artwork's data changes.
+
+    Args:
+        artwork_data (dict): Artwork data as returned by prepare_artwork_data
+
+    Returns:
+        str: Hex-encoded sha256 digest
+    """
+    content = {key: value for key, value in artwork_data.items() if key not in UNHASHED_FIELDS}
+    return _content_digest(content)
+
+
+def _content_digest(content):
+    """Hash artwork content that has no bookkeeping columns (see compute_content_hash)."""
+    return hashlib.sha256(_HASH_ENCODER.encode(content).encode('utf-8')).hexdigest()
+
+
+def prepare_artwork_data(row, synced_at=None):
     """
     Convert a DataFrame row into a dictionary ready for database insertion.
 
     This helper function handles all the data conversion and null checking
-    so we can reuse it for both inserts and updates.
+    for a single row; prepare_records builds the same records for a whole
+    DataFrame at once.
 
     Args:
         row: A pandas Series representing one row from the DataFrame
+        synced_at (datetime, optional): Sync timestamp shared by the batch. Defaults to now (UTC).
 
     Returns:
-        dict: Dictionary with artwork data ready for database
+        dict: Dictionary with artwork data ready for database, including its content hash
     """
-    return {
+    # constituents is a list (or None); pd.notna() cannot be used on it
+    constituents = row.get('constituents')
+    artwork_data = {
         'met_object_id': int(row['met_object_id']),
         'title': row.get('title') if pd.notna(row.get('title')) else None,
         'object_name': row.get('object_name') if pd.notna(row.get('object_name')) else None,
@@ -67,151 +175,505 @@ def prepare_artwork_data(row):
         'classification': row.get('classification') if pd.notna(row.get('classification')) else None,
         'primary_image': row.get('primary_image') if pd.notna(row.get('primary_image')) else None,
         'is_public_domain': bool(row.get('is_public_domain', False)),
-        'constituents': row.get('constituents') if pd.notna(row.get('constituents')) else None,
-        'synced_at': datetime.utcnow(),
+        'constituents': constituents if isinstance(constituents, (list, dict)) else None,
+        'synced_at': synced_at if synced_at is not None else datetime.utcnow(),
+        'removed_at': None,
     }
+    artwork_data['content_hash'] = compute_content_hash(artwork_data)
+    return artwork_data
+
+
+def build_upsert_statement(columns, source=None):
+    """
+    Build the INSERT ... ON CONFLICT DO UPDATE statement for artwork records.
+
+    An existing artwork is only updated when its content hash differs, or
+    when it is marked removed; unchanged rows are left untouched and not
+    returned. Each returned row is (met_object_id, inserted), where
+    inserted comes from xmax = 0: true for a new row, false for an update.
+
+    Args:
+        columns (iterable): Column names of the records to write
+        source (Select, optional): Query to insert the rows of (INSERT ... SELECT).
+            Defaults to None, for a statement executed with a list of records.
+
+    Returns:
+        sqlalchemy.sql.dml.Insert: Statement to execute
+    """
+    table = Artwork.__table__
+    columns = list(columns)
+    stmt = insert(table)
+    if source is not None:
+        stmt = stmt.from_select(columns, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.met_object_id],
+        set_={name: stmt.excluded[name] for name in columns if name not in INSERT_ONLY_FIELDS},
+        where=or_(
+            table.c.content_hash.is_distinct_from(stmt.excluded.content_hash),
+            table.c.removed_at.is_not(None),
+        ),
+    ).returning(table.c.met_object_id, literal_column('xmax = 0').label('inserted'))
+
+
+def _error_message(error):
+    """Get the database's message for a failed write, without SQLAlchemy's statement dump."""
+    orig = getattr(error, 'orig', None) or error
+    # asyncpg errors come wrapped in the dialect's DBAPI adapter, with the driver's error as the cause
+    message = str(orig.__cause__ or orig).strip()
+    return message[:MAX_ERROR_LENGTH]
+
+
+def _is_data_error(error):
+    """
+    Whether a write failed because of the records written, so that a subset of them can succeed.
+
+    Only errors the database reported with a SQLSTATE outside
+    NON_DATA_ERROR_CLASSES count; errors without one (a bug on our side,
+    a driver error) are not blamed on the records.
+    """
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return False
+    orig = getattr(error, 'orig', error)
+    pgcode = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None)
+    return bool(pgcode) and pgcode[:2] not in NON_DATA_ERROR_CLASSES
+
+
+def quarantine_record(db, record, error, stage, run_id=None):
+    """
+    Store a record that could not be written in the sync_dead_letters table.
 
+    Args:
+        db: Database session or connection, in the transaction of the write
+        record (dict): The record as it was sent to the database
+        error (Exception): Why the write failed
+        stage (str): 'upsert', 'copy', or 'merge'
+        run_id (int, optional): Sync run the record was written by
+    """
+    met_object_id = record.get('met_object_id')
+    if not isinstance(met_object_id, int) or not -2**31 <= met_object_id < 2**31:
+        met_object_id = None
+    db.execute(insert(SyncDeadLetter).values(
+        run_id=run_id,
+        met_object_id=met_object_id,
+        stage=stage,
+        error=_error_message(error),
+        record=json.loads(json.dumps(record, default=str)),
+        created_at=datetime.utcnow(),
+    ))
+
+
+def write_isolating_failures(db, items, write, on_failure):
+    """
+    Write items in a SAVEPOINT, isolating the items that make the write fail.
+
+    If write(items) fails because of the data, the savepoint is rolled
+    back, so the transaction stays usable, and the items are split in
+    halves that are written the same way, down to single items;
+    on_failure(item, error) is called for each item that fails on its own.
+    All other items are written on this first pass. Failures that are not
+    caused by the data (lost connection, statement timeout, deadlock, lock
+    timeout, errors without a SQLSTATE) are raised, so valid records are
+    never quarantined because of transient contention.
 
-def process_batch(db, batch, batch_num, operation_type, stats, stats_key):
+    Args:
+        db: Database session or connection
+        items (list): Items to write
+        write (callable): write(items) -> result, run inside the savepoint
+        on_failure (callable): Called with (item, error) for each failing item
+
+    Returns:
+        list: Results of the successful write calls
     """
-    Process a single batch of records with error handling.
+    if not items:
+        return []
+    try:
+        with db.begin_nested():
+            return [write(items)]
+    except Exception as e:
+        if not _is_data_error(e):
+            raise
+        if len(items) == 1:
+            on_failure(items[0], e)
+            return []
+        middle = len(items) // 2
+        return (write_isolating_failures(db, items[:middle], write, on_failure)
+                + write_isolating_failures(db, items[middle:], write, on_failure))
+
+
+def _quarantiner(db, stats, stage, run_id, failures):
+    """Build the on_failure callback that counts and quarantines a failing record."""
+    def quarantine(record, error):
+        stats['errors'] += 1
+        stats['failed_ids'].append(record.get('met_object_id'))
+        quarantine_record(db, record, error, stage, run_id)
+        failures.append((record.get('met_object_id'), error))
+    return quarantine
+
+
+def _print_failures(failures, batch_name):
+    """Print one line for the records of a batch that were quarantined."""
+    if failures:
+        met_object_id, error = failures[0]
+        print(f"  ✗ {batch_name}: {len(failures)} records quarantined in sync_dead_letters "
+              f"(e.g. artwork {met_object_id}: {_error_message(error).splitlines()[0]})")
+
+
+def upsert_batch(db, stmt, batch, batch_num, stats, verbose=True, run_id=None):
+    """
+    Upsert a single batch of records, isolating the records that fail.
 
-    This helper function handles the common batch processing pattern
-    for both insert and update operations.
+    The records are sent as one executemany, which SQLAlchemy renders as
+    multi-row INSERT statements (insertmanyvalues) with RETURNING, inside
+    a SAVEPOINT. If it fails, the batch is bisected down to the failing
+    records (see write_isolating_failures), which are counted as errors
+    and quarantined in sync_dead_letters; the other records are written.
 
     Args:
         db: Database session
-        batch (list): List of records to process
+        stmt: Statement from build_upsert_statement
+        batch (list): List of records to upsert
         batch_num (int): Batch number (for logging)
-        operation_type (str): 'insert' or 'update'
         stats (dict): Statistics dictionary to update
-        stats_key (str): Key in stats dict to increment ('inserted' or 'updated')
+        verbose (bool, optional): Print a line per successful batch. Defaults to True.
+        run_id (int, optional): Sync run to record quarantined records under
 
     Returns:
-        bool: True if successful, False if error occurred
+        bool: True if every record was written, False if some were quarantined
     """
-    try:
-        if operation_type == 'insert':
-            db.bulk_insert_mappings(Artwork, batch)
-            print(f"  ✓ Inserted batch {batch_num}: {len(batch)} artworks")
-        elif operation_type == 'update':
-            db.bulk_update_mappings(Artwork, batch)
-            print(f"  ✓ Updated batch {batch_num}: {len(batch)} artworks")
-
-        stats[stats_key] += len(batch)
-        return True
-    except Exception as e:
-        stats['errors'] += len(batch)
-        operation_name = 'inserting' if operation_type == 'insert' else 'updating'
-        print(f"  ✗ Error {operation_name} batch {batch_num}: {e}")
-        return False
+    failures = []
+    results = write_isolating_failures(
+        db, batch, lambda records: db.connection().execute(stmt, records).all(),
+        _quarantiner(db, stats, 'upsert', run_id, failures)
+    )
+    rows = [row for result in results for row in result]
+
+    inserted = sum(1 for _, is_new in rows if is_new)
+    unchanged = len(batch) - len(rows) - len(failures)
+    stats['inserted'] += inserted
+    stats['updated'] += len(rows) - inserted
+    stats['unchanged'] += unchanged
+    stats['changed_ids'].extend(met_object_id for met_object_id, _ in rows)
+    _print_failures(failures, f"Batch {batch_num}")
+    if verbose:
+        print(f"  ✓ Upserted batch {batch_num}: {inserted} inserted, {len(rows) - inserted} updated, "
+              f"{unchanged} unchanged, {len(failures)} quarantined")
+    return not failures
+
+
+def _copy_value(value):
+    """Format one value for COPY's text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def encode_copy_rows(records, columns):
+    """
+    Encode records as rows for copy_rows: tuples in column order, JSON fields as JSON text.
+
+    Args:
+        records (list): Records as returned by prepare_records
+        columns (list): Column names to copy, in order
+
+    Returns:
+        list: One tuple per record
+    """
+    json_positions = [position for position, name in enumerate(columns) if name in JSON_FIELDS]
+    rows = []
+    for record in records:
+        row = [record[name] for name in columns]
+        for position in json_positions:
+            row[position] = json.dumps(row[position])
+        rows.append(tuple(row))
+    return rows
+
+
+def _row_record(row, columns):
+    """Turn a row from encode_copy_rows back into a record, e.g. to quarantine it."""
+    record = dict(zip(columns, row))
+    for name in JSON_FIELDS.intersection(columns):
+        record[name] = json.loads(record[name])
+    return record
 
 
-def save_to_database(df):
+def copy_rows(conn, rows, columns, staging=artworks_staging):
     """
-    Save artwork data from DataFrame to PostgreSQL database using bulk operations.
+    Copy rows into a staging table with COPY FROM STDIN.
 
-    This function is optimized for performance by:
-    1. Checking which records already exist in one query
-    2. Splitting new records from existing ones
-    3. Using bulk insert and bulk update operations
-    4. Processing in batches to avoid memory issues
+    On psycopg2 the rows are sent in COPY's text format. On asyncpg
+    (a sync connection given by AsyncConnection.run_sync), they are sent
+    in the binary format with the driver's copy_records_to_table.
 
     Args:
-        df (pandas.DataFrame): DataFrame containing cleaned artwork data
+        conn (sqlalchemy.engine.Connection): Connection in the load's transaction
+        rows (list): Rows as returned by encode_copy_rows
+        columns (list): Column names to copy, in order
+        staging (Table, optional): Staging table. Defaults to artworks_staging.
+    """
+    driver_connection = conn.connection.driver_connection
+    if hasattr(driver_connection, 'copy_records_to_table'):
+        await_only(driver_connection.copy_records_to_table(staging.name, records=rows, columns=columns))
+        return
 
-    Returns:
-        dict: Statistics about the save operation (inserted, updated, errors)
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN", buffer
+        )
+
+
+def stage_rows(conn, rows, columns, stats, run_id=None, batch_name="Batch", staging=artworks_staging):
     """
-    print("\n" + "="*60)
-    print("SAVING DATA TO DATABASE")
-    print("="*60)
+    Copy rows into a staging table, quarantining the rows the database rejects.
 
-    stats = {
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection in the load's transaction
+        rows (list): Rows as returned by encode_copy_rows
+        columns (list): Column names to copy, in order
+        stats (dict): Statistics dictionary to update, with a 'staged' count
+        run_id (int, optional): Sync run to record quarantined records under
+        batch_name (str, optional): Name of the rows in failure messages. Defaults to "Batch".
+        staging (Table, optional): Staging table. Defaults to artworks_staging.
+
+    Returns:
+        int: Rows staged
+    """
+    failures = []
+    quarantine = _quarantiner(conn, stats, 'copy', run_id, failures)
+    write_isolating_failures(
+        conn, rows, lambda items: copy_rows(conn, items, columns, staging),
+        lambda row, error: quarantine(_row_record(row, columns), error)
+    )
+    _print_failures(failures, batch_name)
+    stats['staged'] += len(rows) - len(failures)
+    return len(rows) - len(failures)
+
+
+def _new_save_stats():
+    """Statistics of a save operation."""
+    return {
         'inserted': 0,
         'updated': 0,
+        'unchanged': 0,
         'errors': 0,
-        'skipped': 0
+        'skipped': 0,
+        'changed_ids': [],
+        'failed_ids': []
     }
 
+
+def _text_values(df, name):
+    """Get a column as a list, with None for missing values (or a missing column)."""
+    if name not in df.columns:
+        return [None] * len(df)
+    values = df[name]
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _integer_values(df, name):
+    """
+    Get a column as a list of Python ints, with None for missing values.
+
+    Numbers are truncated towards zero and numeric strings are parsed, as
+    int() does.
+
+    Returns:
+        tuple: (list of int or None, boolean array of values that are not integers)
+    """
+    if name not in df.columns:
+        return [None] * len(df), np.zeros(len(df), dtype=bool)
+    values = df[name]
+    present = values.notna().to_numpy()
+    if isinstance(values.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(values.dtype):
+        values = pd.to_numeric(values.astype(object), errors='coerce')
+    numbers = values.to_numpy(dtype=float, na_value=np.nan)
+    valid = np.isfinite(numbers)
+    integers = pd.array(np.trunc(np.where(valid, numbers, np.nan)), dtype='Int64')
+    return integers.to_numpy(dtype=object, na_value=None).tolist(), present & ~valid
+
+
+def _json_scalar(value):
+    """Convert a DataFrame value to a JSON-serializable one, with missing values as None."""
+    if isinstance(value, (list, dict)):
+        return value
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def quarantine_unprepared(db, stats, run_id=None):
+    """
+    Store the rows prepare_records could not prepare in sync_dead_letters, with stage 'prepare'.
+
+    Args:
+        db: Database session or connection, in the transaction of the write
+        stats (dict): Statistics dictionary passed to prepare_records; its
+            'unprepared' rows are removed once quarantined
+        run_id (int, optional): Sync run to record the rows under
+    """
+    for row, reason in stats.pop('unprepared', []):
+        quarantine_record(db, row, ValueError(reason), 'prepare', run_id)
+
+
+def prepare_records(df, stats, now=None):
+    """
+    Prepare the rows of a cleaned DataFrame for writing, column by column.
+
+    Builds the same records as calling prepare_artwork_data on every row,
+    but converts each column once (missing values to None, dates and IDs
+    to Python ints) and uses one timestamp for the whole batch. Only the
+    content hash is computed per record.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing cleaned artwork data
+        stats (dict): Statistics dictionary; rows that cannot be prepared (no valid
+            met_object_id, or a date that is not a number) are counted as errors, their
+            IDs (None if invalid) added to failed_ids, and the rows kept in 'unprepared'
+            for quarantine_unprepared
+        now (datetime, optional): Sync, creation and update time of the records. Defaults to now (UTC).
+
+    Returns:
+        list: Records as returned by prepare_artwork_data, with created_at and updated_at
+    """
+    now = now if now is not None else datetime.utcnow()
+    columns = {}
+    invalid = np.zeros(len(df), dtype=bool)
+
+    for name in RECORD_FIELDS:
+        if name in INTEGER_FIELDS:
+            columns[name], bad = _integer_values(df, name)
+            invalid |= bad
+        elif name == 'is_public_domain':
+            values = df[name].tolist() if name in df.columns else [False] * len(df)
+            columns[name] = [bool(value) for value in values]
+        elif name == 'constituents':
+            values = df[name].tolist() if name in df.columns else [None] * len(df)
+            columns[name] = [value if isinstance(value, (list, dict)) else None for value in values]
+        else:
+            columns[name] = _text_values(df, name)
+    invalid |= np.array([met_object_id is None for met_object_id in columns['met_object_id']], dtype=bool)
+
+    if invalid.any():
+        bad_rows = df.index[invalid]
+        stats['errors'] += len(bad_rows)
+        unprepared = stats.setdefault('unprepared', [])
+        for position in np.flatnonzero(invalid):
+            met_object_id = columns['met_object_id'][position]
+            stats.setdefault('failed_ids', []).append(met_object_id)
+            row = {name: _json_scalar(value) for name, value in df.iloc[position].items()}
+            row['met_object_id'] = met_object_id if met_object_id is not None else row.get('met_object_id')
+            reason = ("missing or invalid met_object_id" if met_object_id is None
+                      else "object_begin_date or object_end_date is not a number")
+            unprepared.append((row, reason))
+        print(f"  ✗ Error preparing {len(bad_rows)} rows without a valid met_object_id or with "
+              f"a non-numeric date (rows {', '.join(str(idx) for idx in bad_rows[:10])}"
+              f"{', ...' if len(bad_rows) > 10 else ''})")
+
+    names = list(columns)
+    records = []
+    for values, bad in zip(zip(*columns.values()), invalid):
+        if bad:
+            continue
+        artwork_data = dict(zip(names, values))
+        # RECORD_FIELDS are all content, so the record is hashed before bookkeeping columns are added
+        content_hash = _content_digest(artwork_data)
+        artwork_data['synced_at'] = now
+        artwork_data['removed_at'] = None
+        artwork_data['content_hash'] = content_hash
+        artwork_data['created_at'] = now
+        artwork_data['updated_at'] = now
+        records.append(artwork_data)
+
+    return records
+
+
+def upsert_records(db, records, stats, verbose=True, run_id=None):
+    """
+    Upsert prepared records in batches of UPSERT_BATCH_SIZE (see upsert_batch).
+
+    Args:
+        db: Database session; an AsyncSession's run_sync() passes a sync one
+        records (list): Records as returned by prepare_records
+        stats (dict): Statistics dictionary to update
+        verbose (bool, optional): Print a line per batch. Defaults to True.
+        run_id (int, optional): Sync run to record quarantined records under
+    """
+    stmt = build_upsert_statement(records[0].keys())
+    for i in range(0, len(records), UPSERT_BATCH_SIZE):
+        batch = records[i:i + UPSERT_BATCH_SIZE]
+        upsert_batch(db, stmt, batch, i // UPSERT_BATCH_SIZE + 1, stats, verbose, run_id)
+
+
+def save_to_database(df, verbose=True, run_id=None):
+    """
+    Save artwork data from DataFrame to PostgreSQL database with a native upsert.
+
+    Records are written in batches with INSERT ... ON CONFLICT
+    (met_object_id) DO UPDATE, so new and existing artworks take one
+    statement per batch and no lookup query is needed:
+    1. New artworks are inserted
+    2. Existing artworks are updated only if their content hash changed
+    3. Unchanged artworks are not written at all, so their updated_at only
+       moves when their content actually changes
+
+    An artwork marked removed is always updated, to clear removed_at.
+
+    Each batch runs in a SAVEPOINT; records the database rejects are
+    isolated and quarantined in sync_dead_letters (see upsert_batch),
+    and the rest of the batch is written.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing cleaned artwork data
+        verbose (bool, optional): Print progress. Defaults to True. Errors are always printed.
+        run_id (int, optional): Sync run to record quarantined records under
+
+    Returns:
+        dict: Statistics about the save operation (inserted, updated, unchanged, errors),
+              plus changed_ids, the MET object IDs that were inserted or updated,
+              and failed_ids, the MET object IDs of the quarantined records
+    """
+    log = print if verbose else _quiet
+
+    log("\n" + "="*60)
+    log("SAVING DATA TO DATABASE")
+    log("="*60)
+
+    stats = _new_save_stats()
+
     if len(df) == 0:
-        print("No data to save")
+        log("No data to save")
         return stats
 
     try:
         with get_db_session() as db:
-            print(f"\nStep 1: Checking which artworks already exist...")
-            met_object_ids = [int(x) for x in df['met_object_id'].tolist()]
-
-            existing_ids = set(
-                db.query(Artwork.met_object_id)
-                .filter(Artwork.met_object_id.in_(met_object_ids))
-                .all()
-            )
-            existing_ids = {id_tuple[0] for id_tuple in existing_ids}
-
-            print(f"  Found {len(existing_ids)} existing artworks out of {len(met_object_ids)} total")
-
-            print(f"\nStep 2: Preparing data for database...")
-            new_records = []
-            update_records = []
-
-            for idx, row in df.iterrows():
-                try:
-                    artwork_data = prepare_artwork_data(row)
-                    met_object_id = artwork_data['met_object_id']
-
-                    if met_object_id in existing_ids:
-                        artwork_data['updated_at'] = datetime.utcnow()
-                        update_records.append(artwork_data)
-                    else:
-                        artwork_data['created_at'] = datetime.utcnow()
-                        artwork_data['updated_at'] = datetime.utcnow()
-                        new_records.append(artwork_data)
-
-                except Exception as e:
-                    stats['errors'] += 1
-                    print(f"  ✗ Error preparing row {idx}: {e}")
-
-            print(f"  Prepared {len(new_records)} new records and {len(update_records)} records to update")
-
-            batch_size = 500
-
-            if new_records:
-                print(f"\nStep 3: Bulk inserting {len(new_records)} new artworks...")
-                for i in range(0, len(new_records), batch_size):
-                    batch = new_records[i:i + batch_size]
-                    batch_num = i//batch_size + 1
-                    process_batch(db, batch, batch_num, 'insert', stats, 'inserted')
-
-            if update_records:
-                print(f"\nStep 4: Bulk updating {len(update_records)} existing artworks...")
-                met_id_to_db_id = {
-                    met_id: db_id for met_id, db_id in
-                    db.query(Artwork.met_object_id, Artwork.id)
-                    .filter(Artwork.met_object_id.in_([r['met_object_id'] for r in update_records]))
-                    .all()
-                }
-
-                for record in update_records:
-                    record['id'] = met_id_to_db_id.get(record['met_object_id'])
-
-                for i in range(0, len(update_records), batch_size):
-                    batch = update_records[i:i + batch_size]
-                    batch_num = i//batch_size + 1
-                    process_batch(db, batch, batch_num, 'update', stats, 'updated')
-
-            print(f"\nStep 5: Committing changes to database...")
+            log("\nStep 1: Preparing data for database...")
+            records = prepare_records(df, stats)
+            quarantine_unprepared(db, stats, run_id)
+            log(f"  Prepared {len(records)} records")
+
+            if records:
+                log(f"\nStep 2: Upserting {len(records)} artworks...")
+                upsert_records(db, records, stats, verbose, run_id)
+
+            log("\nStep 3: Committing changes to database...")
             db.commit()
-            print("  ✓ All changes committed successfully")
+            log("  ✓ All changes committed successfully")
 
-        print(f"\n{'='*60}")
-        print("DATABASE SAVE COMPLETE")
-        print("="*60)
-        print(f"Inserted: {stats['inserted']} artworks")
-        print(f"Updated: {stats['updated']} artworks")
-        print(f"Errors: {stats['errors']} artworks")
-        print(f"Total processed: {stats['inserted'] + stats['updated']} artworks")
+        log(f"\n{'='*60}")
+        log("DATABASE SAVE COMPLETE")
+        log("="*60)
+        log(f"Inserted: {stats['inserted']} artworks")
+        log(f"Updated: {stats['updated']} artworks")
+        log(f"Unchanged: {stats['unchanged']} artworks")
+        log(f"Errors: {stats['errors']} artworks")
+        log(f"Total processed: {stats['inserted'] + stats['updated']} artworks")
 
         return stats
 
@@ -220,5 +682,336 @@ def save_to_database(df):
         import traceback
         traceback.print_exc()
         stats['errors'] = len(df)
+        stats['changed_ids'] = []
+        stats['failed_ids'] = []
+        return stats
+
+
+def _merge_staged(conn, columns, stats, run_id=None, staging=artworks_staging):
+    """
+    Merge the staged records into artworks, isolating the artworks that fail.
+
+    The merge first runs on the whole staging table. If the database
+    rejects it, it is retried on halves of the staged met_object_ids, down
+    to single artworks, whose staged records are quarantined. Rows are
+    merged in met_object_id order, so concurrent loads lock the artworks
+    they share in the same order and cannot deadlock.
+
+    Returns:
+        tuple: (rows returned by the merge, number of staged records quarantined)
+    """
+    staged = staging.c
+    failures = []
+    quarantine = _quarantiner(conn, stats, 'merge', run_id, failures)
+
+    def merge(id_range):
+        source = select(*(staged[name] for name in columns)).order_by(staged.met_object_id)
+        if id_range is not None:
+            source = source.where(staged.met_object_id.between(id_range[0], id_range[-1]))
+        return conn.execute(build_upsert_statement(columns, source)).all()
+
+    try:
+        with conn.begin_nested():
+            return merge(None), 0
+    except Exception as e:
+        if not _is_data_error(e):
+            raise
+
+    def quarantine_staged(met_object_id, error):
+        for row in conn.execute(
+            select(*(staged[name] for name in columns)).where(staged.met_object_id == met_object_id)
+        ).mappings():
+            quarantine(dict(row), error)
+
+    # Bisect over the sorted staged IDs: each half is a contiguous ID range
+    ids = conn.execute(select(staged.met_object_id).distinct().order_by(staged.met_object_id)).scalars().all()
+    results = write_isolating_failures(
+        conn, ids, lambda id_range: merge((id_range[0], id_range[-1])), quarantine_staged
+    )
+    _print_failures(failures, "Merge")
+    return [row for result in results for row in result], len(failures)
+
+
+def _count_merged(stats, rows, merge_failed):
+    """Add the outcome of a merge of stats['staged'] records to the statistics."""
+    inserted = sum(1 for _, is_new in rows if is_new)
+    stats['inserted'] = inserted
+    stats['updated'] = len(rows) - inserted
+    stats['unchanged'] = stats['staged'] - len(rows) - merge_failed
+    stats['changed_ids'] = [met_object_id for met_object_id, _ in rows]
+
+
+def prepare_copy_rows(df, stats, now=None):
+    """
+    Prepare a cleaned DataFrame for COPY (see prepare_records and encode_copy_rows).
+
+    Returns:
+        tuple: (column names, rows); no columns if no row could be prepared
+    """
+    records = prepare_records(df, stats, now)
+    columns = list(records[0].keys()) if records else []
+    return columns, encode_copy_rows(records, columns)
+
+
+def begin_staged_load(conn):
+    """Create artworks_staging if needed and lock it for the rest of the load's transaction."""
+    artworks_staging.create(conn, checkfirst=True)
+    conn.execute(text(f"LOCK TABLE {artworks_staging.name} IN ACCESS EXCLUSIVE MODE"))
+
+
+def finish_staged_load(conn, columns, stats, log=print, run_id=None):
+    """
+    Merge the staged rows into artworks and truncate artworks_staging.
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection in the load's transaction
+        columns (list): Staged column names
+        stats (dict): Statistics dictionary to update, with a 'staged' count
+        log (callable, optional): Progress output function. Defaults to print.
+        run_id (int, optional): Sync run to record quarantined records under
+    """
+    if stats['staged'] == 0:
+        log("No data to load")
+        return
+
+    log(f"\nStep 2: Merging {stats['staged']} staged records into artworks...")
+    _count_merged(stats, *_merge_staged(conn, columns, stats, run_id))
+
+    log("\nStep 3: Truncating the staging table and committing...")
+    conn.execute(text(f"TRUNCATE {artworks_staging.name}"))
+
+
+def load_staged_batches(conn, batches, stats, log=print, run_id=None):
+    """
+    Copy batches into artworks_staging, merge them into artworks, and truncate it.
+
+    Runs in the caller's transaction, which should commit or roll back the
+    whole load (see bulk_load_to_database).
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection in the load's transaction
+        batches (iterable): Cleaned artwork DataFrames
+        stats (dict): Statistics dictionary to update, with a 'staged' count
+        log (callable, optional): Progress output function. Defaults to print.
+        run_id (int, optional): Sync run to record quarantined records under
+    """
+    begin_staged_load(conn)
+
+    log("\nStep 1: Copying records into the staging table...")
+    now = datetime.utcnow()
+    columns = None
+    for batch_num, df in enumerate(batches, 1):
+        batch_columns, rows = prepare_copy_rows(df, stats, now)
+        quarantine_unprepared(conn, stats, run_id)
+        if not rows:
+            continue
+        columns = columns or batch_columns
+        staged = stage_rows(conn, rows, columns, stats, run_id, f"Batch {batch_num}")
+        log(f"  ✓ Copied batch {batch_num}: {staged} records ({stats['staged']} staged)")
+
+    finish_staged_load(conn, columns, stats, log, run_id)
+
+
+def bulk_load_to_database(batches, verbose=True, run_id=None):
+    """
+    Load artwork data into PostgreSQL with COPY, for initial loads and full re-syncs.
+
+    Each cleaned batch is streamed with COPY FROM STDIN into the unlogged
+    artworks_staging table, then all staged rows are merged into artworks
+    with one INSERT ... SELECT ... ON CONFLICT DO UPDATE (same rules as
+    save_to_database: unchanged artworks are not written), and the staging
+    table is truncated. All of it runs in one transaction that holds an
+    exclusive lock on the staging table, so concurrent loads run one after
+    the other, and a failed load leaves artworks untouched.
+
+    Records the database rejects do not fail the load: each COPY and the
+    merge run in a SAVEPOINT, and on a data error are retried on halves
+    (of the batch, or of the staged met_object_id range) down to the
+    failing records, which are quarantined in sync_dead_letters.
+
+    Args:
+        batches (pandas.DataFrame or iterable): Cleaned artwork data, as one
+            DataFrame or an iterable of DataFrames
+        verbose (bool, optional): Print progress. Defaults to True. Errors are always printed.
+        run_id (int, optional): Sync run to record quarantined records under
+
+    Returns:
+        dict: Statistics about the load (inserted, updated, unchanged, errors, staged),
+              plus changed_ids, the MET object IDs that were inserted or updated,
+              and failed_ids, the MET object IDs of the quarantined records
+    """
+    log = print if verbose else _quiet
+
+    log("\n" + "="*60)
+    log("BULK LOADING DATA INTO DATABASE")
+    log("="*60)
+
+    if isinstance(batches, pd.DataFrame):
+        batches = [batches]
+    stats = dict(_new_save_stats(), staged=0)
+
+    try:
+        with engine.begin() as conn:
+            load_staged_batches(conn, batches, stats, log, run_id)
+
+        log(f"\n{'='*60}")
+        log("BULK LOAD COMPLETE")
+        log("="*60)
+        log(f"Inserted: {stats['inserted']} artworks")
+        log(f"Updated: {stats['updated']} artworks")
+        log(f"Unchanged: {stats['unchanged']} artworks")
+        log(f"Errors: {stats['errors']} artworks")
+
+        return stats
+
+    except Exception as e:
+        print(f"\n✗ Failed to bulk load into database: {e}")
+        import traceback
+        traceback.print_exc()
+        stats.update(inserted=0, updated=0, unchanged=0, changed_ids=[], failed_ids=[])
+        stats['errors'] += stats['staged']
+        return stats
+
+
+def split_by_id_range(records, partitions):
+    """
+    Split records into contiguous met_object_id ranges of about the same size.
+
+    Args:
+        records (list): Records sorted by met_object_id
+        partitions (int): Maximum number of ranges
+
+    Returns:
+        list: Non-empty lists of records; records with the same ID share a range
+    """
+    cuts = [0]
+    for part in range(1, partitions):
+        cut = max(len(records) * part // partitions, cuts[-1])
+        while 0 < cut < len(records) and records[cut]['met_object_id'] == records[cut - 1]['met_object_id']:
+            cut += 1
+        cuts.append(cut)
+    cuts.append(len(records))
+    return [records[start:end] for start, end in zip(cuts, cuts[1:]) if end > start]
+
+
+def _write_partition(worker, records, bulk_load=False, run_id=None):
+    """
+    Write one ID range on its own pooled connection and transaction.
+
+    Returns:
+        dict: Save statistics of the range, plus the worker's id range, record count and seconds
+    """
+    stats = dict(_new_save_stats(), staged=0)
+    start = time.perf_counter()
+    try:
+        if bulk_load:
+            with engine.begin() as conn:
+                artworks_staging_temp.create(conn)
+                columns = list(records[0].keys())
+                stage_rows(
+                    conn, encode_copy_rows(records, columns), columns, stats, run_id,
+                    f"Worker {worker}", artworks_staging_temp
+                )
+                _count_merged(stats, *_merge_staged(conn, columns, stats, run_id, artworks_staging_temp))
+        else:
+            with get_db_session() as db:
+                upsert_records(db, records, stats, False, run_id)
+    except Exception as e:
+        print(f"  ✗ Worker {worker} failed to write artworks "
+              f"{records[0]['met_object_id']}-{records[-1]['met_object_id']}: {e}")
+        stats.update(inserted=0, updated=0, unchanged=0, errors=len(records), changed_ids=[], failed_ids=[])
+
+    stats.update(
+        worker=worker,
+        first_id=records[0]['met_object_id'],
+        last_id=records[-1]['met_object_id'],
+        records=len(records),
+        seconds=time.perf_counter() - start,
+    )
+    return stats
+
+
+def save_to_database_parallel(df, verbose=True, run_id=None, workers=WRITE_WORKERS, bulk_load=False):
+    """
+    Save artwork data over several pooled connections, one met_object_id range each.
+
+    Records are prepared once, sorted by met_object_id and split into
+    `workers` contiguous ID ranges, which are written concurrently by
+    worker threads, each on its own connection and transaction, so the
+    database runs them in as many backend processes. Each worker writes
+    like save_to_database, or with bulk_load, like bulk_load_to_database
+    but through its own temporary staging table, so parallel loads do not
+    wait on the shared staging table's lock.
+
+    Ranges never overlap and every worker writes in ascending ID order,
+    so workers (and concurrent writers that also write in ID order) take
+    row locks in the same order and cannot deadlock. A worker that fails
+    rolls back its own range only, which is then counted as errors.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing cleaned artwork data
+        verbose (bool, optional): Print progress. Defaults to True. Errors are always printed.
+        run_id (int, optional): Sync run to record quarantined records under
+        workers (int, optional): Concurrent connections; keep within the engine's
+            pool_size + max_overflow. Defaults to WRITE_WORKERS.
+        bulk_load (bool, optional): Write each range with COPY and one merge instead of
+            upsert statements. Defaults to False.
+
+    Returns:
+        dict: Statistics about the save operation (inserted, updated, unchanged, errors),
+              plus changed_ids, failed_ids, and workers, the statistics of each worker
+              (id range, records, inserted, updated, unchanged, errors, seconds)
+    """
+    log = print if verbose else _quiet
+
+    log("\n" + "="*60)
+    log(f"SAVING DATA TO DATABASE ({workers} workers{', COPY' if bulk_load else ''})")
+    log("="*60)
+
+    stats = dict(_new_save_stats(), workers=[])
+
+    if len(df) == 0:
+        log("No data to save")
         return stats
 
+    log("\nStep 1: Preparing data for database...")
+    records = prepare_records(df, stats)
+    if stats.get('unprepared'):
+        try:
+            with get_db_session() as db:
+                quarantine_unprepared(db, stats, run_id)
+        except Exception as e:
+            print(f"  ✗ Failed to quarantine {len(stats.pop('unprepared'))} unprepared rows: {e}")
+    records.sort(key=lambda record: record['met_object_id'])
+    partitions = split_by_id_range(records, workers)
+    log(f"  Prepared {len(records)} records in {len(partitions)} ID ranges")
+
+    if partitions:
+        log(f"\nStep 2: Writing {len(records)} artworks with {len(partitions)} workers...")
+        with ThreadPoolExecutor(max_workers=len(partitions)) as executor:
+            worker_stats = list(executor.map(
+                _write_partition, range(1, len(partitions) + 1), partitions,
+                [bulk_load] * len(partitions), [run_id] * len(partitions)
+            ))
+
+        for worker in worker_stats:
+            for key in ('inserted', 'updated', 'unchanged', 'errors'):
+                stats[key] += worker[key]
+            stats['changed_ids'].extend(worker.pop('changed_ids'))
+            stats['failed_ids'].extend(worker.pop('failed_ids'))
+            stats['workers'].append(worker)
+            log(f"  {'✓' if worker['errors'] == 0 else '✗'} Worker {worker['worker']} "
+                f"(artworks {worker['first_id']}-{worker['last_id']}): {worker['records']} records, "
+                f"{worker['inserted']} inserted, {worker['updated']} updated, {worker['unchanged']} unchanged, "
+                f"{worker['errors']} errors in {worker['seconds']:.2f}s")
+
+    log(f"\n{'='*60}")
+    log("DATABASE SAVE COMPLETE")
+    log("="*60)
+    log(f"Inserted: {stats['inserted']} artworks")
+    log(f"Updated: {stats['updated']} artworks")
+    log(f"Unchanged: {stats['unchanged']} artworks")
+    log(f"Errors: {stats['errors']} artworks")
+    log(f"Total processed: {stats['inserted'] + stats['updated']} artworks")
+
+    return stats
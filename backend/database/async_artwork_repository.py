@@ -0,0 +1,167 @@
+"""
+Async database repository for artwork operations.
+
+Async versions of the artwork repository operations, on the asyncpg
+engine, so database writes can run on the same event loop as the async
+MET API fetcher instead of in worker threads. The upsert and bulk load
+logic is shared with database.artwork_repository through
+AsyncSession.run_sync / AsyncConnection.run_sync, which run it on an
+asyncpg connection while yielding to the event loop on every round trip.
+"""
+import asyncio
+from datetime import datetime
+
+import pandas as pd
+
+from database.artwork_repository import (
+    _new_save_stats, _quiet, begin_staged_load, existing_ids_query, finish_staged_load, prepare_copy_rows,
+    prepare_records, quarantine_unprepared, stage_rows, upsert_records
+)
+from database.database import async_engine, get_async_db_session
+
+
+async def get_existing_object_ids_async(met_object_ids):
+    """
+    Look up which MET object IDs are already stored, removed artworks included.
+
+    Args:
+        met_object_ids (iterable): MET object IDs to look up
+
+    Returns:
+        set: The IDs that exist in artworks
+    """
+    async with get_async_db_session() as db:
+        return set((await db.execute(existing_ids_query(met_object_ids))).scalars())
+
+
+async def save_to_database_async(df, verbose=True, run_id=None):
+    """
+    Save artwork data from DataFrame to PostgreSQL with a native upsert, through asyncpg.
+
+    Same writes and statistics as artwork_repository.save_to_database.
+    Records are prepared in a worker thread, so the event loop keeps
+    running while the DataFrame is converted.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing cleaned artwork data
+        verbose (bool, optional): Print progress. Defaults to True. Errors are always printed.
+        run_id (int, optional): Sync run to record quarantined records under
+
+    Returns:
+        dict: Statistics about the save operation (inserted, updated, unchanged, errors),
+              plus changed_ids, the MET object IDs that were inserted or updated,
+              and failed_ids, the MET object IDs of the quarantined records
+    """
+    log = print if verbose else _quiet
+
+    log("\n" + "="*60)
+    log("SAVING DATA TO DATABASE (asyncpg)")
+    log("="*60)
+
+    stats = _new_save_stats()
+
+    if len(df) == 0:
+        log("No data to save")
+        return stats
+
+    try:
+        log("\nStep 1: Preparing data for database...")
+        records = await asyncio.to_thread(prepare_records, df, stats)
+        log(f"  Prepared {len(records)} records")
+
+        async with get_async_db_session() as db:
+            await db.run_sync(quarantine_unprepared, stats, run_id)
+            if records:
+                log(f"\nStep 2: Upserting {len(records)} artworks...")
+                await db.run_sync(upsert_records, records, stats, verbose, run_id)
+
+            log("\nStep 3: Committing changes to database...")
+        log("  ✓ All changes committed successfully")
+
+        log(f"\n{'='*60}")
+        log("DATABASE SAVE COMPLETE")
+        log("="*60)
+        log(f"Inserted: {stats['inserted']} artworks")
+        log(f"Updated: {stats['updated']} artworks")
+        log(f"Unchanged: {stats['unchanged']} artworks")
+        log(f"Errors: {stats['errors']} artworks")
+        log(f"Total processed: {stats['inserted'] + stats['updated']} artworks")
+
+        return stats
+
+    except Exception as e:
+        print(f"\n✗ Failed to save to database: {e}")
+        import traceback
+        traceback.print_exc()
+        stats['errors'] = len(df)
+        stats['changed_ids'] = []
+        stats['failed_ids'] = []
+        return stats
+
+
+async def bulk_load_to_database_async(batches, verbose=True, run_id=None):
+    """
+    Load artwork data into PostgreSQL with COPY, through asyncpg.
+
+    Same load as artwork_repository.bulk_load_to_database, in one
+    transaction; batches are copied into the staging table with asyncpg's
+    binary COPY (copy_records_to_table). Each batch is prepared and
+    encoded in a worker thread, so only database round trips run on the
+    event loop.
+
+    Args:
+        batches (pandas.DataFrame or iterable): Cleaned artwork data, as one
+            DataFrame or an iterable of DataFrames
+        verbose (bool, optional): Print progress. Defaults to True. Errors are always printed.
+        run_id (int, optional): Sync run to record quarantined records under
+
+    Returns:
+        dict: Statistics about the load (inserted, updated, unchanged, errors, staged),
+              plus changed_ids, the MET object IDs that were inserted or updated,
+              and failed_ids, the MET object IDs of the quarantined records
+    """
+    log = print if verbose else _quiet
+
+    log("\n" + "="*60)
+    log("BULK LOADING DATA INTO DATABASE (asyncpg)")
+    log("="*60)
+
+    if isinstance(batches, pd.DataFrame):
+        batches = [batches]
+    stats = dict(_new_save_stats(), staged=0)
+
+    try:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(begin_staged_load)
+
+            log("\nStep 1: Copying records into the staging table...")
+            now = datetime.utcnow()
+            columns = None
+            for batch_num, df in enumerate(batches, 1):
+                batch_columns, rows = await asyncio.to_thread(prepare_copy_rows, df, stats, now)
+                await conn.run_sync(quarantine_unprepared, stats, run_id)
+                if not rows:
+                    continue
+                columns = columns or batch_columns
+                staged = await conn.run_sync(stage_rows, rows, columns, stats, run_id, f"Batch {batch_num}")
+                log(f"  ✓ Copied batch {batch_num}: {staged} records ({stats['staged']} staged)")
+
+            await conn.run_sync(finish_staged_load, columns, stats, log, run_id)
+
+        log(f"\n{'='*60}")
+        log("BULK LOAD COMPLETE")
+        log("="*60)
+        log(f"Inserted: {stats['inserted']} artworks")
+        log(f"Updated: {stats['updated']} artworks")
+        log(f"Unchanged: {stats['unchanged']} artworks")
+        log(f"Errors: {stats['errors']} artworks")
+
+        return stats
+
+    except Exception as e:
+        print(f"\n✗ Failed to bulk load into database: {e}")
+        import traceback
+        traceback.print_exc()
+        stats.update(inserted=0, updated=0, unchanged=0, changed_ids=[], failed_ids=[])
+        stats['errors'] += stats['staged']
+        return stats
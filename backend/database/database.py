@@ -1,9 +1,13 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.sql import column as sql_column, table as sql_table
 from sqlalchemy.orm import sessionmaker, scoped_session
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+import io
 import os
 from dotenv import load_dotenv
 from database.models import Base
@@ -33,6 +37,23 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Thread-safe session
 ScopedSession = scoped_session(SessionLocal)
 
+# Same database through asyncpg, for writes on the event loop of the async fetcher
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername='postgresql+asyncpg')
+
+# Async engine with the same pooling as the sync one. Its connections belong
+# to the event loop that opened them: call `await async_engine.dispose()`
+# before that loop closes (e.g. at the end of an asyncio.run())
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    echo=False,
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db():
     """
@@ -80,6 +101,50 @@ def get_db_session():
         db.close()
 
 
+@asynccontextmanager
+async def get_async_db_session():
+    """
+    Async context manager for database sessions on the asyncpg engine
+    Automatically handles commit/rollback and closing
+
+    Example:
+        async with get_async_db_session() as db:
+            result = await db.execute(select(Artwork).limit(10))
+            # automatically commits when exiting the context
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise e
+
+
+def create_id_table(db, name, ids):
+    """
+    Load IDs into a temporary table to join against, instead of a long IN-list
+
+    The table has one column, met_object_id, with a primary key, and is
+    dropped at the end of the transaction. IDs are sent with COPY and the
+    table is analyzed, so the planner knows its size
+
+    Args:
+        db: Database session
+        name (str): Table name
+        ids (iterable): Integer IDs; duplicates are ignored
+
+    Returns:
+        TableClause: The table, for use in queries
+    """
+    db.execute(text(f"CREATE TEMPORARY TABLE {name} (met_object_id integer PRIMARY KEY) ON COMMIT DROP"))
+    buffer = io.StringIO("".join(f"{met_id}\n" for met_id in {int(met_id) for met_id in ids}))
+    with db.connection().connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {name} (met_object_id) FROM STDIN", buffer)
+    db.execute(text(f"ANALYZE {name}"))
+    return sql_table(name, sql_column('met_object_id'))
+
+
 def init_db():
     """
     Initialize the database
@@ -90,9 +155,49 @@ def init_db():
     """
 
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
     print("✓ Database tables created successfully!")
 
 
+def add_missing_columns():
+    """
+    Add columns that exist on the models but not in the database yet
+    create_all() never alters existing tables, so this covers additive
+    column changes until Alembic migrations are set up. Only nullable
+    columns and NOT NULL columns with a server default can be added;
+    existing rows get the server default
+
+    Returns:
+        list: Names of the columns that were added, as "table.column"
+    """
+    inspector = inspect(engine)
+    ddl_compiler = engine.dialect.ddl_compiler(engine.dialect, None)
+    added = []
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or (not column.nullable and column.server_default is None):
+                    continue
+                column_spec = column.type.compile(dialect=engine.dialect)
+                if column.server_default is not None:
+                    column_spec += f' DEFAULT {ddl_compiler.get_column_default_string(column)}'
+                if not column.nullable:
+                    column_spec += ' NOT NULL'
+                conn.execute(text(
+                    f'ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {column.name} {column_spec}'
+                ))
+                added.append(f"{table.name}.{column.name}")
+
+    for name in added:
+        print(f"  + Added column {name}")
+    return added
+
+
 def drop_all_tables():
     """
     Drop all tables - USE WITH CAUTION!
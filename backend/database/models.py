@@ -3,7 +3,7 @@ SQLAlchemy models for the MET Museum artwork database
 """
 from sqlalchemy import (
     Column, Integer, String, Boolean, Text, DateTime, ForeignKey,
-    Index, UniqueConstraint
+    Index, MetaData, Table, UniqueConstraint
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
@@ -63,10 +63,14 @@ class Artwork(Base):
     # Structured data (stored as JSON)
     constituents = Column(JSONB, nullable=True)
 
+    # Change detection
+    content_hash = Column(String(64), nullable=True)  # sha256 of the normalized synced fields
+
     # Timestamps
     synced_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    removed_at = Column(DateTime, nullable=True)  # Set when the object disappears from the MET API
 
     # Relationship to generated content
     generated_contents = relationship("GeneratedContent", back_populates="artwork", cascade="all, delete-orphan")
@@ -110,9 +114,115 @@ class GeneratedContent(Base):
         return f"<GeneratedContent(id={self.id}, artwork_id={self.artwork_id}, qa_status='{self.qa_status}')>"
 
 
+class SyncRun(Base):
+    """
+    Ledger of MET API sync runs
+    The high-water mark of the last completed run is where the next incremental sync starts
+    """
+    __tablename__ = 'sync_runs'
+
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Run configuration
+    mode = Column(String(20), nullable=False)  # full/incremental
+    since = Column(DateTime, nullable=True)  # metadataDate filter used by an incremental run
+
+    # Outcome
+    status = Column(String(30), nullable=False, default='running')  # running/completed/completed_with_errors/failed
+    high_water_mark = Column(DateTime, nullable=True)  # Start time of the run; next run fetches changes after it
+    objects_fetched = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    unchanged = Column(Integer, nullable=False, default=0, server_default='0')  # Matched artworks whose content hash was unchanged
+    removed = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Relationship to per-object checkpoints
+    checkpoints = relationship("SyncCheckpoint", back_populates="sync_run", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<SyncRun(id={self.id}, mode='{self.mode}', status='{self.status}')>"
+
+
+class SyncCheckpoint(Base):
+    """
+    Durable per-object progress of a sync run
+    Lets an interrupted run resume without repeating completed work
+    """
+    __tablename__ = 'sync_checkpoints'
+
+    # Composite primary key: one row per object per run
+    run_id = Column(Integer, ForeignKey('sync_runs.id', ondelete='CASCADE'), primary_key=True)
+    met_object_id = Column(Integer, primary_key=True)
+
+    # Furthest stage reached
+    stage = Column(String(20), nullable=False)  # fetched/cleaned/persisted
+
+    # Timestamps
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Relationship to sync run
+    sync_run = relationship("SyncRun", back_populates="checkpoints")
+
+    def __repr__(self):
+        return f"<SyncCheckpoint(run_id={self.run_id}, met_id={self.met_object_id}, stage='{self.stage}')>"
+
+
+class SyncDeadLetter(Base):
+    """
+    Artwork records that could not be written during a sync
+    Failing rows are isolated from their batch and kept here with the error, for inspection and replay
+    """
+    __tablename__ = 'sync_dead_letters'
+
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Origin
+    run_id = Column(Integer, ForeignKey('sync_runs.id', ondelete='SET NULL'), nullable=True)
+    met_object_id = Column(Integer, nullable=True)
+    stage = Column(String(20), nullable=False)  # prepare/upsert/copy/merge
+
+    # Failure
+    error = Column(Text, nullable=False)
+    record = Column(JSONB, nullable=True)  # The record as it was sent to the database
+
+    # Timestamps
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SyncDeadLetter(id={self.id}, met_id={self.met_object_id}, stage='{self.stage}')>"
+
+
+# Unlogged staging table for COPY-based bulk loads of artworks
+# Same columns as artworks, minus the primary key, without constraints or indexes
+artworks_staging = Table(
+    'artworks_staging', Base.metadata,
+    *(Column(column.name, column.type) for column in Artwork.__table__.columns if column.name != 'id'),
+    prefixes=['UNLOGGED'],
+)
+
+# Per-connection staging table for parallel bulk loads, dropped at commit
+# Kept out of Base.metadata, so create_all() never creates it
+artworks_staging_temp = Table(
+    'artworks_staging_temp', MetaData(),
+    *(Column(column.name, column.type) for column in artworks_staging.columns),
+    prefixes=['TEMPORARY'],
+    postgresql_on_commit='DROP',
+)
+
+
 # Additional indexes for performance
 Index('idx_artwork_department', Artwork.department)
 Index('idx_artwork_artist_name', Artwork.artist_display_name)
 Index('idx_artwork_is_public_domain', Artwork.is_public_domain)
 Index('idx_generated_content_artwork_id', GeneratedContent.artwork_id)
-Index('idx_generated_content_qa_status', GeneratedContent.qa_status)
\ No newline at end of file
+Index('idx_generated_content_qa_status', GeneratedContent.qa_status)
+Index('idx_sync_run_status_started', SyncRun.status, SyncRun.started_at)
+Index('idx_sync_dead_letter_run_id', SyncDeadLetter.run_id)
+Index('idx_sync_checkpoint_run_stage', SyncCheckpoint.run_id, SyncCheckpoint.stage)
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Database repository for sync run bookkeeping.
+
+This module records sync runs in the sync_runs ledger, provides the
+high-water mark for incremental syncs, keeps per-object checkpoints so
+an interrupted run can resume, and marks artworks that have disappeared
+from the MET API.
+"""
+from datetime import datetime
+from sqlalchemy import exists, update
+from sqlalchemy.dialects.postgresql import insert
+from database.database import create_id_table, get_db_session
+from database.models import Artwork, SyncCheckpoint, SyncRun
+
+CHECKPOINT_STAGES = ('fetched', 'cleaned', 'persisted')
+
+
+def start_sync_run(mode, since=None):
+    """
+    Record the start of a sync run.
+
+    The run's start time becomes its high-water mark, so objects changed
+    while the run is in progress are picked up again by the next run.
+
+    Args:
+        mode (str): 'full' or 'incremental'
+        since (datetime, optional): metadataDate filter used by an incremental run
+
+    Returns:
+        int: ID of the new sync run
+    """
+    with get_db_session() as db:
+        now = datetime.utcnow()
+        run = SyncRun(mode=mode, since=since, status='running', started_at=now, high_water_mark=now)
+        db.add(run)
+        db.flush()
+        return run.id
+
+
+def finish_sync_run(run_id, status, stats=None):
+    """
+    Record the outcome of a sync run.
+
+    Counts are added to the run's existing counts, so a resumed run ends
+    up with the totals of all its attempts. The checkpoints of a completed
+    run are deleted, as it will never be resumed.
+
+    Args:
+        run_id (int): ID of the sync run
+        status (str): 'completed', 'completed_with_errors', or 'failed'
+        stats (dict, optional): Pipeline statistics with fetched/inserted/updated/
+            unchanged/removed/errors counts
+    """
+    stats = stats or {}
+    with get_db_session() as db:
+        run = db.get(SyncRun, run_id)
+        run.status = status
+        run.finished_at = datetime.utcnow()
+        run.objects_fetched = (run.objects_fetched or 0) + stats.get('fetched', 0)
+        run.inserted = (run.inserted or 0) + stats.get('inserted', 0)
+        run.updated = (run.updated or 0) + stats.get('updated', 0)
+        run.unchanged = (run.unchanged or 0) + stats.get('unchanged', 0)
+        run.removed = (run.removed or 0) + stats.get('removed_artworks', 0)
+        run.errors = (run.errors or 0) + stats.get('errors', 0)
+
+        if status == 'completed':
+            db.query(SyncCheckpoint).filter(SyncCheckpoint.run_id == run_id).delete(
+                synchronize_session=False
+            )
+
+
+def get_resumable_run():
+    """
+    Get the most recent sync run if it did not finish.
+
+    A run is resumable if it failed or is still marked as running (the
+    process was killed). Once a later run has finished, older unfinished
+    runs are no longer resumable.
+
+    Returns:
+        dict: id, mode, and since of the run, or None if there is nothing to resume
+    """
+    with get_db_session() as db:
+        run = db.query(SyncRun).order_by(SyncRun.started_at.desc()).first()
+        if run is None or run.status not in ('running', 'failed'):
+            return None
+        return {'id': run.id, 'mode': run.mode, 'since': run.since}
+
+
+def reopen_sync_run(run_id):
+    """
+    Mark an unfinished sync run as running again before resuming it.
+
+    Args:
+        run_id (int): ID of the sync run
+    """
+    with get_db_session() as db:
+        run = db.get(SyncRun, run_id)
+        run.status = 'running'
+        run.finished_at = None
+
+
+def record_checkpoints(run_id, met_object_ids, stage):
+    """
+    Record that a batch of objects reached a pipeline stage.
+
+    Uses a single INSERT ... ON CONFLICT DO UPDATE per call, so the
+    pipeline writes one statement per micro-batch rather than per object.
+
+    Args:
+        run_id (int): ID of the sync run
+        met_object_ids (iterable): MET object IDs of the batch
+        stage (str): 'fetched', 'cleaned', or 'persisted'
+    """
+    if stage not in CHECKPOINT_STAGES:
+        raise ValueError(f"Unknown checkpoint stage '{stage}', expected one of {CHECKPOINT_STAGES}")
+
+    now = datetime.utcnow()
+    rows = [
+        {'run_id': run_id, 'met_object_id': int(met_id), 'stage': stage, 'updated_at': now}
+        for met_id in set(met_object_ids)
+    ]
+    if not rows:
+        return
+
+    stmt = insert(SyncCheckpoint).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SyncCheckpoint.run_id, SyncCheckpoint.met_object_id],
+        set_={'stage': stmt.excluded.stage, 'updated_at': stmt.excluded.updated_at},
+    )
+    with get_db_session() as db:
+        db.execute(stmt)
+
+
+def get_persisted_object_ids(run_id):
+    """
+    Get the objects a sync run has already written to the database.
+
+    Args:
+        run_id (int): ID of the sync run
+
+    Returns:
+        set: MET object IDs checkpointed as persisted
+    """
+    with get_db_session() as db:
+        return {
+            met_id for (met_id,) in
+            db.query(SyncCheckpoint.met_object_id)
+            .filter(SyncCheckpoint.run_id == run_id, SyncCheckpoint.stage == 'persisted')
+            .all()
+        }
+
+
+def get_last_high_water_mark():
+    """
+    Get the high-water mark of the most recent completed sync run.
+
+    Runs that completed with errors are ignored, so objects they failed
+    on are fetched again by the next incremental run.
+
+    Returns:
+        datetime: High-water mark, or None if no run has completed yet
+    """
+    with get_db_session() as db:
+        run = (
+            db.query(SyncRun)
+            .filter(SyncRun.status == 'completed')
+            .order_by(SyncRun.started_at.desc())
+            .first()
+        )
+        return run.high_water_mark if run else None
+
+
+def mark_removed_artworks(current_ids):
+    """
+    Mark artworks that are no longer listed by the MET API as removed.
+
+    Artworks are never deleted (generated content may reference them);
+    their removed_at timestamp is set instead. An artwork that reappears
+    is un-marked when it is synced again.
+
+    The listed IDs are loaded into a temporary table, and artworks without
+    a match are marked in one UPDATE with an anti-join, so neither side's
+    IDs are compared in Python or sent as an IN-list.
+
+    Args:
+        current_ids (iterable): All object IDs currently listed by the MET API
+
+    Returns:
+        int: Number of artworks newly marked as removed
+    """
+    current_ids = set(current_ids)
+    if not current_ids:
+        print("  ⚠ Empty object ID list from the API - skipping removal detection")
+        return 0
+
+    with get_db_session() as db:
+        listed = create_id_table(db, 'listed_object_ids', current_ids)
+        result = db.execute(
+            update(Artwork)
+            .where(Artwork.removed_at.is_(None))
+            .where(~exists().where(listed.c.met_object_id == Artwork.met_object_id))
+            .values(removed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
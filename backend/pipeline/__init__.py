@@ -0,0 +1,3 @@
+"""
+Streaming sync pipeline module
+"""
@@ -0,0 +1,250 @@
+"""
+Multi-process sharded sync.
+
+A single event loop does all JSON decoding, field extraction, and
+DataFrame work on one core. In sharded mode the object ID work set of a
+run is split across worker processes; each one runs its own event loop,
+HTTP session, and streaming pipeline (fetch, clean, write), so CPU-bound
+work scales across cores.
+
+All shards draw tokens from one SharedTokenBucket, so their combined
+request rate stays within the MET API budget and a 429 seen by any shard
+slows down all of them. The in-flight cap applies per shard.
+"""
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+from collections import Counter
+
+import api.met_client as met_client
+from api.cache import ResponseCache
+from api.rate_limiter import RateLimiter
+from api.retry import RetryStats
+from api.telemetry import FetchTelemetry
+from api.transport import create_session, install_uvloop
+from data.cleaning_report import CleaningReport
+from pipeline.sync_pipeline import BATCH_SIZE, QUEUE_SIZE, _new_stats, stream_sync
+
+SHARD_POLL_INTERVAL = 0.5
+
+
+def split_shards(object_ids, shards):
+    """
+    Split object IDs into interleaved shards of (almost) equal size.
+
+    Args:
+        object_ids (list): Object IDs to sync
+        shards (int): Number of shards
+
+    Returns:
+        list: One list of object IDs per shard
+    """
+    return [object_ids[index::shards] for index in range(shards)]
+
+
+def _limiter_settings(rate_limiter):
+    """Get the settings needed to rebuild a limiter around a shared bucket in a shard."""
+    return {
+        'max_concurrent': rate_limiter.max_concurrent,
+        'min_rate': rate_limiter.min_rate,
+        'max_rate': rate_limiter.max_rate,
+        'increase_step': rate_limiter.increase_step,
+        'increase_ratio': rate_limiter.increase_ratio,
+        'decrease_factor': rate_limiter.decrease_factor,
+        'latency_target': rate_limiter.latency_target,
+        'cooldown': rate_limiter.cooldown,
+        'error_window': rate_limiter.error_window,
+        'error_threshold': rate_limiter.error_threshold,
+    }
+
+
+def shard_sidecar_path(path, index):
+    """Get the cleaning violations file of one shard, e.g. violations.shard0.ndjson."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.shard{index}{extension}"
+
+
+async def _sync_shard(index, object_ids, settings, bucket):
+    """Run the streaming pipeline over one shard's object IDs."""
+    met_client.BASE_URL = settings['base_url']
+    rate_limiter = RateLimiter(rate=bucket.rate, bucket=bucket, **settings['limiter'])
+    retry_stats = RetryStats()
+    telemetry = FetchTelemetry()
+    stats = _new_stats()
+    if settings['sidecar_path'] is not None:
+        stats['cleaning'] = CleaningReport(sidecar_path=shard_sidecar_path(settings['sidecar_path'], index))
+    cache = ResponseCache(**settings['cache']) if settings['cache'] is not None else None
+
+    try:
+        async with create_session(settings['transport_config']) as session:
+            stats = await stream_sync(
+                session, object_ids, rate_limiter, settings['retry_policy'], retry_stats, cache,
+                workers=settings['workers'], batch_size=settings['batch_size'],
+                queue_size=settings['queue_size'], run_id=settings['run_id'], stats=stats,
+                telemetry=telemetry, bulk_load=settings['bulk_load'],
+                async_writes=settings['async_writes'], write_workers=settings['write_workers']
+            )
+    finally:
+        cache_stats = cache.stats() if cache is not None else None
+        if cache is not None:
+            cache.close()
+
+    return stats, retry_stats, rate_limiter.stats(), cache_stats, telemetry
+
+
+def _run_shard(index, object_ids, settings, bucket, results):
+    """
+    Entry point of a shard process.
+
+    Puts (index, 'ok', (stats, retry_stats, limiter_stats, cache_stats, telemetry)) or
+    (index, 'error', traceback) on the results queue.
+    """
+    try:
+        transport_config = settings['transport_config']
+        if transport_config is not None and transport_config.use_uvloop:
+            install_uvloop()
+        outcome = asyncio.run(_sync_shard(index, object_ids, settings, bucket))
+        results.put((index, 'ok', outcome))
+    except BaseException:
+        results.put((index, 'error', traceback.format_exc()))
+
+
+def _merge_pipeline_stats(total, shard):
+    """Add one shard's pipeline statistics to the run totals."""
+    for key, value in shard.items():
+        if isinstance(value, Counter):
+            total[key].update(value)
+        elif isinstance(value, CleaningReport):
+            total[key].merge(value)
+        elif key.endswith('_seconds'):
+            total[key] = max(total[key], value)
+        else:
+            total[key] += value
+
+
+def _merge_cache_stats(cache, cache_stats):
+    """Add one shard's cache counters to the parent's cache."""
+    cache.hits += cache_stats['hits']
+    cache.revalidated += cache_stats['revalidated']
+    cache.misses += cache_stats['misses']
+    cache.stores += cache_stats['stores']
+    cache.evictions += cache_stats['evictions']
+
+
+async def run_shards(object_ids, shards, rate_limiter, stats, retry_policy=None, retry_stats=None,
+                     cache=None, transport_config=None, workers=met_client.FETCH_WORKERS,
+                     batch_size=BATCH_SIZE, queue_size=QUEUE_SIZE, run_id=None, telemetry=None,
+                     bulk_load=False, async_writes=False, write_workers=1):
+    """
+    Sync object IDs across several processes, each running stream_sync.
+
+    Shard processes are started with the 'spawn' method. If any shard
+    fails, the others are terminated and a RuntimeError is raised; the
+    objects already written are checkpointed, so the run can be resumed.
+
+    Args:
+        object_ids (list): MET object IDs to sync
+        shards (int): Number of worker processes
+        rate_limiter (RateLimiter): Parent limiter; must use a SharedTokenBucket
+            (see create_shared_bucket), whose settings each shard copies
+        stats (dict): Pipeline statistics to add the shard statistics to. If its
+            cleaning report has a sidecar file, each shard writes its violations
+            to its own file next to it (see shard_sidecar_path).
+        retry_policy (RetryPolicy, optional): Retry policy for all requests
+        retry_stats (RetryStats, optional): Statistics to add shard retries and failures to
+        cache (ResponseCache, optional): Response cache; each shard opens the same cache directory
+        transport_config (TransportConfig, optional): HTTP session settings for each shard
+        workers (int, optional): Fetch workers per shard. Defaults to FETCH_WORKERS.
+        batch_size (int, optional): Records per cleaning/upsert batch. Defaults to BATCH_SIZE.
+        queue_size (int, optional): Capacity of each shard's pipeline queues. Defaults to QUEUE_SIZE.
+        run_id (int, optional): Sync run to record per-object checkpoints for
+        telemetry (FetchTelemetry, optional): Telemetry to add each shard's request telemetry to
+        bulk_load (bool, optional): Write batches with COPY through the staging table. Shards
+            then write one at a time, as each load locks the staging table. Defaults to False.
+        async_writes (bool, optional): Write batches on each shard's event loop through
+            asyncpg. Defaults to False.
+        write_workers (int, optional): Connections each shard writes a batch over. Above 1,
+            bulk loads go through per-connection temporary staging tables, so shards
+            do not wait for each other. Defaults to 1.
+
+    Returns:
+        dict: `stats`, with the shard statistics added
+
+    Raises:
+        RuntimeError: If a shard failed or exited without reporting
+    """
+    settings = {
+        'base_url': met_client.BASE_URL,
+        'limiter': _limiter_settings(rate_limiter),
+        'retry_policy': retry_policy,
+        'cache': None if cache is None else {
+            'cache_dir': cache.cache_dir,
+            'max_age': cache.max_age,
+            'max_size': cache.max_size,
+            'offline': cache.offline,
+        },
+        'transport_config': transport_config,
+        'workers': workers,
+        'batch_size': batch_size,
+        'queue_size': queue_size,
+        'run_id': run_id,
+        'sidecar_path': stats['cleaning'].sidecar_path,
+        'bulk_load': bulk_load,
+        'async_writes': async_writes,
+        'write_workers': write_workers,
+    }
+
+    start = time.monotonic()
+    shard_ids = split_shards(list(object_ids), shards)
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_run_shard, args=(index, ids, settings, rate_limiter.bucket, results),
+            name=f"sync-shard-{index}", daemon=True
+        )
+        for index, ids in enumerate(shard_ids)
+    ]
+    print(f"Starting {len(processes)} sync shards ({', '.join(str(len(ids)) for ids in shard_ids)} objects)")
+    for process in processes:
+        process.start()
+
+    pending = set(range(len(processes)))
+    try:
+        while pending:
+            try:
+                index, outcome, payload = await asyncio.to_thread(results.get, True, SHARD_POLL_INTERVAL)
+            except queue.Empty:
+                for index in pending:
+                    exitcode = processes[index].exitcode
+                    if exitcode not in (None, 0):
+                        raise RuntimeError(f"Sync shard {index} exited with code {exitcode}")
+                continue
+
+            pending.discard(index)
+            if outcome == 'error':
+                raise RuntimeError(f"Sync shard {index} failed:\n{payload}")
+
+            shard_stats, shard_retry_stats, limiter_stats, cache_stats, shard_telemetry = payload
+            _merge_pipeline_stats(stats, shard_stats)
+            rate_limiter.merge_stats(limiter_stats)
+            if retry_stats is not None:
+                retry_stats.merge(shard_retry_stats)
+            if cache is not None and cache_stats is not None:
+                _merge_cache_stats(cache, cache_stats)
+            if telemetry is not None:
+                telemetry.merge(shard_telemetry)
+            print(f"  ✓ Shard {index} finished: {shard_stats['fetched']} fetched, "
+                  f"{shard_stats['inserted']} inserted, {shard_stats['updated']} updated, "
+                  f"{shard_stats['errors']} errors in {shard_stats['elapsed_seconds']:.1f}s")
+    finally:
+        for process in processes:
+            if pending and process.is_alive():
+                process.terminate()
+            process.join()
+
+    stats['elapsed_seconds'] = time.monotonic() - start
+    return stats
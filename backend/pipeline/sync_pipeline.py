@@ -0,0 +1,479 @@
+"""
+Streaming sync pipeline from the MET API to PostgreSQL.
+
+This module connects fetching, cleaning, and database writes with
+bounded queues. Database writes overlap with network fetching,
+and peak memory is set by the queue and batch sizes rather than by the
+number of objects synced.
+
+Each micro-batch is checkpointed per object (fetched, cleaned, persisted)
+in the sync_checkpoints table, so an interrupted run can be resumed
+without re-syncing the objects it already wrote.
+
+Fetched objects are staged straight into columnar micro-batches
+(data.staging.ObjectBatch), which are cleaned and written without
+building a dictionary per object.
+
+    fetch ──queue──> stage + clean (micro-batches) ──queue──> upsert
+"""
+import asyncio
+import functools
+import time
+from collections import Counter
+
+from api.met_client import (
+    FETCH_WORKERS, create_rate_limiter, create_shared_bucket, get_all_object_ids, get_changed_object_ids,
+    iter_object_details, plan_department_fetch, print_fetch_report
+)
+from api.retry import RetryStats
+from api.telemetry import FetchTelemetry
+from api.transport import create_session
+from data.cleaners import SeenIds, clean_and_validate_data
+from data.cleaning_report import CleaningReport
+from data.staging import ObjectBatch
+from database.artwork_repository import bulk_load_to_database, save_to_database, save_to_database_parallel
+from database.async_artwork_repository import bulk_load_to_database_async, save_to_database_async
+from database.database import async_engine
+from database.sync_repository import (
+    finish_sync_run, get_last_high_water_mark, get_persisted_object_ids, get_resumable_run,
+    mark_removed_artworks, record_checkpoints, reopen_sync_run, start_sync_run
+)
+
+BATCH_SIZE = 500
+QUEUE_SIZE = 1000
+WRITE_QUEUE_SIZE = 2
+FLUSH_INTERVAL = 5.0
+
+_DONE = object()
+
+
+def _new_stats():
+    """Create the statistics dictionary filled in by the pipeline stages."""
+    return {
+        'fetched': 0,
+        'planned': 0,
+        'dedup_saved': 0,
+        'duplicates': 0,
+        'cleaned': 0,
+        'removed': 0,
+        'batches': 0,
+        'inserted': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'errors': 0,
+        'removed_artworks': 0,
+        'resumed_skipped': 0,
+        'departments': Counter(),
+        'cleaning': CleaningReport(),
+        'fetch_seconds': 0.0,
+        'clean_seconds': 0.0,
+        'write_seconds': 0.0,
+        'elapsed_seconds': 0.0,
+    }
+
+
+async def _fetch_stage(session, object_ids, rate_limiter, retry_policy, retry_stats, cache,
+                       workers, out_queue, stats, telemetry=None):
+    """Fetch object details and pass the raw API objects downstream."""
+    start = time.monotonic()
+    async for obj_details in iter_object_details(
+        session, object_ids, rate_limiter, retry_policy, retry_stats, cache, workers, telemetry
+    ):
+        stats['fetched'] += 1
+        await out_queue.put(obj_details)
+    stats['fetch_seconds'] = time.monotonic() - start
+    await out_queue.put(_DONE)
+
+
+async def _checkpoint(run_id, met_object_ids, stage):
+    """Record a checkpoint for a batch of objects in a worker thread, if the run is tracked."""
+    if run_id is not None:
+        await asyncio.to_thread(record_checkpoints, run_id, met_object_ids, stage)
+
+
+async def _clean_stage(in_queue, out_queue, batch_size, flush_interval, stats, run_id=None):
+    """
+    Stage fetched objects into columnar micro-batches and clean each batch in a worker thread.
+
+    A partial batch is flushed when no object arrives within flush_interval
+    seconds, so slow fetches still reach the database regularly. Objects
+    whose ID was already seen in an earlier batch are dropped by the
+    cleaner, which tracks the IDs of the run in a compact SeenIds bitmap.
+    """
+    seen_ids = SeenIds()
+    cleaning = stats['cleaning']
+    batch = ObjectBatch()
+    done = False
+
+    while not done:
+        try:
+            obj_details = await asyncio.wait_for(in_queue.get(), flush_interval)
+        except asyncio.TimeoutError:
+            obj_details = None
+
+        if obj_details is _DONE:
+            done = True
+        elif obj_details is not None:
+            batch.append(obj_details)
+
+        if batch and (done or obj_details is None or len(batch) >= batch_size):
+            await _checkpoint(run_id, batch.met_object_ids, 'fetched')
+            start = time.monotonic()
+            duplicates_before = cleaning.count('duplicate_id') + cleaning.count('seen_in_earlier_batch')
+            cleaned = await asyncio.to_thread(
+                clean_and_validate_data, batch.to_dataframe(), False, False, cleaning, seen_ids
+            )
+            stats['clean_seconds'] += time.monotonic() - start
+            await _checkpoint(run_id, cleaned['met_object_id'], 'cleaned')
+            duplicates = cleaning.count('duplicate_id') + cleaning.count('seen_in_earlier_batch') - duplicates_before
+            stats['duplicates'] += duplicates
+            stats['cleaned'] += len(cleaned)
+            stats['removed'] += len(batch) - len(cleaned) - duplicates
+            stats['departments'].update(cleaned['department'].dropna())
+            batch = ObjectBatch()
+            if len(cleaned) > 0:
+                await out_queue.put(cleaned)
+
+    await out_queue.put(_DONE)
+
+
+async def _write_stage(in_queue, stats, run_id=None, bulk_load=False, async_writes=False, write_workers=1):
+    """
+    Upsert cleaned batches, one at a time, in a worker thread or, with
+    async_writes, on the event loop through asyncpg. With write_workers > 1,
+    each batch is split by ID range over that many connections.
+
+    A batch is checkpointed as persisted if it was written without errors.
+    If its only errors are records quarantined in sync_dead_letters, the
+    rest of the batch is checkpointed and the quarantined records are
+    written again when the run is resumed; if the write failed as a whole,
+    the whole batch is.
+    """
+    if async_writes:
+        write_async = bulk_load_to_database_async if bulk_load else save_to_database_async
+    elif write_workers > 1:
+        write = functools.partial(save_to_database_parallel, workers=write_workers, bulk_load=bulk_load)
+    else:
+        write = bulk_load_to_database if bulk_load else save_to_database
+    while True:
+        df = await in_queue.get()
+        if df is _DONE:
+            return
+
+        start = time.monotonic()
+        if async_writes:
+            result = await write_async(df, False, run_id)
+        else:
+            result = await asyncio.to_thread(write, df, False, run_id)
+        stats['write_seconds'] += time.monotonic() - start
+        stats['batches'] += 1
+        stats['inserted'] += result['inserted']
+        stats['updated'] += result['updated']
+        stats['unchanged'] += result['unchanged']
+        stats['errors'] += result['errors']
+        if result['errors'] == 0:
+            await _checkpoint(run_id, df['met_object_id'], 'persisted')
+        elif result['errors'] == len(result['failed_ids']):
+            written = df['met_object_id'][~df['met_object_id'].isin(result['failed_ids'])]
+            await _checkpoint(run_id, written, 'persisted')
+        print(f"  ✓ Batch {stats['batches']}: {result['inserted']} inserted, "
+              f"{result['updated']} updated, {result['unchanged']} unchanged, {result['errors']} errors "
+              f"({stats['fetched']} fetched so far)")
+
+
+async def stream_sync(session, object_ids, rate_limiter, retry_policy=None, retry_stats=None,
+                      cache=None, workers=FETCH_WORKERS, batch_size=BATCH_SIZE,
+                      queue_size=QUEUE_SIZE, flush_interval=FLUSH_INTERVAL, run_id=None, stats=None,
+                      telemetry=None, bulk_load=False, async_writes=False, write_workers=1):
+    """
+    Run the fetch -> stage + clean -> upsert pipeline over a stream of object IDs.
+
+    All stages run concurrently. If any stage fails, the others are
+    cancelled and the exception is re-raised.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP session for making requests
+        object_ids (iterable or async iterable): MET object IDs to sync
+        rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        retry_policy (RetryPolicy, optional): Retry policy for all requests
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        cache (ResponseCache, optional): On-disk response cache
+        workers (int, optional): Number of fetch workers. Defaults to FETCH_WORKERS.
+        batch_size (int, optional): Records per cleaning/upsert batch. Defaults to BATCH_SIZE.
+        queue_size (int, optional): Capacity of the fetch queue. Defaults to QUEUE_SIZE.
+        flush_interval (float, optional): Seconds to wait before flushing a partial batch.
+            Defaults to FLUSH_INTERVAL.
+        run_id (int, optional): Sync run to record per-object checkpoints for.
+            Defaults to None (no checkpoints).
+        stats (dict, optional): Statistics dictionary to fill in, so the caller keeps
+            the partial counts if the pipeline fails. Defaults to a new dictionary.
+        telemetry (FetchTelemetry, optional): Telemetry to record object requests in
+        bulk_load (bool, optional): Write batches with COPY through the staging table
+            (bulk_load_to_database) instead of upsert statements. Defaults to False.
+        async_writes (bool, optional): Write batches on the event loop through the
+            asyncpg engine (database.async_artwork_repository) instead of in a worker
+            thread through psycopg2. Defaults to False.
+        write_workers (int, optional): Connections each batch is written over, split by
+            met_object_id range (save_to_database_parallel). Cannot be combined with
+            async_writes. Defaults to 1.
+
+    Returns:
+        dict: Pipeline statistics (fetched, cleaned, inserted, updated, errors,
+              per-department counts, and time spent in each stage)
+    """
+    if async_writes and write_workers > 1:
+        raise ValueError("async_writes cannot be combined with write_workers > 1")
+    stats = stats if stats is not None else _new_stats()
+    raw_queue = asyncio.Queue(maxsize=queue_size)
+    write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+
+    start = time.monotonic()
+    tasks = [
+        asyncio.create_task(_fetch_stage(
+            session, object_ids, rate_limiter, retry_policy, retry_stats, cache,
+            workers, raw_queue, stats, telemetry
+        )),
+        asyncio.create_task(_clean_stage(
+            raw_queue, write_queue, batch_size, flush_interval, stats, run_id
+        )),
+        asyncio.create_task(_write_stage(write_queue, stats, run_id, bulk_load, async_writes, write_workers)),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if async_writes:
+            # asyncpg connections belong to this event loop
+            await async_engine.dispose()
+
+    stats['elapsed_seconds'] = time.monotonic() - start
+    return stats
+
+
+async def plan_incremental_ids(session, department_ids, limit_per_department, since, rate_limiter,
+                               retry_policy=None, retry_stats=None, cache=None, telemetry=None):
+    """
+    Select the objects in the sync scope that changed since the last run.
+
+    Intersects the deduplicated department object lists (the sync scope)
+    with the objects returned by the MET API metadataDate filter.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP session for making requests
+        department_ids (list): List of department IDs in the sync scope
+        limit_per_department (int): Maximum number of objects per department
+        since (datetime): High-water mark of the last completed run
+        rate_limiter (RateLimiter): Rate limiter instance to control request rate
+        retry_policy (RetryPolicy, optional): Retry policy for all requests
+        retry_stats (RetryStats, optional): Statistics to record retries and failures in
+        cache (ResponseCache, optional): On-disk response cache for department lists
+        telemetry (FetchTelemetry, optional): Telemetry to record requests in
+
+    Returns:
+        tuple: (object IDs to sync, FetchPlan of the sync scope)
+
+    Raises:
+        RuntimeError: If the changed-objects list could not be fetched
+    """
+    changed_ids = await get_changed_object_ids(
+        session, since, rate_limiter, department_ids, retry_policy, retry_stats, telemetry
+    )
+    if changed_ids is None:
+        raise RuntimeError(f"Could not fetch objects changed since {since:%Y-%m-%d}")
+
+    plan = await plan_department_fetch(
+        session, department_ids, limit_per_department, rate_limiter, retry_policy, retry_stats, cache,
+        telemetry
+    )
+
+    object_ids = [object_id for object_id in changed_ids if object_id in plan]
+    print(f"Incremental sync: {len(object_ids)} changed objects in scope "
+          f"(out of {len(plan)} in scope, {len(changed_ids)} changed)")
+    return object_ids, plan
+
+
+async def run_sync_pipeline(department_ids, limit_per_department, retry_policy=None, cache=None,
+                            workers=FETCH_WORKERS, batch_size=BATCH_SIZE, queue_size=QUEUE_SIZE,
+                            incremental=False, detect_removed=None, transport_config=None,
+                            resume=False, shards=1, telemetry=None, cleaning_report=None,
+                            bulk_load=False, async_writes=False, write_workers=1):
+    """
+    Sync highlighted objects of the given departments through the streaming pipeline.
+
+    Every run is recorded in the sync_runs ledger. An incremental run only
+    fetches objects changed since the high-water mark of the last completed
+    run (falling back to a full run if there is none).
+
+    With resume=True, the most recent run is continued if it did not
+    finish: it keeps its mode and high-water mark, and objects it already
+    persisted are skipped. With a response cache, re-fetching the rest of
+    the interrupted run's objects is mostly served from disk.
+
+    Args:
+        department_ids (list): List of department IDs to sync
+        limit_per_department (int): Maximum number of objects to sync per department
+        retry_policy (RetryPolicy, optional): Retry policy for all requests
+        cache (ResponseCache, optional): On-disk response cache
+        workers (int, optional): Number of fetch workers. Defaults to FETCH_WORKERS.
+        batch_size (int, optional): Records per cleaning/upsert batch. Defaults to BATCH_SIZE.
+        queue_size (int, optional): Capacity of the fetch queue. Defaults to QUEUE_SIZE.
+        incremental (bool, optional): Only sync objects changed since the last run. Defaults to False.
+        detect_removed (bool, optional): Mark artworks no longer listed by the API as removed.
+            Defaults to the value of `incremental`.
+        transport_config (TransportConfig, optional): HTTP session settings
+        resume (bool, optional): Continue the last run if it was interrupted. Defaults to False.
+        shards (int, optional): Number of worker processes to split the objects across,
+            sharing one request budget (see pipeline.sharded_sync). Defaults to 1
+            (a single process).
+        telemetry (FetchTelemetry, optional): Telemetry to record all requests of the run in,
+            so the caller can export it. Defaults to a new FetchTelemetry.
+        cleaning_report (CleaningReport, optional): Report to record cleaning rule violations in,
+            so the caller can export it. Defaults to a new CleaningReport.
+        bulk_load (bool, optional): Write batches with COPY through the staging table,
+            for initial loads and full re-syncs. Defaults to False.
+        async_writes (bool, optional): Write batches on the event loop through asyncpg
+            instead of in a worker thread through psycopg2. Defaults to False.
+        write_workers (int, optional): Connections each batch is written over, split by
+            met_object_id range. Defaults to 1.
+
+    Returns:
+        dict: Pipeline statistics (see stream_sync), plus the sync run ID
+    """
+    resumed = get_resumable_run() if resume else None
+    if resume and resumed is None:
+        print("No interrupted sync run found - starting a new run")
+
+    if resumed is not None:
+        since = resumed['since']
+        mode = resumed['mode']
+        incremental = mode == 'incremental'
+    else:
+        since = get_last_high_water_mark() if incremental else None
+        if incremental and since is None:
+            print("No completed sync run found - running a full sync instead")
+        mode = 'incremental' if since is not None else 'full'
+
+    if detect_removed is None:
+        detect_removed = incremental
+
+    if resumed is not None:
+        print(f"Resuming sync run {resumed['id']} ({mode})...")
+    else:
+        print(f"Starting streaming sync ({mode})...")
+    print(f"Departments: {department_ids}")
+    print(f"Objects per department: {limit_per_department}")
+    if since is not None:
+        print(f"Changes since: {since:%Y-%m-%d %H:%M:%S} UTC")
+    print(f"Fetch workers: {workers}, batch size: {batch_size}, queue size: {queue_size}")
+    if shards > 1:
+        print(f"Shards: {shards} processes sharing one request budget")
+
+    if resumed is not None:
+        run_id = resumed['id']
+        reopen_sync_run(run_id)
+        persisted_ids = get_persisted_object_ids(run_id)
+        print(f"Already persisted by run {run_id}: {len(persisted_ids)} objects")
+    else:
+        run_id = start_sync_run(mode, since)
+        persisted_ids = set()
+    rate_limiter = create_rate_limiter(create_shared_bucket() if shards > 1 else None)
+    retry_stats = RetryStats()
+    telemetry = telemetry if telemetry is not None else FetchTelemetry()
+    stats = _new_stats()
+    if cleaning_report is not None:
+        stats['cleaning'] = cleaning_report
+
+    try:
+        async with create_session(transport_config) as session:
+            if since is not None:
+                object_ids, plan = await plan_incremental_ids(
+                    session, department_ids, limit_per_department, since, rate_limiter,
+                    retry_policy, retry_stats, cache, telemetry
+                )
+            else:
+                plan = await plan_department_fetch(
+                    session, department_ids, limit_per_department, rate_limiter,
+                    retry_policy, retry_stats, cache, telemetry
+                )
+                object_ids = plan.object_ids
+
+            planned = len(object_ids)
+            if persisted_ids:
+                object_ids = [object_id for object_id in object_ids if object_id not in persisted_ids]
+
+            if shards > 1:
+                from pipeline.sharded_sync import run_shards
+                await run_shards(
+                    object_ids, shards, rate_limiter, stats, retry_policy, retry_stats, cache,
+                    transport_config, workers=workers, batch_size=batch_size, queue_size=queue_size,
+                    run_id=run_id, telemetry=telemetry, bulk_load=bulk_load,
+                    async_writes=async_writes, write_workers=write_workers
+                )
+            else:
+                await stream_sync(
+                    session, object_ids, rate_limiter, retry_policy, retry_stats, cache,
+                    workers=workers, batch_size=batch_size, queue_size=queue_size,
+                    run_id=run_id, stats=stats, telemetry=telemetry, bulk_load=bulk_load,
+                    async_writes=async_writes, write_workers=write_workers
+                )
+            stats['planned'] = planned
+            stats['resumed_skipped'] = planned - len(object_ids)
+            stats['dedup_saved'] = plan.saved_requests
+
+            if detect_removed:
+                all_ids = await get_all_object_ids(
+                    session, rate_limiter, retry_policy, retry_stats, telemetry
+                )
+                if all_ids is not None:
+                    stats['removed_artworks'] = await asyncio.to_thread(mark_removed_artworks, all_ids)
+    except BaseException:
+        finish_sync_run(run_id, 'failed', stats)
+        raise
+
+    fetch_failures = len(retry_stats.failed) - len(retry_stats.not_found)
+    status = 'completed' if stats['errors'] == 0 and fetch_failures == 0 else 'completed_with_errors'
+    finish_sync_run(run_id, status, stats)
+    stats['run_id'] = run_id
+    stats['status'] = status
+
+    print_fetch_report(rate_limiter, retry_stats, cache, telemetry)
+    print_pipeline_report(stats)
+    return stats
+
+
+def print_pipeline_report(stats):
+    """
+    Print the summary of a pipeline run.
+
+    Args:
+        stats (dict): Statistics returned by stream_sync
+    """
+    print(f"\n{'='*60}")
+    print("SYNC COMPLETE")
+    print('='*60)
+    print(f"Planned: {stats['planned']} objects "
+          f"({stats['dedup_saved']} duplicate detail requests saved by deduplication)")
+    print(f"Fetched: {stats['fetched']} objects "
+          f"({stats['duplicates']} duplicates dropped, {stats['removed']} removed by cleaning)")
+    cleaning = stats['cleaning']
+    if cleaning.date_issues or cleaning.count('missing_id'):
+        print("Validation issues:")
+        cleaning.print_summary(indent="  ")
+    if stats['resumed_skipped']:
+        print(f"Skipped: {stats['resumed_skipped']} objects already persisted by the resumed run")
+    print(f"Inserted: {stats['inserted']} artworks")
+    print(f"Updated: {stats['updated']} artworks")
+    print(f"Unchanged: {stats['unchanged']} artworks (content hash matched, not written)")
+    print(f"Errors: {stats['errors']} artworks")
+    print(f"Marked removed: {stats['removed_artworks']} artworks")
+    if 'status' in stats:
+        print(f"Run {stats['run_id']}: {stats['status']}")
+    print(f"Batches written: {stats['batches']}")
+    print(f"Time: {stats['elapsed_seconds']:.1f}s total, "
+          f"{stats['fetch_seconds']:.1f}s fetching, "
+          f"{stats['clean_seconds']:.1f}s cleaning, "
+          f"{stats['write_seconds']:.1f}s writing")
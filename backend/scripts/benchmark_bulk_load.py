@@ -0,0 +1,137 @@
+"""
+Benchmark for loading artworks into PostgreSQL.
+
+Builds synthetic cleaned artwork data (see benchmark_cleaners.py) and
+writes it to the database in DATABASE_URL with:
+1. save_to_database: batched INSERT ... ON CONFLICT DO UPDATE statements
+2. bulk_load_to_database: COPY into the unlogged staging table, then one merge
+
+Each path is timed on an initial load (every artwork is new) and on a
+full re-sync of the same data (every artwork is unchanged). Both paths
+must leave the same artworks behind. Record preparation, which both
+paths share, is timed separately.
+
+The benchmark artworks get met_object_ids from ID_OFFSET up, far above
+real MET IDs, and are deleted before each run and at the end.
+
+Example:
+    python scripts/benchmark_bulk_load.py --rows 10000,100000,500000
+"""
+import argparse
+import os
+import sys
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from benchmark_cleaners import make_raw_artworks, time_call
+from data.cleaners import clean_and_validate_data
+from database.artwork_repository import (
+    bulk_load_to_database, check_database_connection, prepare_records, save_to_database
+)
+from database.database import engine, init_db
+
+# First met_object_id of the benchmark artworks
+ID_OFFSET = 1_000_000_000
+
+
+def make_cleaned_artworks(rows, seed=0):
+    """Build cleaned artwork data with met_object_ids from ID_OFFSET up."""
+    df = clean_and_validate_data(make_raw_artworks(rows, dirty_ratio=0, seed=seed), verbose=False)
+    df['met_object_id'] = df['met_object_id'].astype('int64') + ID_OFFSET
+    return df
+
+
+def delete_benchmark_artworks():
+    """Delete the artworks created by the benchmark."""
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM artworks WHERE met_object_id >= :offset"), {'offset': ID_OFFSET})
+
+
+def benchmark_artworks_digest():
+    """Get the count and a digest of the benchmark artworks' IDs and content hashes."""
+    with engine.connect() as conn:
+        return tuple(conn.execute(text(
+            "SELECT count(*), md5(string_agg(met_object_id || ':' || content_hash, ',' ORDER BY met_object_id)) "
+            "FROM artworks WHERE met_object_id >= :offset"
+        ), {'offset': ID_OFFSET}).one())
+
+
+def load_with_copy(df, batch_size):
+    """Bulk load a DataFrame as a stream of batches."""
+    batches = (df.iloc[start:start + batch_size] for start in range(0, len(df), batch_size))
+    return bulk_load_to_database(batches, verbose=False)
+
+
+def run_case(df, batch_size):
+    """
+    Load the same data with both paths, each on an empty range and then unchanged.
+
+    Returns:
+        dict: Seconds per step
+    """
+    _, prepare_seconds = time_call(prepare_records, df, {'errors': 0})
+
+    delete_benchmark_artworks()
+    result, upsert_load = time_call(save_to_database, df, False)
+    assert result['inserted'] == len(df) and result['errors'] == 0, f"upsert load failed: {result}"
+    result, upsert_resync = time_call(save_to_database, df, False)
+    assert result['unchanged'] == len(df), f"upsert re-sync wrote rows: {result}"
+    upsert_digest = benchmark_artworks_digest()
+
+    delete_benchmark_artworks()
+    result, copy_load = time_call(load_with_copy, df, batch_size)
+    assert result['inserted'] == len(df) and result['errors'] == 0, f"COPY load failed: {result}"
+    result, copy_resync = time_call(load_with_copy, df, batch_size)
+    assert result['unchanged'] == len(df), f"COPY re-sync wrote rows: {result}"
+    assert benchmark_artworks_digest() == upsert_digest, "COPY and upsert loads left different artworks"
+
+    return {
+        'prepare': prepare_seconds,
+        'upsert_load': upsert_load,
+        'copy_load': copy_load,
+        'upsert_resync': upsert_resync,
+        'copy_resync': copy_resync,
+    }
+
+
+def _write_speedup(seconds, upsert, copy):
+    """Speedup of COPY over upsert, without the shared record preparation time."""
+    return (seconds[upsert] - seconds['prepare']) / max(seconds[copy] - seconds['prepare'], 1e-9)
+
+
+def benchmark(row_counts, batch_size):
+    """Run each row count and print a results table."""
+    print(f"\n{'rows':>8} {'prepare s':>10} {'upsert load s':>14} {'COPY load s':>12} {'write x':>8} "
+          f"{'upsert resync s':>16} {'COPY resync s':>14} {'write x':>8}")
+    print("-" * 99)
+    try:
+        for rows in row_counts:
+            seconds = run_case(make_cleaned_artworks(rows), batch_size)
+            print(f"{rows:>8} {seconds['prepare']:>10.2f} {seconds['upsert_load']:>14.2f} "
+                  f"{seconds['copy_load']:>12.2f} {_write_speedup(seconds, 'upsert_load', 'copy_load'):>7.1f}x "
+                  f"{seconds['upsert_resync']:>16.2f} {seconds['copy_resync']:>14.2f} "
+                  f"{_write_speedup(seconds, 'upsert_resync', 'copy_resync'):>7.1f}x")
+    finally:
+        delete_benchmark_artworks()
+    print("\nLoad and re-sync times include record preparation ('prepare s'), which both paths share; "
+          "'write x' is the COPY speedup without it.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark loading artworks into PostgreSQL")
+    parser.add_argument("--rows", default="10000,100000,500000",
+                        help="Comma-separated row counts to benchmark")
+    parser.add_argument("--batch-size", type=int, default=10_000,
+                        help="Rows per batch streamed to COPY")
+    args = parser.parse_args()
+
+    if not check_database_connection():
+        sys.exit(1)
+    init_db()
+
+    row_counts = [int(r) for r in args.rows.split(",") if r.strip()]
+    benchmark(row_counts, args.batch_size)
@@ -0,0 +1,144 @@
+"""
+Benchmark comparing the psycopg2 and asyncpg database drivers.
+
+Builds synthetic cleaned artwork data (see benchmark_cleaners.py) and runs
+each repository operation with both drivers on the database in
+DATABASE_URL:
+1. Existence lookup: get_existing_object_ids / get_existing_object_ids_async
+2. Upsert: save_to_database / save_to_database_async, as an initial load
+   (every artwork is new) and a re-sync (every artwork is unchanged)
+3. COPY bulk load: bulk_load_to_database / bulk_load_to_database_async,
+   as an initial load and a re-sync
+
+Both drivers must leave the same artworks behind. The benchmark artworks
+use the met_object_id range of benchmark_bulk_load.py and are deleted
+before each load and at the end.
+
+Example:
+    python scripts/benchmark_db_drivers.py --rows 10000,100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_bulk_load import benchmark_artworks_digest, delete_benchmark_artworks, make_cleaned_artworks
+from benchmark_cleaners import time_call
+from database.artwork_repository import (
+    bulk_load_to_database, check_database_connection, get_existing_object_ids, save_to_database
+)
+from database.async_artwork_repository import (
+    bulk_load_to_database_async, get_existing_object_ids_async, save_to_database_async
+)
+from database.database import async_engine, init_db
+
+OPERATIONS = ('lookup', 'upsert_load', 'upsert_resync', 'copy_load', 'copy_resync')
+
+
+async def time_call_async(function, *args, **kwargs):
+    """Await function once and return (result, seconds)."""
+    start = time.perf_counter()
+    result = await function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _batches(df, batch_size):
+    """Split a DataFrame into a list of batches for the bulk loaders."""
+    return [df.iloc[start:start + batch_size] for start in range(0, len(df), batch_size)]
+
+
+def _check(operation, result, rows):
+    """Check the statistics of a load or re-sync."""
+    expected = 'inserted' if operation.endswith('_load') else 'unchanged'
+    assert result[expected] == rows and result['errors'] == 0, f"{operation} failed: {result}"
+
+
+def run_psycopg2(df, batch_size):
+    """
+    Run every operation through the sync psycopg2 engine.
+
+    Returns:
+        tuple: (seconds per operation, digests of the artworks left by the upsert and COPY loads)
+    """
+    seconds, digests = {}, []
+    ids = df['met_object_id'].tolist()
+    for prefix, write in (('upsert', lambda: save_to_database(df, False)),
+                          ('copy', lambda: bulk_load_to_database(_batches(df, batch_size), False))):
+        delete_benchmark_artworks()
+        for operation in (f'{prefix}_load', f'{prefix}_resync'):
+            result, seconds[operation] = time_call(write)
+            _check(operation, result, len(df))
+        digests.append(benchmark_artworks_digest())
+
+    found, seconds['lookup'] = time_call(get_existing_object_ids, ids)
+    assert len(found) == len(ids), f"lookup found {len(found)} of {len(ids)} artworks"
+    return seconds, digests
+
+
+async def run_asyncpg(df, batch_size):
+    """
+    Run every operation through the asyncpg engine.
+
+    Returns:
+        tuple: (seconds per operation, digests of the artworks left by the upsert and COPY loads)
+    """
+    seconds, digests = {}, []
+    ids = df['met_object_id'].tolist()
+    try:
+        # Open the first pooled connection before timing, as the psycopg2 pool already has one
+        await get_existing_object_ids_async([])
+        for prefix, write in (('upsert', lambda: save_to_database_async(df, False)),
+                              ('copy', lambda: bulk_load_to_database_async(_batches(df, batch_size), False))):
+            delete_benchmark_artworks()
+            for operation in (f'{prefix}_load', f'{prefix}_resync'):
+                result, seconds[operation] = await time_call_async(write)
+                _check(operation, result, len(df))
+            digests.append(benchmark_artworks_digest())
+
+        found, seconds['lookup'] = await time_call_async(get_existing_object_ids_async, ids)
+        assert len(found) == len(ids), f"lookup found {len(found)} of {len(ids)} artworks"
+        return seconds, digests
+    finally:
+        await async_engine.dispose()
+
+
+def benchmark(row_counts, batch_size):
+    """Run each row count with both drivers and print a results table."""
+    print(f"\n{'rows':>8}  {'operation':<14} {'psycopg2 s':>11} {'asyncpg s':>10} "
+          f"{'psycopg2 rows/s':>16} {'asyncpg rows/s':>15} {'asyncpg x':>10}")
+    print("-" * 92)
+    try:
+        for rows in row_counts:
+            df = make_cleaned_artworks(rows)
+            sync_seconds, sync_digests = run_psycopg2(df, batch_size)
+            async_seconds, async_digests = asyncio.run(run_asyncpg(df, batch_size))
+            assert sync_digests == async_digests, "psycopg2 and asyncpg left different artworks"
+            for operation in OPERATIONS:
+                sync_s, async_s = sync_seconds[operation], async_seconds[operation]
+                print(f"{rows:>8}  {operation:<14} {sync_s:>11.2f} {async_s:>10.2f} "
+                      f"{rows / sync_s:>16,.0f} {rows / async_s:>15,.0f} {sync_s / async_s:>9.2f}x")
+    finally:
+        delete_benchmark_artworks()
+    print("\nBoth drivers left identical artworks. Load and re-sync times include record preparation, "
+          "which both drivers share.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the psycopg2 and asyncpg database drivers")
+    parser.add_argument("--rows", default="10000,100000",
+                        help="Comma-separated row counts to benchmark")
+    parser.add_argument("--batch-size", type=int, default=10_000,
+                        help="Rows per batch streamed to COPY")
+    args = parser.parse_args()
+
+    if not check_database_connection():
+        sys.exit(1)
+    init_db()
+
+    row_counts = [int(r) for r in args.rows.split(",") if r.strip()]
+    benchmark(row_counts, args.batch_size)
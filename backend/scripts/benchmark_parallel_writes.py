@@ -0,0 +1,117 @@
+"""
+Benchmark for writing artworks over several database connections.
+
+Builds synthetic cleaned artwork data (see benchmark_cleaners.py) and
+writes it to the database in DATABASE_URL with:
+1. The single-connection writers: save_to_database (upserts) and
+   bulk_load_to_database (COPY)
+2. save_to_database_parallel with each --workers count, in both modes
+
+Each writer is timed on an initial load (every artwork is new) and on a
+full re-sync of the same data (every artwork is unchanged), and must
+leave the same artworks behind as the single-connection writers. The
+per-worker statistics of the last parallel COPY re-sync are printed, to show
+how evenly the ID ranges were split.
+
+The benchmark artworks use the met_object_id range of
+benchmark_bulk_load.py and are deleted before each load and at the end.
+Speedups are bounded by the cores of the database server, and by this
+machine's for the record preparation and statement building in Python.
+
+Example:
+    python scripts/benchmark_parallel_writes.py --rows 100000,500000 --workers 2,4,8
+"""
+import argparse
+import os
+import sys
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_bulk_load import benchmark_artworks_digest, delete_benchmark_artworks, make_cleaned_artworks
+from benchmark_cleaners import time_call
+from database.artwork_repository import (
+    bulk_load_to_database, check_database_connection, save_to_database, save_to_database_parallel
+)
+from database.database import init_db
+
+
+def run_writer(write, rows):
+    """
+    Time a writer on an initial load and a re-sync.
+
+    Returns:
+        tuple: (load seconds, re-sync seconds, digest of the artworks left, re-sync statistics)
+    """
+    delete_benchmark_artworks()
+    result, load_seconds = time_call(write)
+    assert result['inserted'] == rows and result['errors'] == 0, f"load failed: {result}"
+    result, resync_seconds = time_call(write)
+    assert result['unchanged'] == rows and result['errors'] == 0, f"re-sync wrote rows: {result}"
+    return load_seconds, resync_seconds, benchmark_artworks_digest(), result
+
+
+def print_worker_stats(stats):
+    """Print the per-worker statistics of a parallel write."""
+    print(f"\n{'worker':>6} {'first id':>12} {'last id':>12} {'records':>8} {'unchanged':>10} {'seconds':>8}")
+    for worker in stats['workers']:
+        print(f"{worker['worker']:>6} {worker['first_id']:>12} {worker['last_id']:>12} {worker['records']:>8} "
+              f"{worker['unchanged']:>10} {worker['seconds']:>8.2f}")
+
+
+def benchmark(row_counts, worker_counts, batch_size):
+    """Run each row count with each writer and print a results table."""
+    print(f"\n{'rows':>8} {'workers':>8} {'upsert load s':>14} {'x':>6} {'upsert resync s':>16} {'x':>6} "
+          f"{'COPY load s':>12} {'x':>6} {'COPY resync s':>14} {'x':>6}")
+    print("-" * 106)
+    last_stats = None
+    try:
+        for rows in row_counts:
+            df = make_cleaned_artworks(rows)
+            batches = [df.iloc[start:start + batch_size] for start in range(0, len(df), batch_size)]
+            upsert = run_writer(lambda: save_to_database(df, False), rows)
+            copy = run_writer(lambda: bulk_load_to_database(batches, False), rows)
+            assert upsert[2] == copy[2], "upsert and COPY loads left different artworks"
+            print(f"{rows:>8} {'single':>8} {upsert[0]:>14.2f} {'':>6} {upsert[1]:>16.2f} {'':>6} "
+                  f"{copy[0]:>12.2f} {'':>6} {copy[1]:>14.2f} {'':>6}")
+
+            for workers in worker_counts:
+                parallel_upsert = run_writer(lambda: save_to_database_parallel(df, False, workers=workers), rows)
+                parallel_copy = run_writer(
+                    lambda: save_to_database_parallel(df, False, workers=workers, bulk_load=True), rows
+                )
+                assert parallel_upsert[2] == parallel_copy[2] == upsert[2], \
+                    f"parallel writes with {workers} workers left different artworks"
+                print(f"{rows:>8} {workers:>8} "
+                      f"{parallel_upsert[0]:>14.2f} {upsert[0] / parallel_upsert[0]:>5.1f}x "
+                      f"{parallel_upsert[1]:>16.2f} {upsert[1] / parallel_upsert[1]:>5.1f}x "
+                      f"{parallel_copy[0]:>12.2f} {copy[0] / parallel_copy[0]:>5.1f}x "
+                      f"{parallel_copy[1]:>14.2f} {copy[1] / parallel_copy[1]:>5.1f}x")
+                last_stats = parallel_copy[3]
+    finally:
+        delete_benchmark_artworks()
+
+    print("\nSpeedups are over the single-connection writer of the same mode; all writers left identical artworks.")
+    if last_stats is not None:
+        print(f"Per-worker statistics of the last COPY re-sync ({len(last_stats['workers'])} workers):")
+        print_worker_stats(last_stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark writing artworks over several database connections")
+    parser.add_argument("--rows", default="100000,500000",
+                        help="Comma-separated row counts to benchmark")
+    parser.add_argument("--workers", default="2,4,8",
+                        help="Comma-separated worker counts to benchmark")
+    parser.add_argument("--batch-size", type=int, default=10_000,
+                        help="Rows per batch streamed to COPY by the single-connection bulk load")
+    args = parser.parse_args()
+
+    if not check_database_connection():
+        sys.exit(1)
+    init_db()
+
+    row_counts = [int(r) for r in args.rows.split(",") if r.strip()]
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    benchmark(row_counts, worker_counts, args.batch_size)
@@ -0,0 +1,78 @@
+"""
+Microbenchmark for preparing cleaned artwork rows for the database.
+
+Builds synthetic cleaned artwork data (see benchmark_cleaners.py) and
+turns it into insert-ready records with:
+1. The original row-wise path: df.iterrows() and prepare_artwork_data per row
+2. database.artwork_repository.prepare_records, column by column
+
+The records of both paths must be identical (same values, value types
+and content hashes) before timings are reported. No database is needed.
+
+Example:
+    python scripts/benchmark_record_preparation.py --rows 10000,100000,500000
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_cleaners import make_raw_artworks, time_call
+from data.cleaners import clean_and_validate_data
+from database.artwork_repository import prepare_artwork_data, prepare_records
+
+
+def legacy_prepare_records(df, now):
+    """The original row-wise preparation, used as the reference for correctness."""
+    records = []
+    for _, row in df.iterrows():
+        artwork_data = prepare_artwork_data(row, now)
+        artwork_data['created_at'] = now
+        artwork_data['updated_at'] = now
+        records.append(artwork_data)
+    return records
+
+
+def check_same_records(expected, actual):
+    """
+    Check that two lists of records hold the same values, of the same types.
+
+    Raises:
+        AssertionError: If the records differ
+    """
+    assert len(expected) == len(actual), f"{len(expected)} != {len(actual)} records"
+    for index, (left, right) in enumerate(zip(expected, actual)):
+        if left != right or any(type(left[key]) is not type(right[key]) for key in left):
+            raise AssertionError(f"record {index} differs: {left} != {right}")
+
+
+def benchmark(row_counts, dirty_ratio):
+    """Prepare frames of each size with both paths and print a results table."""
+    print(f"\n{'rows':>8} {'iterrows s':>11} {'columnar s':>11} {'speedup':>8} {'µs/row':>8}  output")
+    print("-" * 62)
+    now = datetime.utcnow()
+    for rows in row_counts:
+        df = clean_and_validate_data(make_raw_artworks(rows, dirty_ratio), verbose=False)
+        stats = {'errors': 0}
+        records, seconds = time_call(prepare_records, df, stats, now)
+        expected, legacy_seconds = time_call(legacy_prepare_records, df, now)
+        check_same_records(expected, records)
+        assert stats['errors'] == 0, f"{stats['errors']} rows could not be prepared"
+        print(f"{len(df):>8} {legacy_seconds:>11.2f} {seconds:>11.3f} {legacy_seconds / seconds:>7.1f}x "
+              f"{seconds / len(df) * 1e6:>8.2f}  ✓ identical")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark preparing artwork records for the database")
+    parser.add_argument("--rows", default="10000,100000,500000",
+                        help="Comma-separated row counts to benchmark")
+    parser.add_argument("--dirty-ratio", type=float, default=0.05,
+                        help="Share of raw rows given each kind of dirty value before cleaning")
+    args = parser.parse_args()
+
+    row_counts = [int(r) for r in args.rows.split(",") if r.strip()]
+    benchmark(row_counts, args.dirty_ratio)
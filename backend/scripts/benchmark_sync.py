@@ -0,0 +1,136 @@
+"""
+Benchmark for MET object sync throughput.
+
+Runs the local MET API stand-in in a separate process and fetches the
+same set of objects at several concurrency settings, so every change to
+the client can be compared against a repeatable baseline. Latency,
+errors, and 429s can be injected with the same flags as
+run_met_stub_server.py.
+
+By default only the fetch path is measured (rate limiter, retries,
+worker pool, JSON decoding). With --pipeline the full streaming sync
+(fetch, clean, and write to the database in DATABASE_URL) is run instead.
+
+Example:
+    python scripts/benchmark_sync.py --objects 5000 --concurrency 5,10,20,50 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+import api.met_client as met_client
+from api.met_stub_server import (
+    DEFAULT_HOST, add_stub_arguments, fetch_server_stats, start_server_process,
+    stub_config_from_args, wait_for_server
+)
+from api.rate_limiter import RateLimiter
+from api.retry import RetryPolicy, RetryStats
+from api.transport import TransportConfig, create_session, install_uvloop
+
+
+async def run_case(object_ids, concurrency, rate, retry_policy, pipeline):
+    """
+    Sync the given objects with `concurrency` workers and in-flight requests.
+
+    Returns:
+        dict: Objects per second and client-side statistics for the case
+    """
+    rate_limiter = RateLimiter(concurrency, rate=rate, max_rate=rate)
+    retry_stats = RetryStats()
+    config = TransportConfig(limit_per_host=concurrency)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    async with create_session(config) as session:
+        if pipeline:
+            from pipeline.sync_pipeline import stream_sync
+            stats = await stream_sync(
+                session, object_ids, rate_limiter, retry_policy, retry_stats, workers=concurrency
+            )
+            synced = stats['fetched']
+        else:
+            synced = 0
+            async for _ in met_client.iter_object_details(
+                session, object_ids, rate_limiter, retry_policy, retry_stats, workers=concurrency
+            ):
+                synced += 1
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    limiter_stats = rate_limiter.stats()
+    return {
+        'synced': synced,
+        'objects_per_second': synced / wall,
+        'cpu_ms_per_object': cpu / max(synced, 1) * 1000,
+        'mean_wait': limiter_stats['wait_time_mean'],
+        'throttled': limiter_stats['throttled'],
+        'retries': retry_stats.retries,
+        'failed': len(retry_stats.failed),
+    }
+
+
+async def benchmark(base_url, concurrency_levels, object_limit, rate, retry_policy, pipeline):
+    """Run one case per concurrency level and print a results table."""
+    met_client.BASE_URL = base_url
+    await wait_for_server(base_url)
+
+    plan_stats = RetryStats()
+    async with create_session() as session:
+        _, data = await met_client.request_json(
+            session, f"{base_url}/objects", RateLimiter(1, rate=rate), retry_stats=plan_stats, key="objects"
+        )
+    object_ids = (data or {}).get("objectIDs") or []
+    object_ids = object_ids[:object_limit]
+    print(f"Syncing {len(object_ids)} objects per case from {base_url}"
+          f"{' through the full pipeline' if pipeline else ''}")
+
+    print(f"\n{'concurrency':>11} {'objects/s':>10} {'CPU ms/obj':>11} {'mean wait':>10} "
+          f"{'429s':>6} {'retries':>8} {'failed':>7} {'server 2xx/4xx/5xx':>20}")
+    print("-" * 90)
+    for concurrency in concurrency_levels:
+        await fetch_server_stats(base_url, reset=True)
+        result = await run_case(object_ids, concurrency, rate, retry_policy, pipeline)
+        served = await fetch_server_stats(base_url)
+        by_class = [sum(n for status, n in served.items() if status // 100 == c) for c in (2, 4, 5)]
+        print(f"{concurrency:>11} {result['objects_per_second']:>10.0f} "
+              f"{result['cpu_ms_per_object']:>11.3f} {result['mean_wait']:>9.4f}s "
+              f"{result['throttled']:>6} {result['retries']:>8} {result['failed']:>7} "
+              f"{'/'.join(str(n) for n in by_class):>20}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MET object sync throughput against a local stand-in")
+    parser.add_argument("--concurrency", default="5,10,20,50",
+                        help="Comma-separated concurrency levels (workers and in-flight requests)")
+    parser.add_argument("--limit", type=int, default=2000,
+                        help="Maximum number of objects per case")
+    parser.add_argument("--rate", type=float, default=10_000,
+                        help="Client rate limit in requests per second")
+    parser.add_argument("--max-attempts", type=int, default=4,
+                        help="Attempts per request, including the first one")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run the full streaming sync, writing to the database in DATABASE_URL")
+    parser.add_argument("--port", type=int, default=8711, help="Port of the stand-in server")
+    parser.add_argument("--uvloop", action="store_true", help="Run the client on uvloop")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    concurrency_levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    retry_policy = RetryPolicy(max_attempts=args.max_attempts, base_delay=0.05, max_delay=1.0)
+    base_url = f"http://{DEFAULT_HOST}:{args.port}"
+
+    server = start_server_process(stub_config_from_args(args), DEFAULT_HOST, args.port)
+    try:
+        if args.uvloop:
+            install_uvloop()
+        asyncio.run(benchmark(
+            base_url, concurrency_levels, args.limit, args.rate, retry_policy, args.pipeline
+        ))
+    finally:
+        server.terminate()
+        server.join()
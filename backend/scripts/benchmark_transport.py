@@ -0,0 +1,96 @@
+"""
+Benchmark for the MET API HTTP transport.
+
+Runs the local MET API stand-in (api.met_stub_server) in a separate
+process and fetches object details through request_json with:
+1. A default aiohttp.ClientSession and the stdlib JSON decoder (the old setup)
+2. The tuned session from api.transport with each available JSON decoder
+
+Reports requests per second and client CPU time per request. The server
+runs in its own process, so its CPU time is not counted.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+import aiohttp
+
+import api.met_client as met_client
+from api import transport
+from api.met_stub_server import DEFAULT_HOST, StubConfig, start_server_process, wait_for_server
+from api.rate_limiter import RateLimiter
+from api.transport import TransportConfig, create_session, install_uvloop
+
+
+async def run_case(session, requests, concurrency):
+    """Fetch `requests` objects with `concurrency` in-flight requests and time it."""
+    rate_limiter = RateLimiter(concurrency, rate=1_000_000, max_rate=1_000_000)
+    queue = asyncio.Queue()
+    for object_id in range(1, requests + 1):
+        queue.put_nowait(object_id)
+
+    async def worker():
+        while not queue.empty():
+            object_id = queue.get_nowait()
+            await met_client.request_json(
+                session, f"{met_client.BASE_URL}/objects/{object_id}", rate_limiter, key=object_id
+            )
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    return requests / wall, cpu / requests * 1000
+
+
+async def benchmark(port, requests, concurrency):
+    """Run all benchmark cases and print a results table."""
+    met_client.BASE_URL = f"http://{DEFAULT_HOST}:{port}"
+    await wait_for_server(met_client.BASE_URL)
+
+    cases = [("default session + json", None, "json")]
+    for decoder in transport.JSON_DECODERS[1:]:
+        try:
+            transport.get_json_decoder(decoder)
+        except ImportError:
+            continue
+        cases.append((f"tuned session + {decoder}", TransportConfig(limit_per_host=concurrency), decoder))
+
+    print(f"\n{'case':<32} {'req/s':>10} {'CPU ms/req':>12}")
+    print("-" * 56)
+    for name, config, decoder in cases:
+        if config is None:
+            transport.set_json_decoder(decoder)
+            session = aiohttp.ClientSession()
+        else:
+            config.json_decoder = decoder
+            session = create_session(config)
+
+        async with session:
+            await run_case(session, min(200, requests), concurrency)
+            rate, cpu_ms = await run_case(session, requests, concurrency)
+        print(f"{name:<32} {rate:>10.0f} {cpu_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the MET API HTTP transport")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per case")
+    parser.add_argument("--concurrency", type=int, default=20, help="In-flight requests")
+    parser.add_argument("--port", type=int, default=8710, help="Port of the stand-in server")
+    parser.add_argument("--uvloop", action="store_true", help="Run the client on uvloop")
+    args = parser.parse_args()
+
+    server = start_server_process(StubConfig(object_count=args.requests), DEFAULT_HOST, args.port)
+    try:
+        if args.uvloop:
+            install_uvloop()
+        asyncio.run(benchmark(args.port, args.requests, args.concurrency))
+    finally:
+        server.terminate()
+        server.join()
@@ -0,0 +1,46 @@
+"""
+Run the local MET API stand-in server, or record fixtures for it.
+
+Serve synthetic objects:
+    python scripts/run_met_stub_server.py --objects 50000 --latency 0.05 --throttle-rate 0.01
+
+Record fixtures from the live API, then serve them:
+    python scripts/run_met_stub_server.py --record fixtures.json --departments 1,11 --limit 200
+    python scripts/run_met_stub_server.py --fixtures fixtures.json
+
+Then sync against it:
+    python scripts/sync_met_artworks.py --base-url http://127.0.0.1:8710 --no-cache
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from api.met_stub_server import (
+    DEFAULT_HOST, DEFAULT_PORT, add_stub_arguments, record_fixtures, run_server, stub_config_from_args
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the MET Collection API")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--record", default=None, metavar="PATH",
+                        help="Record fixtures from the live API to PATH and exit")
+    parser.add_argument("--departments", default="1,11",
+                        help="Comma-separated department IDs to record")
+    parser.add_argument("--limit", type=int, default=100,
+                        help="Maximum objects per department to record")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    if args.record:
+        department_ids = [int(d) for d in args.departments.split(",") if d.strip()]
+        asyncio.run(record_fixtures(args.record, department_ids, args.limit))
+        sys.exit(0)
+
+    print(f"MET API stand-in listening on http://{args.host}:{args.port}")
+    run_server(stub_config_from_args(args), host=args.host, port=args.port)
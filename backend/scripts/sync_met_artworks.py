@@ -6,7 +6,12 @@ This script orchestrates the complete data pipeline:
 2. Fetching data from MET API
 3. Cleaning and validating data
 4. Saving to database using bulk operations
+
+Steps 2-4 run concurrently as a streaming pipeline, so database writes
+overlap with fetching.
 """
+import argparse
+import asyncio
 import sys
 import os
 
@@ -14,12 +19,96 @@ backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, backend_dir)
 
 from database.database import init_db
-from database.artwork_repository import check_database_connection, save_to_database
-from api.met_client import fetch_museum_data
-from data.cleaners import clean_and_validate_data
+from database.artwork_repository import check_database_connection
+from api.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_AGE, DEFAULT_MAX_SIZE, ResponseCache
+import api.met_client as met_client
+from api.met_client import FETCH_WORKERS
+from api.telemetry import FetchTelemetry
+from api.transport import JSON_DECODERS, TransportConfig, install_uvloop
+from data.cleaning_report import CleaningReport
+from pipeline.sync_pipeline import BATCH_SIZE, QUEUE_SIZE, run_sync_pipeline
+
+
+def parse_args():
+    """
+    Parse command-line arguments for the sync script.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Sync MET Museum artworks to PostgreSQL")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Directory of the on-disk response cache")
+    parser.add_argument("--cache-max-age", type=float, default=DEFAULT_MAX_AGE / 3600,
+                        help="Hours a cached response is served without revalidation")
+    parser.add_argument("--cache-max-size", type=int, default=DEFAULT_MAX_SIZE // (1024 * 1024),
+                        help="Maximum cache size in MB before least recently used entries are evicted")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the response cache and fetch everything from the API")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve responses only from the cache, without any network calls")
+    parser.add_argument("--departments", default="1,11",
+                        help="Comma-separated MET department IDs to sync")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="Maximum objects per department")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only sync objects changed since the last completed run")
+    parser.add_argument("--detect-removed", action="store_true",
+                        help="Mark artworks no longer listed by the API as removed "
+                             "(always on for --incremental)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last sync run if it was interrupted, "
+                             "skipping objects it already saved")
+    parser.add_argument("--base-url", default=met_client.BASE_URL,
+                        help="MET API base URL (e.g. a local stand-in from run_met_stub_server.py)")
+    parser.add_argument("--json-decoder", choices=JSON_DECODERS, default="auto",
+                        help="JSON decoder for API responses (auto picks orjson or msgspec if installed)")
+    parser.add_argument("--uvloop", action="store_true",
+                        help="Run the sync on uvloop if it is installed")
+    parser.add_argument("--connect-timeout", type=float, default=10.0,
+                        help="Seconds allowed to open a connection to the API")
+    parser.add_argument("--read-timeout", type=float, default=30.0,
+                        help="Seconds allowed between reads of an API response")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS,
+                        help="Number of concurrent fetch workers")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="Records per cleaning and database write batch")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Worker processes to split a sync across (they share one request budget)")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE,
+                        help="Capacity of the queues between pipeline stages")
+    parser.add_argument("--telemetry-json", default=None, metavar="PATH",
+                        help="Write per-endpoint request telemetry (latency percentiles, "
+                             "status counts, throughput) to PATH as JSON")
+    parser.add_argument("--telemetry-prom", default=None, metavar="PATH",
+                        help="Write request telemetry to PATH in the Prometheus text format "
+                             "(e.g. for the node_exporter textfile collector)")
+    parser.add_argument("--bulk-load", action="store_true",
+                        help="Write batches with COPY through an unlogged staging table "
+                             "(faster for initial loads and full re-syncs; use with a larger --batch-size)")
+    parser.add_argument("--async-writes", action="store_true",
+                        help="Write batches on the fetcher's event loop through asyncpg "
+                             "instead of in a worker thread through psycopg2")
+    parser.add_argument("--write-workers", type=int, default=1,
+                        help="Database connections each batch is written over, split by object ID range "
+                             "(use with a larger --batch-size)")
+    parser.add_argument("--cleaning-report", default=None, metavar="PATH",
+                        help="Write the cleaning rule violations (counts and sampled examples) to PATH as JSON")
+    parser.add_argument("--violations", default=None, metavar="PATH",
+                        help="Write every cleaning rule violation to PATH as NDJSON "
+                             "(with --shards, one PATH.shardN file per shard)")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.offline and args.no_cache:
+        print("--offline requires the response cache; drop --no-cache")
+        sys.exit(1)
+    if args.async_writes and args.write_workers > 1:
+        print("--async-writes writes on one connection; drop --write-workers")
+        sys.exit(1)
+
     print("\n" + "="*60)
     print("SETTING UP DATABASE")
     print("="*60)
@@ -40,17 +129,65 @@ if __name__ == "__main__":
     print("STARTING DATA SYNC")
     print("="*60)
 
-    department_ids = [1, 11]
+    department_ids = [int(dept_id) for dept_id in args.departments.split(",") if dept_id.strip()]
+    met_client.BASE_URL = args.base_url.rstrip("/")
 
-    df = fetch_museum_data(department_ids, limit_per_department=20)
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(
+            args.cache_dir,
+            max_age=args.cache_max_age * 3600,
+            max_size=args.cache_max_size * 1024 * 1024,
+            offline=args.offline
+        )
 
-    df = clean_and_validate_data(df)
+    transport_config = TransportConfig(
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        json_decoder=args.json_decoder,
+        use_uvloop=args.uvloop
+    )
+    if args.uvloop:
+        install_uvloop()
+
+    telemetry = FetchTelemetry()
+    cleaning_report = CleaningReport(sidecar_path=args.violations)
+    try:
+        stats = asyncio.run(run_sync_pipeline(
+            department_ids,
+            limit_per_department=args.limit,
+            cache=cache,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            queue_size=args.queue_size,
+            incremental=args.incremental,
+            detect_removed=args.detect_removed or None,
+            transport_config=transport_config,
+            resume=args.resume,
+            shards=args.shards,
+            telemetry=telemetry,
+            cleaning_report=cleaning_report,
+            bulk_load=args.bulk_load,
+            async_writes=args.async_writes,
+            write_workers=args.write_workers
+        ))
+    finally:
+        if cache is not None:
+            cache.close()
+        if args.telemetry_json:
+            telemetry.write_json(args.telemetry_json)
+            print(f"✓ Telemetry report written to {args.telemetry_json}")
+        if args.telemetry_prom:
+            telemetry.write_prometheus(args.telemetry_prom)
+            print(f"✓ Prometheus metrics written to {args.telemetry_prom}")
+        if args.cleaning_report:
+            cleaning_report.write_json(args.cleaning_report)
+            print(f"✓ Cleaning report written to {args.cleaning_report}")
 
     print("\n" + "="*60)
     print("DATASET OVERVIEW")
     print("="*60)
-    print(f"Total objects: {len(df)}")
+    print(f"Total objects: {stats['cleaned']}")
     print(f"\nDepartments represented:")
-    print(df["department"].value_counts())
-
-    save_to_database(df)
+    for department, count in stats['departments'].most_common():
+        print(f"  {department}: {count}")